@@ -0,0 +1,90 @@
+# src/api/admin/monitoring_router.py
+"""
+Per-worker diagnostics under /admin, mounted only with ADMIN_ENDPOINTS_ENABLED.
+
+There is no authentication here: enable it only where /admin is not reachable
+by clients (local runs, an internal port, or behind an authenticating proxy).
+`GET` reads a report; `POST .../reset` returns the report and zeroes its counters.
+"""
+
+from typing import Any
+
+from fastapi import APIRouter, status
+
+from core.compression import compressed_cache
+from db.conf import replicas
+from db.lookup_cache import lookup_cache
+from db.pool import pool_metrics
+from monitoring import loop_monitor
+from schemas import ResponseData, make_data_response
+
+router = APIRouter(prefix='/admin', tags=['Admin'])
+
+Report = ResponseData[dict[str, Any]]
+
+
+@router.get('/loop-stalls', response_model=Report, status_code=status.HTTP_200_OK)
+async def loop_stalls():
+	"""Event-loop lag and per-route stall report (empty unless LOOP_MONITOR_ENABLED)."""
+	return make_data_response(loop_monitor.snapshot(), message='Loop stall report retrieved successfully.')
+
+
+@router.post('/loop-stalls/reset', response_model=Report, status_code=status.HTTP_200_OK)
+async def reset_loop_stalls():
+	report = loop_monitor.snapshot()
+	loop_monitor.reset()
+	return make_data_response(report, message='Loop stall report reset.')
+
+
+@router.get('/lookup-cache', response_model=Report, status_code=status.HTTP_200_OK)
+async def lookup_cache_stats():
+	"""Per-table size and hit / miss / eviction counters of the public_id / name lookup cache."""
+	return make_data_response(lookup_cache.stats(), message='Lookup cache stats retrieved successfully.')
+
+
+@router.post('/lookup-cache/reset', response_model=Report, status_code=status.HTTP_200_OK)
+async def reset_lookup_cache_stats():
+	report = lookup_cache.stats()
+	lookup_cache.reset_stats()
+	return make_data_response(report, message='Lookup cache stats reset.')
+
+
+@router.get('/compression-cache', response_model=Report, status_code=status.HTTP_200_OK)
+async def compression_cache_stats():
+	"""Size and hit / miss / eviction counters of the compressed response body cache."""
+	return make_data_response(
+		compressed_cache.stats(), message='Compression cache stats retrieved successfully.'
+	)
+
+
+@router.post('/compression-cache/reset', response_model=Report, status_code=status.HTTP_200_OK)
+async def reset_compression_cache_stats():
+	report = compressed_cache.stats()
+	compressed_cache.reset_stats()
+	return make_data_response(report, message='Compression cache stats reset.')
+
+
+@router.get('/pool', response_model=Report, status_code=status.HTTP_200_OK)
+async def pool_stats():
+	"""Per-engine pool usage, checkout wait histogram (ms) and checkout timeouts of this worker."""
+	return make_data_response(pool_metrics.stats(), message='Connection pool stats retrieved successfully.')
+
+
+@router.post('/pool/reset', response_model=Report, status_code=status.HTTP_200_OK)
+async def reset_pool_stats():
+	report = pool_metrics.stats()
+	pool_metrics.reset_stats()
+	return make_data_response(report, message='Connection pool stats reset.')
+
+
+@router.get('/replicas', response_model=Report, status_code=status.HTTP_200_OK)
+async def replica_stats():
+	"""Health, replication lag and session / failure counters of each read replica."""
+	return make_data_response(replicas.stats(), message='Replica stats retrieved successfully.')
+
+
+@router.post('/replicas/reset', response_model=Report, status_code=status.HTTP_200_OK)
+async def reset_replica_stats():
+	report = replicas.stats()
+	replicas.reset_stats()
+	return make_data_response(report, message='Replica stats reset.')
@@ -1,72 +1,130 @@
-from fastapi import APIRouter, HTTPException, status
+from collections.abc import AsyncIterator
+from typing import Annotated
 
-from dependencies import DbSession, Pagination
-from repositories import NewsletterRepository
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+
+from db.pagination import keyset_cursors
+from dependencies import AsyncDbSession, Pagination, async_unit_of_work
+from repositories import AsyncNewsletterRepository, SubscribeStatus
+from repositories.news.subscriber_export import stream_subscribers
+from repositories.news.subscriber_import import aimport_subscribers
 from schemas import (
 	Paginated,
 	ResponseBase,
 	ResponseData,
+	SchemaResponse,
 	make_data_response,
 	make_paginated_response,
 	make_response,
+	validate_many,
+	validate_one,
+)
+from schemas.news import (
+	SubscribeIn,
+	SubscriberExportParams,
+	SubscriberFileFormat,
+	SubscriberImportOut,
+	SubscriberOut,
+	Unsubscribe,
 )
-from schemas.news import SubscribeIn, SubscriberOut, Unsubscribe
 
 router = APIRouter(prefix='/newsletter', tags=['Newsletter'])
 
 
 @router.post('/subscribe', response_model=ResponseData[SubscriberOut], status_code=status.HTTP_201_CREATED)
-async def subscribe(subscriber: SubscribeIn, db: DbSession):
-	repo = NewsletterRepository(db)
-	existing = repo.get_by_email(subscriber.email, include_deleted=True)
-	if existing:
-		if not existing.is_active:
-			repo.restore(subscriber.email)
-			existing = repo.get_by_email(subscriber.email)
-			out_obj = SubscriberOut.model_validate(existing, from_attributes=True)
-			return make_data_response(
+async def subscribe(subscriber: SubscribeIn, db: AsyncDbSession):
+	sub, outcome = await AsyncNewsletterRepository(db).subscribe(subscriber.email)
+	if outcome is SubscribeStatus.ACTIVE:
+		raise HTTPException(
+			status_code=status.HTTP_400_BAD_REQUEST,
+			detail='Email already subscribed.',
+		)
+	out_obj = validate_one(SubscriberOut, sub)
+	if outcome is SubscribeStatus.RESTORED:
+		return SchemaResponse(
+			make_data_response(
 				out_obj,
 				status_code=status.HTTP_200_OK,
 				message='Subscriber restored successfully.',
 			)
+		)
+	return SchemaResponse(
+		make_data_response(
+			out_obj, status_code=status.HTTP_201_CREATED, message='Subscriber created successfully.'
+		),
+		status_code=status.HTTP_201_CREATED,
+	)
+
+
+@router.post(
+	'/subscribers/import', response_model=ResponseData[SubscriberImportOut], status_code=status.HTTP_200_OK
+)
+async def import_subscribers(
+	request: Request,
+	db: AsyncDbSession,
+	fmt: SubscriberFileFormat | None = Query(
+		None, alias='format', description='Overrides the format implied by Content-Type'
+	),
+):
+	"""Bulk import from a streamed CSV (`text/csv`) or NDJSON (`application/x-ndjson`) body."""
+	fmt = fmt or SubscriberFileFormat.from_content_type(request.headers.get('content-type'))
+	if fmt is None:
 		raise HTTPException(
-			status_code=status.HTTP_400_BAD_REQUEST,
-			detail='Email already subscribed.',
+			status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+			detail='Send text/csv or application/x-ndjson, or pass ?format=csv|ndjson.',
 		)
-	new_subscriber = repo.create(subscriber.email)
-	out_obj = SubscriberOut.model_validate(new_subscriber, from_attributes=True)
-	return make_data_response(
-		out_obj, status_code=status.HTTP_201_CREATED, message='Subscriber created successfully.'
+	summary = await aimport_subscribers(db, request.stream(), fmt)
+	return make_data_response(summary, status_code=status.HTTP_200_OK, message='Subscribers imported.')
+
+
+async def _export_chunks(params: SubscriberExportParams) -> AsyncIterator[bytes]:
+	# own session rather than the request's: the body is produced after the handler
+	# (and its dependencies) have returned
+	async with async_unit_of_work() as db:
+		async for chunk in stream_subscribers(db, params):
+			yield chunk
+
+
+@router.get('/subscribers/export', response_class=StreamingResponse)
+async def export_subscribers(params: Annotated[SubscriberExportParams, Query()]):
+	"""Stream every matching subscriber as CSV or NDJSON from a single consistent snapshot."""
+	return StreamingResponse(
+		_export_chunks(params),
+		media_type=params.format.media_type,
+		headers={'Content-Disposition': f'attachment; filename="subscribers.{params.format.value}"'},
 	)
 
 
 @router.get('/subscribers', response_model=Paginated[SubscriberOut], status_code=status.HTTP_200_OK)
-async def list_subscribers(pagination: Pagination, db: DbSession):
-	repo = NewsletterRepository(db)
-	raw_items = repo.get_all(limit=pagination.limit, offset=pagination.offset)
-	items = [SubscriberOut.model_validate(obj, from_attributes=True) for obj in raw_items]
-	total = repo.count()
+async def list_subscribers(pagination: Pagination, db: AsyncDbSession):
+	repo = AsyncNewsletterRepository(db)
+	page = await repo.paginate(pagination)
+	items = validate_many(SubscriberOut, page.items)
+	next_cursor, prev_cursor = keyset_cursors(page.items, pagination, has_more=page.has_more)
 
-	return make_paginated_response(
+	content = make_paginated_response(
 		items=items,
-		total=total,
+		total=page.total,
 		limit=pagination.limit,
 		offset=pagination.offset,
 		message='Subscribers retrieved successfully.',
 		status_code=status.HTTP_200_OK,
+		next_cursor=next_cursor,
+		prev_cursor=prev_cursor,
+		has_more=page.has_more,
+		count_strategy=page.count_strategy,
 	)
+	return SchemaResponse(content)
 
 
 @router.delete('/unsubscribe', response_model=ResponseBase, status_code=status.HTTP_200_OK)
-async def unsubscribe(unsubscriber: Unsubscribe, db: DbSession):
-	repo = NewsletterRepository(db)
-	existing = repo.get_by_public_id(unsubscriber.public_id)
-	if not existing:
+async def unsubscribe(unsubscriber: Unsubscribe, db: AsyncDbSession):
+	if not await AsyncNewsletterRepository(db).soft_delete(unsubscriber.public_id):
 		raise HTTPException(
 			status_code=status.HTTP_404_NOT_FOUND,
 			detail='Subscriber not found.',
 		)
-	repo.soft_delete(unsubscriber.public_id)
 	return make_response(
 		status_code=status.HTTP_204_NO_CONTENT, success=True, message='Subscriber unsubscribed successfully.'
 	)
@@ -1,62 +1,87 @@
 # src/api/tracks/course_router.py
+
 from fastapi import APIRouter, HTTPException, status
 
-from dependencies import DbSession, Pagination
-from repositories.track.course_repo import CourseRepository
-from schemas import Paginated, ResponseBase, ResponseData, make_data_response, make_paginated_response
+from db.pagination import keyset_cursors
+from db.versioning import aget_version, version_stmt
+from dependencies import AsyncDbSession, Conditional, Pagination
+from models import Course, Track
+from repositories.track.course_repo import AsyncCourseRepository
+from schemas import (
+	Paginated,
+	ResponseBase,
+	ResponseData,
+	SchemaResponse,
+	make_data_response,
+	make_paginated_response,
+	validate_many,
+	validate_one,
+)
 from schemas.tracks import CourseCreate, CourseOut, CourseUpdate
 
 router = APIRouter(prefix='/courses', tags=['Courses'])
 
 
 @router.post('/', response_model=ResponseData[CourseOut], status_code=status.HTTP_201_CREATED)
-async def create_course(payload: CourseCreate, db: DbSession):
-	repo = CourseRepository(db)
-	obj = repo.create(payload.model_dump())
-	return make_data_response(
-		CourseOut.model_validate(obj, from_attributes=True),
+async def create_course(payload: CourseCreate, db: AsyncDbSession):
+	repo = AsyncCourseRepository(db)
+	obj = await repo.create(payload.model_dump())
+	return SchemaResponse(
+		make_data_response(
+			validate_one(CourseOut, obj),
+			status_code=status.HTTP_201_CREATED,
+			message='Course created successfully',
+		),
 		status_code=status.HTTP_201_CREATED,
-		message='Course created successfully',
 	)
 
 
 @router.get('/', response_model=Paginated[CourseOut], status_code=status.HTTP_200_OK)
-async def list_all_courses(db: DbSession, pagination: Pagination):
-	repo = CourseRepository(db)
-	raw_items = repo.get_all(limit=pagination.limit, offset=pagination.offset)
-	items = [CourseOut.model_validate(obj, from_attributes=True) for obj in raw_items]
-	total = repo.count()
-	return make_paginated_response(
+async def list_all_courses(db: AsyncDbSession, pagination: Pagination, conditional: Conditional):
+	# items embed their track, so track edits change the version too
+	if not_modified := conditional.not_modified(await aget_version(db, version_stmt(Course, Track))):
+		return not_modified
+	repo = AsyncCourseRepository(db)
+	page = await repo.paginate(pagination)
+	items = validate_many(CourseOut, page.items)
+	next_cursor, prev_cursor = keyset_cursors(page.items, pagination, has_more=page.has_more)
+	content = make_paginated_response(
 		items=items,
-		total=total,
+		total=page.total,
 		limit=pagination.limit,
 		offset=pagination.offset,
 		message='Courses retrieved successfully.',
 		status_code=status.HTTP_200_OK,
+		next_cursor=next_cursor,
+		prev_cursor=prev_cursor,
+		has_more=page.has_more,
+		count_strategy=page.count_strategy,
 	)
+	return SchemaResponse(content, headers=conditional.headers)
 
 
 @router.patch('/{course_id}/', response_model=ResponseData[CourseOut], status_code=status.HTTP_200_OK)
-async def update_course(course_id: int, payload: CourseUpdate, db: DbSession):
-	repo = CourseRepository(db)
-	existing = repo.get(course_id)
+async def update_course(course_id: int, payload: CourseUpdate, db: AsyncDbSession):
+	repo = AsyncCourseRepository(db)
+	existing = await repo.get(course_id)
 	if not existing:
 		raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Course not found')
-	obj = repo.update(course_id, payload.model_dump())
-	return make_data_response(
-		CourseOut.model_validate(obj, from_attributes=True),
-		status_code=status.HTTP_200_OK,
-		message='Course updated successfully',
+	obj = await repo.update(existing.public_id, payload.model_dump())
+	if obj is None:  # deleted since the lookup
+		raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Course not found')
+	return SchemaResponse(
+		make_data_response(
+			validate_one(CourseOut, obj),
+			status_code=status.HTTP_200_OK,
+			message='Course updated successfully',
+		)
 	)
 
 
 @router.delete('/{course_id}/', response_model=ResponseBase, status_code=status.HTTP_200_OK)
-async def delete_course(course_id: int, db: DbSession):
-	repo = CourseRepository(db)
-	existing = repo.get(course_id)
-	if not existing:
+async def delete_course(course_id: int, db: AsyncDbSession):
+	if not await AsyncCourseRepository(db).soft_delete(course_id):
 		raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Course not found')
-	repo.delete(course_id)
 	return ResponseBase(
 		success=True,
 		status_code=status.HTTP_204_NO_CONTENT,
@@ -2,62 +2,98 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Response, status
 
-from dependencies import DbSession, Pagination
-
-# (Module model not directly used in router; imported indirectly in service.)
+from config.settings import settings
+from db.pagination import keyset_cursors
+from db.versioning import get_version, version_stmt
+from dependencies import Conditional, DbSession, Pagination
+from models import Module
 from repositories.track.module_composite import ModuleCompositeService
 from schemas import (
 	Paginated,
-	ResponseBase,
 	ResponseData,
+	SchemaResponse,
 	make_data_response,
 	make_paginated_response,
-	make_response,
+	render_data_response,
+	validate_many,
+)
+from schemas.tracks import (
+	ModuleCompositeDeleted,
+	ModuleCompositeIn,
+	ModuleCompositeOut,
+	ModuleCompositeUpdate,
+	ModuleOut,
 )
-from schemas.tracks import ModuleCompositeIn, ModuleCompositeOut, ModuleCompositeUpdate, ModuleOut
 
 router = APIRouter(prefix='/modules', tags=['Modules'])
 
 
 @router.get('/', response_model=Paginated[ModuleOut], status_code=status.HTTP_200_OK)
-def list_modules(db: DbSession, pagination: Pagination):
+def list_modules(db: DbSession, pagination: Pagination, conditional: Conditional):
 	"""Paginated list of modules (without contents/media)."""
-	raw_items = ModuleCompositeService.get_all(db, limit=pagination.limit, offset=pagination.offset)
-	items = [ModuleOut.model_validate(o, from_attributes=True) for o in raw_items]
-	total = ModuleCompositeService.count(db)
-	return make_paginated_response(
+	if not_modified := conditional.not_modified(get_version(db, version_stmt(Module))):
+		return not_modified
+	page = ModuleCompositeService.paginate(db, pagination)
+	items = validate_many(ModuleOut, page.items)
+	next_cursor, prev_cursor = keyset_cursors(page.items, pagination, has_more=page.has_more)
+	content = make_paginated_response(
 		items=items,
-		total=total,
+		total=page.total,
 		limit=pagination.limit,
 		offset=pagination.offset,
 		message='Modules retrieved successfully.',
 		status_code=status.HTTP_200_OK,
+		next_cursor=next_cursor,
+		prev_cursor=prev_cursor,
+		has_more=page.has_more,
+		count_strategy=page.count_strategy,
 	)
+	return SchemaResponse(content, headers=conditional.headers)
 
 
 """Composite serialization handled by service layer; helpers removed for brevity."""
 
 
 @router.get('/{public_id}/', response_model=ResponseData[ModuleCompositeOut], status_code=status.HTTP_200_OK)
-def get_module_composite(public_id: UUID, db: DbSession):
+def get_module_composite(public_id: UUID, db: DbSession, conditional: Conditional):
 	"""Retrieve a full composite (module + contents + media)."""
+	version = ModuleCompositeService.version(db, public_id)
+	if version is not None and (not_modified := conditional.not_modified(version)):
+		return not_modified
+	if settings.composite_json_in_db:
+		document = ModuleCompositeService.render_module_composite_json(db, public_id)
+		if document is None:
+			raise HTTPException(status_code=404, detail='Module not found')
+		return Response(
+			content=render_data_response(
+				document,
+				status_code=status.HTTP_200_OK,
+				message='Composite module retrieved successfully',
+			),
+			media_type='application/json',
+			headers=conditional.headers,
+		)
 	composite = ModuleCompositeService.get_module_composite(db, public_id)
 	if not composite:
 		raise HTTPException(status_code=404, detail='Module not found')
-	return make_data_response(
-		composite,
-		status_code=status.HTTP_200_OK,
-		message='Composite module retrieved successfully',
+	return SchemaResponse(
+		make_data_response(
+			composite,
+			status_code=status.HTTP_200_OK,
+			message='Composite module retrieved successfully',
+		),
+		headers=conditional.headers,
 	)
 
 
 @router.post('/', response_model=ResponseData[ModuleCompositeOut], status_code=status.HTTP_201_CREATED)
 def create_module_composite(payload: ModuleCompositeIn, db: DbSession):
 	composite = ModuleCompositeService.create_module_composite(db, payload)
-	return make_data_response(
-		composite, status_code=status.HTTP_201_CREATED, message='Composite module created'
+	return SchemaResponse(
+		make_data_response(composite, status_code=status.HTTP_201_CREATED, message='Composite module created'),
+		status_code=status.HTTP_201_CREATED,
 	)
 
 
@@ -66,12 +102,16 @@ def update_module_composite(public_id: UUID, payload: ModuleCompositeUpdate, db:
 	composite = ModuleCompositeService.update_module_composite(db, public_id, payload)
 	if not composite:
 		raise HTTPException(status_code=404, detail='Module not found')
-	return make_data_response(composite, status_code=status.HTTP_200_OK, message='Composite module updated')
+	return SchemaResponse(
+		make_data_response(composite, status_code=status.HTTP_200_OK, message='Composite module updated')
+	)
 
 
-@router.delete('/{public_id}/', response_model=ResponseBase, status_code=status.HTTP_200_OK)
+@router.delete(
+	'/{public_id}/', response_model=ResponseData[ModuleCompositeDeleted], status_code=status.HTTP_200_OK
+)
 def delete_module_composite(public_id: UUID, db: DbSession):
 	deleted = ModuleCompositeService.delete_module_composite(db, public_id)
 	if not deleted:
 		raise HTTPException(status_code=404, detail='Module not found')
-	return make_response(status_code=status.HTTP_200_OK, success=True, message='Composite module deleted')
+	return make_data_response(deleted, status_code=status.HTTP_200_OK, message='Composite module deleted')
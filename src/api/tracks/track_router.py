@@ -3,77 +3,120 @@ from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, status
 
-from dependencies import DbSession, Pagination
-from models import Track
-from repositories import TrackRepository
+from db.pagination import keyset_cursors
+from db.versioning import aget_version, version_stmt
+from dependencies import AsyncDbSession, Conditional, Pagination
+from models import Course, Track
+from repositories import AsyncCourseRepository, AsyncTrackRepository
 from schemas import (
 	Paginated,
 	ResponseBase,
 	ResponseData,
+	SchemaResponse,
 	make_data_response,
 	make_paginated_response,
 	make_response,
+	validate_many,
+	validate_one,
 )
-from schemas.tracks import TrackCreate, TrackOut
+from schemas.tracks import CourseOut, TrackCreate, TrackOut
 
 router = APIRouter(prefix='/tracks', tags=['Tracks'])
 
 
 @router.post('/', response_model=ResponseData[Track], status_code=status.HTTP_201_CREATED)
-async def create_track(payload: TrackCreate, db: DbSession):
-	repo = TrackRepository(db)
-	existing = repo.get_by_name(payload.name, include_deleted=True)
+async def create_track(payload: TrackCreate, db: AsyncDbSession):
+	repo = AsyncTrackRepository(db)
+	existing = await repo.get_by_name(payload.name, include_deleted=True)
 	if existing:
 		raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail='Track name already exists')
-	obj = repo.create(payload.model_dump())
+	obj = await repo.create(payload.model_dump())
+	# obj is already a Track; re-validating it would touch the lazy `courses` relationship
 	return make_data_response(
-		Track.model_validate(obj, from_attributes=True),
+		obj,
 		status_code=status.HTTP_201_CREATED,
 		message='Track created successfully',
 	)
 
 
 @router.get('/', response_model=Paginated[TrackOut], status_code=status.HTTP_200_OK)
-async def list_all_tracks(db: DbSession, pagination: Pagination):
-	repo = TrackRepository(db)
-	raw_items = repo.get_all(limit=pagination.limit, offset=pagination.offset)
+async def list_all_tracks(db: AsyncDbSession, pagination: Pagination, conditional: Conditional):
+	if not_modified := conditional.not_modified(await aget_version(db, version_stmt(Track))):
+		return not_modified
+	repo = AsyncTrackRepository(db)
+	page = await repo.paginate(pagination)
 
-	items = [TrackOut.model_validate(obj, from_attributes=True) for obj in raw_items]
+	items = validate_many(TrackOut, page.items)
 
-	total = repo.count()
+	next_cursor, prev_cursor = keyset_cursors(page.items, pagination, has_more=page.has_more)
 
-	return make_paginated_response(
+	content = make_paginated_response(
 		items=items,
-		total=total,
+		total=page.total,
 		limit=pagination.limit,
 		offset=pagination.offset,
 		message='Tracks retrieved successfully.',
 		status_code=status.HTTP_200_OK,
+		next_cursor=next_cursor,
+		prev_cursor=prev_cursor,
+		has_more=page.has_more,
+		count_strategy=page.count_strategy,
 	)
+	return SchemaResponse(content, headers=conditional.headers)
+
+
+@router.get('/{public_id}/courses', response_model=Paginated[CourseOut], status_code=status.HTTP_200_OK)
+async def list_track_courses(
+	public_id: UUID, db: AsyncDbSession, pagination: Pagination, conditional: Conditional
+):
+	"""A track's courses in `order`, paged by keyset on (track_public_id, order)."""
+	if not await AsyncTrackRepository(db).get_by_public_id(public_id):
+		raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Track not found')
+	version = await aget_version(
+		db, version_stmt((Course, Course.track_public_id == public_id), (Track, Track.public_id == public_id))
+	)
+	if not_modified := conditional.not_modified(version):
+		return not_modified
+
+	page = await AsyncCourseRepository(db).paginate_for_track(public_id, pagination)
+	items = validate_many(CourseOut, page.items)
+	next_cursor, prev_cursor = keyset_cursors(page.items, pagination, key='order', has_more=page.has_more)
+	content = make_paginated_response(
+		items=items,
+		total=page.total,
+		limit=pagination.limit,
+		offset=pagination.offset,
+		message='Track courses retrieved successfully.',
+		status_code=status.HTTP_200_OK,
+		next_cursor=next_cursor,
+		prev_cursor=prev_cursor,
+		has_more=page.has_more,
+		count_strategy=page.count_strategy,
+	)
+	return SchemaResponse(content, headers=conditional.headers)
 
 
 @router.patch('/{public_id}/', response_model=ResponseData[TrackOut], status_code=status.HTTP_200_OK)
-async def update_track(public_id: UUID, payload: TrackCreate, db: DbSession):
-	repo = TrackRepository(db)
-	existing = repo.get_by_public_id(public_id, include_deleted=True)
+async def update_track(public_id: UUID, payload: TrackCreate, db: AsyncDbSession):
+	repo = AsyncTrackRepository(db)
+	existing = await repo.get_by_public_id(public_id, include_deleted=True)
 
 	if not existing:
 		raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Track not found')
-	obj = repo.update(public_id, payload.model_dump())
-	return make_data_response(
-		TrackOut.model_validate(obj, from_attributes=True),
-		status_code=status.HTTP_200_OK,
-		message='Track updated successfully',
+	obj = await repo.update(public_id, payload.model_dump())
+	return SchemaResponse(
+		make_data_response(
+			validate_one(TrackOut, obj),
+			status_code=status.HTTP_200_OK,
+			message='Track updated successfully',
+		)
 	)
 
 
 @router.delete('/{public_id}/', response_model=ResponseBase, status_code=status.HTTP_200_OK)
-async def delete_track(public_id: UUID, db: DbSession):
-	repo = TrackRepository(db)
-	existing = repo.get_by_public_id(public_id)
-	if not existing:
+async def delete_track(public_id: UUID, db: AsyncDbSession):
+	if not await AsyncTrackRepository(db).soft_delete(public_id):
 		raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='Track not found')
-	repo.soft_delete(public_id)
 	return make_response(
 		status_code=status.HTTP_204_NO_CONTENT, success=True, message='Track deleted successfully.'
 	)
@@ -0,0 +1,579 @@
+# src/benchmarks/http.py
+"""HTTP benchmark of every newsletter, track, course and module endpoint.
+
+Recreates a scratch database, seeds it deterministically and boots
+`core.main:app` under uvicorn. Each endpoint is then driven at fixed concurrency
+levels. For every endpoint and level the run records throughput, latency
+percentiles and SQL statements per request (read from the Server-Timing header).
+It can compare the run against a stored results file.
+
+Usage (from src/; the scratch database is dropped and recreated on every run):
+	python -m benchmarks.http --output before.json
+	python -m benchmarks.http --output after.json --baseline before.json
+	python -m benchmarks.http --only tracks.,courses.list --concurrency 1,16 --requests 500
+
+The database defaults to DATABASE_URL with the name `cerebro_bench`. Any
+Postgres will do, e.g. a throwaway `docker run -p 5433:5432 postgres:16`.
+"""
+
+import argparse
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+import json
+import os
+from pathlib import Path
+import platform
+import random
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any
+from uuid import UUID
+
+import httpx
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.engine import URL, make_url
+from sqlmodel import SQLModel
+
+from models import ContentMedia, Course, Module, ModuleContent, Track
+from models.news import NewsletterSubscriber
+
+SRC = Path(__file__).resolve().parents[1]
+BASE_TIME = datetime(2025, 1, 1, tzinfo=UTC).replace(tzinfo=None)  # naive UTC, like the timestamp columns
+SERVER_TIMING = re.compile(r'db;dur=([\d.]+);desc="(\d+) statements"')
+
+
+# ---- deterministic seed ----
+
+
+@dataclass
+class Fixture:
+	tracks: list[UUID] = field(default_factory=list)
+	track_names: list[str] = field(default_factory=list)
+	sink_track: UUID | None = None  # new courses go here
+	course_ids: list[int] = field(default_factory=list)
+	modules: list[UUID] = field(default_factory=list)
+	# one row per destructive request (warm-up included)
+	disposable_tracks: list[UUID] = field(default_factory=list)
+	disposable_courses: list[int] = field(default_factory=list)
+	disposable_modules: list[UUID] = field(default_factory=list)
+	leaving_subscribers: list[str] = field(default_factory=list)
+
+
+class _Rows:
+	"""Row dicts with seeded UUIDs and strictly increasing timestamps."""
+
+	def __init__(self, seed: int):
+		self.rng = random.Random(seed)
+		self.tick = 0
+
+	def uuid(self) -> UUID:
+		return UUID(int=self.rng.getrandbits(128), version=4)
+
+	def stamps(self) -> dict[str, Any]:
+		self.tick += 1
+		at = BASE_TIME + timedelta(milliseconds=self.tick)
+		return {'created': at, 'updated': at, 'is_deleted': False}
+
+
+def _markdown(rng: random.Random) -> str:
+	words = ['query', 'index', 'cursor', 'session', 'engine', 'schema', 'router', 'latency', 'pool', 'cache']
+	return '# Notes\n\n' + ' '.join(rng.choice(words) for _ in range(300))
+
+
+def recreate_database(url: URL) -> None:
+	admin = create_engine(url.set(database='postgres'), isolation_level='AUTOCOMMIT')
+	with admin.connect() as conn:
+		conn.exec_driver_sql(f'DROP DATABASE IF EXISTS "{url.database}" WITH (FORCE)')
+		conn.exec_driver_sql(f'CREATE DATABASE "{url.database}"')
+	admin.dispose()
+
+
+def seed(url: URL, *, seed: int, scale: int, disposable: int) -> Fixture:
+	"""Create the schema and load a dataset that depends only on `seed` and `scale`."""
+	rows, fx = _Rows(seed), Fixture()
+	tracks, courses, modules, contents, media, subscribers = [], [], [], [], [], []
+
+	def track(name: str) -> UUID:
+		public_id = rows.uuid()
+		tracks.append({'public_id': public_id, 'name': name, 'description': f'{name} track', **rows.stamps()})
+		return public_id
+
+	def course(track_id: UUID, title: str, order: int) -> UUID:
+		public_id = rows.uuid()
+		courses.append(
+			{
+				'public_id': public_id,
+				'track_public_id': track_id,
+				'title': title,
+				'order': order,
+				**rows.stamps(),
+			}
+		)
+		return public_id
+
+	def module(name: str, order: int, n_contents: int, n_media: int) -> UUID:
+		public_id = rows.uuid()
+		modules.append({'public_id': public_id, 'name': name, 'order': order, **rows.stamps()})
+		for c in range(n_contents):
+			content_id = rows.uuid()
+			contents.append(
+				{
+					'public_id': content_id,
+					'module_public_id': public_id,
+					'title': f'{name} part {c + 1}',
+					'order': c + 1,
+					'markdown': _markdown(rows.rng),
+					'draft': False,
+					'is_published': True,
+					'tags': ['bench', f'part-{c + 1}'],
+					**rows.stamps(),
+				}
+			)
+			media.extend(
+				{
+					'public_id': rows.uuid(),
+					'module_content_public_id': content_id,
+					'name': f'media {m}',  # the caption column
+					'position': m,
+					'url': f'https://cdn.example.com/{content_id}/{m}.mp4',
+					'meta': {'ext': 'mp4', 'size': rows.rng.randrange(1 << 20, 1 << 26)},
+					**rows.stamps(),
+				}
+				for m in range(n_media)
+			)
+		return public_id
+
+	for t in range(10 * scale):
+		name = f'track {t:04d}'
+		fx.tracks.append(track(name))
+		fx.track_names.append(name)
+		for c in range(20):
+			course(fx.tracks[-1], f'course {c:03d}', c + 1)
+	fx.sink_track = track('sink')
+	for m in range(20 * scale):
+		fx.modules.append(module(f'module {m:04d}', m + 1, n_contents=5, n_media=3))
+	subscribers.extend(
+		{
+			'public_id': str(rows.uuid()),
+			'email': f'reader{i:06d}@example.com',
+			'is_active': True,
+			**rows.stamps(),
+		}
+		for i in range(2000 * scale)
+	)
+
+	spare = track('disposable')
+	for i in range(disposable):
+		fx.disposable_tracks.append(track(f'disposable track {i:05d}'))
+		course(spare, f'disposable course {i:05d}', i + 1)
+		fx.disposable_modules.append(module(f'disposable module {i:05d}', i + 1, n_contents=1, n_media=1))
+		public_id = str(rows.uuid())
+		fx.leaving_subscribers.append(public_id)
+		subscribers.append(
+			{'public_id': public_id, 'email': f'leaving{i:05d}@example.com', 'is_active': True, **rows.stamps()}
+		)
+
+	engine = create_engine(url)
+	SQLModel.metadata.create_all(engine)
+	with engine.begin() as conn:
+		for model, batch in (
+			(Track, tracks),
+			(Course, courses),
+			(Module, modules),
+			(ModuleContent, contents),
+			(ContentMedia, media),
+			(NewsletterSubscriber, subscribers),
+		):
+			conn.execute(insert(model), batch)
+		fx.course_ids = list(
+			conn.scalars(select(Course.id).where(Course.track_public_id.in_(fx.tracks)).order_by(Course.id))
+		)
+		fx.disposable_courses = list(
+			conn.scalars(select(Course.id).where(Course.track_public_id == spare).order_by(Course.order))
+		)
+		conn.exec_driver_sql('ANALYZE')
+	engine.dispose()
+	return fx
+
+
+# ---- scenarios ----
+
+type Build = Callable[[int], dict[str, Any]]  # request number -> httpx.request() kwargs
+
+
+@dataclass
+class Scenario:
+	name: str
+	method: str
+	build: Build
+	expect: int = 200
+
+
+def _content(i: int) -> dict[str, Any]:
+	return {
+		'title': f'new content {i}',
+		'order': 1,
+		'markdown': 'lorem ipsum ' * 50,
+		'media': [{'name': 'clip', 'position': 0, 'url': f'https://cdn.example.com/new/{i}.mp4'}],
+	}
+
+
+def scenarios(fx: Fixture) -> list[Scenario]:
+	def nth(items: list, i: int):
+		return items[i % len(items)]
+
+	csv_header = 'email,is_active\n'
+	return [
+		# newsletter_router
+		Scenario(
+			'newsletter.subscribe',
+			'POST',
+			lambda i: {'url': '/newsletter/subscribe', 'json': {'email': f'new{i:06d}@example.com'}},
+			201,
+		),
+		Scenario(
+			'newsletter.import',
+			'POST',
+			lambda i: {
+				'url': '/newsletter/subscribers/import',
+				'content': csv_header
+				+ ''.join(f'imported{i:05d}-{k:03d}@example.com,true\n' for k in range(100)),
+				'headers': {'content-type': 'text/csv'},
+			},
+		),
+		Scenario('newsletter.export', 'GET', lambda i: {'url': '/newsletter/subscribers/export?format=ndjson'}),
+		Scenario('newsletter.list', 'GET', lambda i: {'url': '/newsletter/subscribers?limit=50'}),
+		Scenario(
+			'newsletter.unsubscribe',
+			'DELETE',
+			lambda i: {'url': '/newsletter/unsubscribe', 'json': {'public_id': fx.leaving_subscribers[i]}},
+		),
+		# track_router
+		Scenario(
+			'tracks.create', 'POST', lambda i: {'url': '/tracks/', 'json': {'name': f'new track {i}'}}, 201
+		),
+		Scenario('tracks.list', 'GET', lambda i: {'url': '/tracks/?limit=20'}),
+		Scenario('tracks.courses', 'GET', lambda i: {'url': f'/tracks/{nth(fx.tracks, i)}/courses?limit=20'}),
+		Scenario(
+			'tracks.update',
+			'PATCH',
+			lambda i: {
+				'url': f'/tracks/{nth(fx.tracks, i)}/',
+				'json': {'name': nth(fx.track_names, i), 'description': f'revision {i}'},
+			},
+		),
+		Scenario('tracks.delete', 'DELETE', lambda i: {'url': f'/tracks/{fx.disposable_tracks[i]}/'}),
+		# course_router
+		Scenario(
+			'courses.create',
+			'POST',
+			lambda i: {
+				'url': '/courses/',
+				'json': {'track_public_id': str(fx.sink_track), 'title': f'new course {i}', 'order': i + 1},
+			},
+			201,
+		),
+		Scenario('courses.list', 'GET', lambda i: {'url': '/courses/?limit=20'}),
+		Scenario(
+			'courses.update',
+			'PATCH',
+			lambda i: {'url': f'/courses/{nth(fx.course_ids, i)}/', 'json': {'description': f'revision {i}'}},
+		),
+		Scenario('courses.delete', 'DELETE', lambda i: {'url': f'/courses/{fx.disposable_courses[i]}/'}),
+		# module_router
+		Scenario('modules.list', 'GET', lambda i: {'url': '/modules/?limit=20'}),
+		Scenario('modules.composite', 'GET', lambda i: {'url': f'/modules/{nth(fx.modules, i)}/'}),
+		Scenario(
+			'modules.create',
+			'POST',
+			lambda i: {
+				'url': '/modules/',
+				'json': {'module': {'name': f'new module {i}', 'order': i + 1}, 'contents': [_content(i)]},
+			},
+			201,
+		),
+		Scenario(
+			'modules.update',
+			'PATCH',
+			lambda i: {
+				'url': f'/modules/{nth(fx.modules, i)}/',
+				'json': {'module': {'description': f'revision {i}'}},
+			},
+		),
+		Scenario('modules.delete', 'DELETE', lambda i: {'url': f'/modules/{fx.disposable_modules[i]}/'}),
+	]
+
+
+# ---- load generation ----
+
+
+@dataclass
+class Sample:
+	seconds: float
+	ok: bool
+	statements: int | None
+	db_ms: float | None
+
+
+async def drive(
+	client: httpx.AsyncClient, scenario: Scenario, first: int, count: int, concurrency: int
+) -> tuple[list[Sample], float, str | None]:
+	"""Send requests `first`..`first + count - 1` with `concurrency` in flight; returns samples and wall time."""
+	samples: list[Sample] = []
+	numbers = iter(range(first, first + count))
+	first_error: list[str] = []
+
+	async def worker() -> None:
+		for i in numbers:
+			request = scenario.build(i)
+			start = time.perf_counter()
+			try:
+				response = await client.request(scenario.method, **request)
+				await response.aread()
+			except httpx.TransportError as exc:
+				samples.append(Sample(time.perf_counter() - start, False, None, None))
+				if not first_error:
+					first_error.append(repr(exc))
+				continue
+			elapsed = time.perf_counter() - start
+			ok = response.status_code == scenario.expect
+			if not ok and not first_error:
+				first_error.append(f'{response.status_code} {response.text[:200]}')
+			timing = SERVER_TIMING.search(response.headers.get('server-timing', ''))
+			samples.append(
+				Sample(
+					elapsed,
+					ok,
+					int(timing.group(2)) if timing else None,
+					float(timing.group(1)) if timing else None,
+				)
+			)
+
+	start = time.perf_counter()
+	await asyncio.gather(*(worker() for _ in range(concurrency)))
+	return samples, time.perf_counter() - start, (first_error or [None])[0]
+
+
+def summarize(samples: list[Sample], wall: float) -> dict[str, Any]:
+	latencies = sorted(s.seconds * 1000 for s in samples)
+	cuts = statistics.quantiles(latencies, n=100, method='inclusive') if len(latencies) > 1 else latencies * 99
+	statements = [s.statements for s in samples if s.statements is not None]
+	db_ms = [s.db_ms for s in samples if s.db_ms is not None]
+	return {
+		'requests': len(samples),
+		'errors': sum(not s.ok for s in samples),
+		'rps': round(len(samples) / wall, 1),
+		'mean_ms': round(statistics.fmean(latencies), 3),
+		'p50_ms': round(cuts[49], 3),
+		'p95_ms': round(cuts[94], 3),
+		'p99_ms': round(cuts[98], 3),
+		'queries_per_request': round(statistics.fmean(statements), 2) if statements else None,
+		'db_ms_per_request': round(statistics.fmean(db_ms), 3) if db_ms else None,
+	}
+
+
+async def run_all(
+	base_url: str, selected: list[Scenario], levels: list[int], requests: int, warmup: int
+) -> dict[str, dict[str, Any]]:
+	results: dict[str, dict[str, Any]] = {}
+	limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+	async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+		for scenario in selected:
+			cursor = 0  # request numbers never repeat, so creates stay unique and deletes hit fresh rows
+			if warmup:
+				await drive(client, scenario, cursor, warmup, 1)
+				cursor += warmup
+			per_level = results[scenario.name] = {}
+			for level in levels:
+				samples, wall, error = await drive(client, scenario, cursor, requests, level)
+				cursor += requests
+				per_level[str(level)] = summary = summarize(samples, wall)
+				print(_row(scenario.name, level, summary), flush=True)
+				if error:
+					print(f'    first unexpected response: {error}', flush=True)
+	return results
+
+
+# ---- server ----
+
+
+def _free_port() -> int:
+	with socket.socket() as sock:
+		sock.bind(('127.0.0.1', 0))
+		return sock.getsockname()[1]
+
+
+def start_server(database_url: str, port: int, workers: int) -> subprocess.Popen | None:
+	"""Boot uvicorn and wait for `/info`; None (after reporting why) if it never comes up."""
+	env = {
+		**os.environ,
+		'DATABASE_URL': database_url,
+		'PYTHONPATH': str(SRC),
+		'DEBUG': 'false',  # no SQL echo, no create_all at startup
+		'SQL_STATS_ENABLED': 'true',  # Server-Timing carries the statement counts
+	}
+	command = [sys.executable, '-m', 'uvicorn', 'core.main:app', '--host', '127.0.0.1', '--port', str(port)]
+	command += ['--workers', str(workers), '--no-access-log', '--log-level', 'warning']
+	server = subprocess.Popen(command, cwd=SRC, env=env)
+	deadline = time.monotonic() + 30
+	while time.monotonic() < deadline:
+		if server.poll() is not None:
+			print(f'server exited with status {server.returncode}', file=sys.stderr)
+			return None
+		try:
+			if httpx.get(f'http://127.0.0.1:{port}/info', timeout=1).status_code == 200:
+				return server
+		except httpx.TransportError:
+			pass
+		time.sleep(0.2)
+	server.terminate()
+	print('server did not become ready within 30s', file=sys.stderr)
+	return None
+
+
+# ---- reporting ----
+
+
+def _row(name: str, level: int, r: dict[str, Any]) -> str:
+	queries = '-' if r['queries_per_request'] is None else f'{r["queries_per_request"]:.1f}'
+	return (
+		f'{name:<24} {level:>4} {r["rps"]:>9.1f} {r["p50_ms"]:>9.2f} {r["p95_ms"]:>9.2f} '
+		f'{r["p99_ms"]:>9.2f} {queries:>8} {r["errors"]:>6}'
+	)
+
+
+def _header() -> str:
+	return (
+		f'{"endpoint":<24} {"conc":>4} {"req/s":>9} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} '
+		f'{"queries":>8} {"errors":>6}'
+	)
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+	"""Print per endpoint / level deltas; returns the regressions.
+
+	Throughput or p95 worse than `tolerance`, any extra statement per request and
+	new errors count as regressions. Timings depend on the machine; statement
+	counts do not.
+	"""
+	regressions = []
+	print(f'\n{"endpoint":<24} {"conc":>4} {"req/s":>9} {"p95":>9} {"queries":>15}')
+	for name, levels in current['results'].items():
+		for level, now in levels.items():
+			before = baseline.get('results', {}).get(name, {}).get(level)
+			if before is None:
+				continue
+			rps = now['rps'] / before['rps'] - 1 if before['rps'] else 0.0
+			p95 = now['p95_ms'] / before['p95_ms'] - 1 if before['p95_ms'] else 0.0
+			q_now, q_before = now['queries_per_request'], before['queries_per_request']
+			queries = f'{q_before} -> {q_now}' if q_now != q_before else f'{q_now}'
+			problems = []
+			if rps < -tolerance:
+				problems.append('throughput')
+			if p95 > tolerance:
+				problems.append('p95')
+			if q_now is not None and q_before is not None and q_now > q_before + 0.01:
+				problems.append('queries')
+			if now['errors'] > before['errors']:
+				problems.append('errors')
+			flag = f'  REGRESSION: {", ".join(problems)}' if problems else ''
+			print(f'{name:<24} {level:>4} {rps:>+9.1%} {p95:>+9.1%} {queries:>15}{flag}')
+			regressions += [f'{name}@{level}: {p}' for p in problems]
+	return regressions
+
+
+def _git_revision() -> str | None:
+	try:
+		out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SRC, capture_output=True, text=True)
+	except OSError:
+		return None
+	return out.stdout.strip() or None
+
+
+def _bench_url() -> str | None:
+	url = os.environ.get('BENCH_DATABASE_URL')
+	if url:
+		return url
+	if 'DATABASE_URL' in os.environ:
+		return make_url(os.environ['DATABASE_URL']).set(database='cerebro_bench').render_as_string(False)
+	return None
+
+
+def main(argv: list[str] | None = None) -> int:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument(
+		'--database-url',
+		default=_bench_url(),
+		help='scratch database, DROPPED and recreated (default: %(default)s)',
+	)
+	parser.add_argument('--concurrency', default='1,8,32', help='comma-separated in-flight request levels')
+	parser.add_argument('--requests', type=int, default=200, help='requests per endpoint and level')
+	parser.add_argument('--warmup', type=int, default=20, help='unrecorded requests per endpoint first')
+	parser.add_argument('--only', help='comma-separated endpoint name prefixes, e.g. tracks.,modules.list')
+	parser.add_argument('--workers', type=int, default=1, help='uvicorn worker processes')
+	parser.add_argument('--seed', type=int, default=1, help='dataset seed')
+	parser.add_argument('--scale', type=int, default=1, help='dataset size multiplier')
+	parser.add_argument('--output', type=Path, help='write results JSON here')
+	parser.add_argument('--baseline', type=Path, help='results JSON to compare against')
+	parser.add_argument(
+		'--tolerance', type=float, default=0.10, help='allowed slowdown before flagging (0.10 = 10%%)'
+	)
+	args = parser.parse_args(argv)
+	if not args.database_url:
+		parser.error('set --database-url, BENCH_DATABASE_URL or DATABASE_URL')
+
+	levels = [int(level) for level in args.concurrency.split(',')]
+	url = make_url(args.database_url)
+	recreate_database(url)
+	fixture = seed(url, seed=args.seed, scale=args.scale, disposable=args.warmup + args.requests * len(levels))
+	selected = scenarios(fixture)
+	if args.only:
+		prefixes = tuple(args.only.split(','))
+		selected = [s for s in selected if s.name.startswith(prefixes)]
+
+	port = _free_port()
+	server = start_server(url.render_as_string(hide_password=False), port, args.workers)
+	if server is None:
+		return 1
+	try:
+		print(_header())
+		results = asyncio.run(run_all(f'http://127.0.0.1:{port}', selected, levels, args.requests, args.warmup))
+	finally:
+		server.terminate()
+		server.wait(timeout=10)
+
+	report = {
+		'meta': {
+			'created': datetime.now(UTC).isoformat(timespec='seconds'),
+			'revision': _git_revision(),
+			'python': platform.python_version(),
+			'machine': platform.machine(),
+			'cpus': os.cpu_count(),
+			'workers': args.workers,
+			'concurrency': levels,
+			'requests': args.requests,
+			'warmup': args.warmup,
+			'seed': args.seed,
+			'scale': args.scale,
+		},
+		'results': results,
+	}
+	if args.output:
+		args.output.write_text(json.dumps(report, indent=2) + '\n')
+		print(f'\nresults written to {args.output}')
+	if args.baseline:
+		regressions = compare(report, json.loads(args.baseline.read_text()), args.tolerance)
+		if regressions:
+			print(f'\n{len(regressions)} regression(s) against {args.baseline}')
+			return 1
+	return 0
+
+
+if __name__ == '__main__':
+	raise SystemExit(main())
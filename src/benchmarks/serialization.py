@@ -0,0 +1,198 @@
+# src/benchmarks/serialization.py
+"""Per-item cost of the response pipeline: FastAPI response_model path vs validate-once.
+
+Usage (from src/, no database needed):
+	python -m benchmarks.serialization
+	python -m benchmarks.serialization --items 500 --repeat 20
+"""
+
+import argparse
+import asyncio
+from collections.abc import Callable
+from datetime import UTC, datetime
+import time
+from uuid import uuid4
+
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from models import ContentMedia, Course, Module, ModuleContent, Track
+from models.news import NewsletterSubscriber
+from repositories.track.module_composite import _serialize_composite
+from schemas import (
+	Paginated,
+	ResponseData,
+	SchemaResponse,
+	make_data_response,
+	make_paginated_response,
+	validate_many,
+)
+from schemas.news import SubscriberOut
+from schemas.tracks import ContentMediaOut, CourseOut, ModuleCompositeOut, ModuleContentOut, ModuleOut
+
+NOW = datetime.now(UTC).replace(tzinfo=None)
+
+
+# ---- in-memory ORM rows (never attached to a session) ----
+
+
+def _stamps() -> dict:
+	return {'created': NOW, 'updated': NOW, 'is_deleted': False}
+
+
+def make_subscribers(n: int) -> list[NewsletterSubscriber]:
+	return [
+		NewsletterSubscriber(id=i, public_id=uuid4(), email=f'user{i}@example.com', is_active=True, **_stamps())
+		for i in range(n)
+	]
+
+
+def make_courses(n: int) -> list[Course]:
+	track = Track(id=1, public_id=uuid4(), name='backend', description='d', theme='dark', **_stamps())
+	return [
+		Course(
+			id=i,
+			public_id=uuid4(),
+			track_public_id=track.public_id,
+			track=track,
+			title=f'course {i}',
+			order=i + 1,
+			**_stamps(),
+		)
+		for i in range(n)
+	]
+
+
+def make_composite(contents: int, media_per_content: int = 3):
+	module = Module(id=1, public_id=uuid4(), name='module', description='d', order=1, **_stamps())
+	rows, media_map = [], {}
+	for i in range(contents):
+		content = ModuleContent(
+			id=i,
+			public_id=uuid4(),
+			module_public_id=module.public_id,
+			title=f'content {i}',
+			order=i + 1,
+			markdown='# heading\n' + 'lorem ipsum dolor sit amet ' * 80,
+			draft=False,
+			is_published=True,
+			tags=['a', 'b'],
+			**_stamps(),
+		)
+		rows.append(content)
+		media_map[content.public_id] = [
+			ContentMedia(
+				id=j,
+				public_id=uuid4(),
+				module_content_public_id=content.public_id,
+				caption=f'm{j}',
+				position=j,
+				url='https://cdn.example.com/x.mp4',
+				meta={'size': 1},
+				**_stamps(),
+			)
+			for j in range(media_per_content)
+		]
+	return module, rows, media_map
+
+
+# ---- the two pipelines ----
+
+
+_runner = asyncio.Runner()  # one loop for every call, so loop setup is not timed
+
+
+def _fastapi_render(field, content) -> bytes:
+	"""What a route with `response_model` does to a returned model: dump, validate, serialize, render."""
+	data = _runner.run(serialize_response(field=field, response_content=content))
+	return ORJSONResponse(data).body
+
+
+def _legacy_composite(module, contents, media_map) -> ModuleCompositeOut:
+	# the per-content model_dump -> model_validate round trip this benchmark replaced
+	out = [
+		ModuleContentOut.model_validate(
+			{
+				**c.model_dump(),
+				'module': ModuleOut.model_validate(module, from_attributes=True),
+				'media': [
+					ContentMediaOut.model_validate(m, from_attributes=True) for m in media_map[c.public_id]
+				],
+			},
+			from_attributes=True,
+		)
+		for c in contents
+	]
+	return ModuleCompositeOut(module=ModuleOut.model_validate(module, from_attributes=True), contents=out)
+
+
+def _page(items) -> Paginated:
+	return make_paginated_response(items=items, total=len(items), limit=len(items), offset=0)
+
+
+def cases(n: int) -> list[tuple[str, int, Callable[[], bytes], Callable[[], bytes]]]:
+	subscribers = make_subscribers(n)
+	sub_field = create_model_field('Response_subscribers', Paginated[SubscriberOut], mode='serialization')
+	courses = make_courses(n)
+	course_field = create_model_field('Response_courses', Paginated[CourseOut], mode='serialization')
+	composite = make_composite(n)
+	composite_field = create_model_field(
+		'Response_composite', ResponseData[ModuleCompositeOut], mode='serialization'
+	)
+	return [
+		(
+			'SubscriberOut',
+			n,
+			lambda: _fastapi_render(
+				sub_field, _page([SubscriberOut.model_validate(s, from_attributes=True) for s in subscribers])
+			),
+			lambda: SchemaResponse(_page(validate_many(SubscriberOut, subscribers))).body,
+		),
+		(
+			'CourseOut',
+			n,
+			lambda: _fastapi_render(
+				course_field, _page([CourseOut.model_validate(c, from_attributes=True) for c in courses])
+			),
+			lambda: SchemaResponse(_page(validate_many(CourseOut, courses))).body,
+		),
+		(
+			'ModuleCompositeOut',
+			n,  # per content (each with its media)
+			lambda: _fastapi_render(composite_field, make_data_response(_legacy_composite(*composite))),
+			lambda: SchemaResponse(make_data_response(_serialize_composite(*composite))).body,
+		),
+	]
+
+
+def _best(fn: Callable[[], bytes], repeat: int) -> float:
+	fn()  # warm up (adapter compilation, caches)
+	timings = []
+	for _ in range(repeat):
+		start = time.perf_counter()
+		fn()
+		timings.append(time.perf_counter() - start)
+	return min(timings)
+
+
+def main(argv: list[str] | None = None) -> int:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--items', type=int, default=200, help='rows per response (contents for composites)')
+	parser.add_argument('--repeat', type=int, default=10, help='runs per case; the best one is reported')
+	args = parser.parse_args(argv)
+
+	print(
+		f'{"schema":<20} {"items":>6} {"response_model us/item":>23} {"validate-once us/item":>22} {"speedup":>8}'
+	)
+	for name, items, legacy, once in cases(args.items):
+		if legacy() != once():
+			parser.exit(1, f'{name}: the two pipelines rendered different bodies\n')
+		before = _best(legacy, args.repeat) / items * 1e6
+		after = _best(once, args.repeat) / items * 1e6
+		print(f'{name:<20} {items:>6} {before:>23.2f} {after:>22.2f} {before / after:>7.1f}x')
+	return 0
+
+
+if __name__ == '__main__':
+	raise SystemExit(main())
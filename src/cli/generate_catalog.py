@@ -0,0 +1,286 @@
+# src/cli/generate_catalog.py
+"""Generate a large synthetic catalog and subscriber list for scale testing.
+
+Loads tracks, courses, modules, module contents (with sizeable markdown), content
+media (with JSON meta) and newsletter subscribers into the DATABASE_URL database.
+Each table goes in with one COPY, and everything commits in one transaction.
+The same arguments always produce the same rows, public ids included. Names and
+emails are numbered and orders count from 1 under each parent, so every unique
+constraint holds. The tables must start empty; `--truncate` empties them first.
+
+`--skew` spreads courses over tracks and contents over modules by a Zipf law:
+0 gives every parent the same count, and 1 gives a few parents most of the rows.
+
+Usage (from src/):
+	python -m cli.generate_catalog --truncate
+	python -m cli.generate_catalog --truncate --tracks 5000 --courses 500000 --contents 5000000 \
+		--subscribers 3000000 --skew 1.2 --seed 7
+"""
+
+import argparse
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime, timedelta
+import json
+import random
+import sys
+from time import perf_counter
+from typing import Any
+from uuid import UUID
+
+from db.conf import init_db
+from dependencies import unit_of_work
+from models import ContentMedia, Course, Module, ModuleContent, NewsletterSubscriber, Track
+
+# naive UTC, like the timestamp columns; rows span the following year
+START = datetime(2024, 1, 1, tzinfo=UTC).replace(tzinfo=None)
+SPAN = timedelta(days=365)
+TOPICS = ('backend', 'frontend', 'data', 'devops', 'security', 'mobile', 'design', 'product', 'ml', 'cloud')
+THEMES = ('blue', 'green', 'orange', 'purple', 'red', None)
+WORDS = ('query', 'index', 'cursor', 'session', 'engine', 'schema', 'router', 'latency', 'replica', 'worker')
+MEDIA = (('mp4', 'video/mp4'), ('jpg', 'image/jpeg'), ('png', 'image/png'), ('pdf', 'application/pdf'))
+DOMAINS = ('example.com', 'example.org', 'example.net', 'mail.test', 'corp.test')
+
+type Row = tuple[Any, ...]
+
+
+def spread(total: int, parents: int, skew: float, rng: random.Random) -> list[int]:
+	"""Split `total` children over `parents`, Zipf-weighted by `skew`, in shuffled parent order."""
+	weights = [1 / (rank + 1) ** skew for rank in range(parents)]
+	scale = total / sum(weights)
+	counts = [int(weight * scale) for weight in weights]
+	for rank in range(total - sum(counts)):  # the remainder is < parents
+		counts[rank] += 1
+	rng.shuffle(counts)
+	return counts
+
+
+def _ids(seed: int, table: str) -> Iterator[UUID]:
+	"""`table`'s public ids in row order; replayable, so children never hold their parents in memory."""
+	rng = random.Random(f'{seed}:{table}:ids')
+	while True:
+		yield UUID(int=rng.getrandbits(128), version=4)
+
+
+def _stamp(i: int, n: int) -> datetime:
+	return START + SPAN * (i / n)
+
+
+class Generator:
+	"""Row streams for each table; every stream has its own seeded RNG."""
+
+	def __init__(self, args: argparse.Namespace):
+		self.args = args
+		self.seed = args.seed
+		corpus_rng = self._rng('corpus')
+		# markdown bodies are slices of one corpus: realistic size, no per-row text building
+		words = [corpus_rng.choice(WORDS) for _ in range(1 << 17)]
+		for at in range(0, len(words), 120):
+			words[at] = '\n\n## ' + words[at]
+		self.corpus = ' '.join(words)
+
+	def _rng(self, stream: str) -> random.Random:
+		return random.Random(f'{self.seed}:{stream}')
+
+	def _markdown(self, rng: random.Random, title: str) -> str:
+		# log-normal sizes (sigma 0.75); the exp(-sigma**2 / 2) = 0.755 factor keeps the mean at --markdown-bytes
+		size = int(rng.lognormvariate(0, 0.75) * self.args.markdown_bytes * 0.755)
+		size = min(size, len(self.corpus) // 2)
+		offset = rng.randrange(len(self.corpus) - size)
+		return f'# {title}\n\n{self.corpus[offset : offset + size]}'
+
+	def tracks(self) -> Iterator[Row]:
+		rng, n = self._rng(Track.__tablename__), self.args.tracks
+		for i, public_id in zip(range(n), _ids(self.seed, Track.__tablename__), strict=False):
+			at = _stamp(i, n)
+			topic = rng.choice(TOPICS)
+			yield public_id, f'{topic} track {i:07d}', f'Everything {topic}.', rng.choice(THEMES), at, at, False
+
+	def courses(self) -> Iterator[Row]:
+		rng, n = self._rng(Course.__tablename__), self.args.courses
+		counts = spread(n, self.args.tracks, self.args.skew, rng)
+		ids = _ids(self.seed, Course.__tablename__)
+		i = 0
+		for track_id, count in zip(_ids(self.seed, Track.__tablename__), counts, strict=False):
+			for order in range(1, count + 1):
+				at = _stamp(i, n)
+				i += 1
+				description = f'Part {order} of the track.' if rng.random() < 0.8 else None
+				yield (
+					next(ids),
+					track_id,
+					f'course {order:06d}',
+					description,
+					order,
+					rng.choice(THEMES),
+					at,
+					at,
+					False,
+				)
+
+	def modules(self) -> Iterator[Row]:
+		rng, n = self._rng(Module.__tablename__), self.args.modules
+		for i, public_id in zip(range(n), _ids(self.seed, Module.__tablename__), strict=False):
+			at = _stamp(i, n)
+			yield public_id, f'{rng.choice(TOPICS)} module {i:07d}', None, i + 1, at, at, False
+
+	def contents(self) -> Iterator[Row]:
+		rng, n = self._rng(ModuleContent.__tablename__), self.args.contents
+		counts = spread(n, self.args.modules, self.args.skew, rng)
+		ids = _ids(self.seed, ModuleContent.__tablename__)
+		i = 0
+		for module_id, count in zip(_ids(self.seed, Module.__tablename__), counts, strict=False):
+			for order in range(1, count + 1):
+				at = _stamp(i, n)
+				i += 1
+				title = f'Lesson {order}: {rng.choice(WORDS)} and {rng.choice(WORDS)}'
+				markdown = self._markdown(rng, title)
+				draft = rng.random() < 0.1
+				tags = json.dumps(rng.sample(WORDS, rng.randint(0, 4)))
+				yield (
+					next(ids),
+					module_id,
+					title,
+					markdown,
+					order,
+					tags,
+					draft,
+					not draft,
+					None if draft else at,
+					max(1, len(markdown) // 1200),
+					at,
+					at,
+					False,
+				)
+
+	def media(self) -> Iterator[Row]:
+		rng, n = self._rng(ContentMedia.__tablename__), self.args.contents
+		per_content = self.args.media_per_content
+		ids = _ids(self.seed, ContentMedia.__tablename__)
+		for i, content_id in zip(range(n), _ids(self.seed, ModuleContent.__tablename__), strict=False):
+			at = _stamp(i, n)
+			for position in range(rng.randint(0, 2 * per_content)):
+				ext, media_type = rng.choice(MEDIA)
+				meta = {'ext': ext, 'size': rng.randrange(1 << 12, 1 << 30), 'media_type': media_type}
+				if ext != 'pdf':
+					meta['dimensions'] = {
+						'width': rng.choice((640, 1280, 1920)),
+						'height': rng.choice((360, 720, 1080)),
+					}
+				public_id = next(ids)
+				url = f'https://cdn.example.com/{content_id}/{public_id}.{ext}'
+				yield (
+					public_id,
+					content_id,
+					f'{ext} #{position + 1}',
+					position,
+					url,
+					json.dumps(meta),
+					at,
+					at,
+					False,
+				)
+
+	def subscribers(self) -> Iterator[Row]:
+		rng, n = self._rng(NewsletterSubscriber.__tablename__), self.args.subscribers
+		for i, public_id in zip(range(n), _ids(self.seed, NewsletterSubscriber.__tablename__), strict=False):
+			at = _stamp(i, n)
+			active = rng.random() < 0.9
+			left = None if active else (at + timedelta(days=rng.randint(1, 90))).replace(tzinfo=UTC)
+			email = f'user{i:09d}@{DOMAINS[i % len(DOMAINS)]}'
+			yield str(public_id), email, active, left, at, at, not active
+
+
+_STAMPS = ('created', 'updated', 'is_deleted')
+
+# table -> (COPY columns, Generator method); parents before children
+PLAN = (
+	(Track.__tablename__, ('public_id', 'name', 'description', 'theme', *_STAMPS), Generator.tracks),
+	(
+		Course.__tablename__,
+		('public_id', 'track_public_id', 'title', 'description', 'order', 'theme', *_STAMPS),
+		Generator.courses,
+	),
+	(Module.__tablename__, ('public_id', 'name', 'description', 'order', *_STAMPS), Generator.modules),
+	(
+		ModuleContent.__tablename__,
+		(
+			'public_id',
+			'module_public_id',
+			'title',
+			'markdown',
+			'order',
+			'tags',
+			'draft',
+			'is_published',
+			'published_at',
+			'estimated_minutes',
+			*_STAMPS,
+		),
+		Generator.contents,
+	),
+	(
+		ContentMedia.__tablename__,
+		('public_id', 'module_content_public_id', 'name', 'position', 'url', 'meta', *_STAMPS),
+		Generator.media,
+	),
+	(
+		NewsletterSubscriber.__tablename__,
+		('public_id', 'email', 'is_active', 'unsubscribed_at', *_STAMPS),
+		Generator.subscribers,
+	),
+)
+
+
+def copy_rows(cur, table: str, columns: Iterable[str], rows: Iterable[Row]) -> int:
+	names = ', '.join(f'"{column}"' for column in columns)
+	count = 0
+	with cur.copy(f'COPY {table} ({names}) FROM STDIN') as copy:
+		for row in rows:
+			copy.write_row(row)
+			count += 1
+	return count
+
+
+def main(argv: list[str] | None = None) -> int:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('--tracks', type=int, default=1_000)
+	parser.add_argument('--courses', type=int, default=100_000, help='spread over the tracks')
+	parser.add_argument('--modules', type=int, default=50_000)
+	parser.add_argument('--contents', type=int, default=1_000_000, help='spread over the modules')
+	parser.add_argument('--media-per-content', type=int, default=2, help='mean; each content gets 0 to 2x this')
+	parser.add_argument('--subscribers', type=int, default=1_000_000)
+	parser.add_argument('--markdown-bytes', type=int, default=4_000, help='mean markdown size (log-normal)')
+	parser.add_argument(
+		'--skew', type=float, default=1.0, help='Zipf exponent of children per parent; 0 = even'
+	)
+	parser.add_argument('--seed', type=int, default=1)
+	parser.add_argument('--truncate', action='store_true', help='empty the catalog and subscriber tables first')
+	args = parser.parse_args(argv)
+	if (args.courses and not args.tracks) or (args.contents and not args.modules):
+		parser.error('courses need --tracks and contents need --modules')
+
+	init_db()
+	generator = Generator(args)
+	tables = [table for table, _, _ in PLAN]
+	with unit_of_work() as db:
+		raw = db.connection().connection.driver_connection
+		with raw.cursor() as cur:
+			if args.truncate:
+				cur.execute(f'TRUNCATE {", ".join(tables)} RESTART IDENTITY')
+			else:
+				filled = [t for t in tables if cur.execute(f'SELECT EXISTS (SELECT 1 FROM {t})').fetchone()[0]]
+				if filled:
+					parser.error(f'not empty: {", ".join(filled)}; pass --truncate to replace their rows')
+
+			started = perf_counter()
+			for table, columns, rows in PLAN:
+				start = perf_counter()
+				count = copy_rows(cur, table, columns, rows(generator))
+				print(f'{table:<24} {count:>12,} rows {perf_counter() - start:>8.1f}s', flush=True)
+			cur.execute(f'ANALYZE {", ".join(tables)}')
+	print(f'{"total":<24} {"":>12} {perf_counter() - started:>13.1f}s')
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,50 @@
+# src/cli/import_subscribers.py
+"""Bulk import newsletter subscribers from a CSV or NDJSON file.
+
+Usage (from src/):
+	python -m cli.import_subscribers subscribers.csv
+	cat export.ndjson | python -m cli.import_subscribers - --format ndjson
+"""
+
+import argparse
+from functools import partial
+from pathlib import Path
+import sys
+
+from dependencies import unit_of_work
+from repositories.news.subscriber_import import import_subscribers
+from schemas.news import SubscriberFileFormat
+
+CHUNK_SIZE = 1 << 16
+
+_SUFFIXES = {
+	'.csv': SubscriberFileFormat.CSV,
+	'.ndjson': SubscriberFileFormat.NDJSON,
+	'.jsonl': SubscriberFileFormat.NDJSON,
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument('path', help="file to import, or '-' for stdin")
+	parser.add_argument(
+		'--format', choices=[f.value for f in SubscriberFileFormat], help='default: from file suffix'
+	)
+	args = parser.parse_args(argv)
+
+	fmt = SubscriberFileFormat(args.format) if args.format else _SUFFIXES.get(Path(args.path).suffix.lower())
+	if fmt is None:
+		parser.error('cannot infer the format from the file name; pass --format')
+
+	with (
+		sys.stdin.buffer if args.path == '-' else Path(args.path).open('rb') as fh,
+		unit_of_work() as db,
+	):
+		summary = import_subscribers(db, iter(partial(fh.read, CHUNK_SIZE), b''), fmt)
+
+	print(summary.model_dump_json())
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
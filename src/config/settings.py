@@ -1,6 +1,20 @@
+from enum import StrEnum
 from functools import lru_cache
-from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field, PostgresDsn
+from pathlib import Path
+from typing import Annotated
+
+from pydantic import Field, PostgresDsn, field_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
+
+from schemas.common.responses import CountStrategy
+
+
+class PrePing(StrEnum):
+	"""When a pooled connection is tested before use (see db/pool.py)."""
+
+	always = 'always'  # every checkout (pool_pre_ping)
+	idle = 'idle'  # only after DB_POOL_PRE_PING_IDLE seconds unused
+	never = 'never'
 
 
 class Settings(BaseSettings):
@@ -9,10 +23,80 @@ class Settings(BaseSettings):
 	app_name: str = Field(alias='APP_NAME', default='My FastAPI App')
 	debug: bool = Field(alias='DEBUG', default=False)
 
+	# Unauthenticated /admin diagnostics (see api/admin/monitoring_router.py); keep off where clients can reach
+	admin_endpoints_enabled: bool = Field(alias='ADMIN_ENDPOINTS_ENABLED', default=False)
+
+	# Connection pools, per engine and worker process (see db/pool.py); metrics at /admin/pool
+	db_pool_size: int = Field(alias='DB_POOL_SIZE', default=10, ge=1)
+	db_max_overflow: int = Field(alias='DB_MAX_OVERFLOW', default=20, ge=0)
+	db_pool_timeout: float = Field(alias='DB_POOL_TIMEOUT', default=30.0, gt=0)
+	db_pool_recycle: int = Field(alias='DB_POOL_RECYCLE', default=-1, ge=-1)  # seconds; -1 never
+	db_pool_pre_ping: PrePing = Field(alias='DB_POOL_PRE_PING', default=PrePing.idle)
+	db_pool_pre_ping_idle: float = Field(alias='DB_POOL_PRE_PING_IDLE', default=30.0, ge=0)
+
+	# Event-loop stall detector (see monitoring/loop_monitor.py)
+	loop_monitor_enabled: bool = Field(alias='LOOP_MONITOR_ENABLED', default=False)
+	loop_block_threshold_ms: float = Field(alias='LOOP_BLOCK_THRESHOLD_MS', default=100.0, gt=0)
+	loop_sample_interval_ms: float = Field(alias='LOOP_SAMPLE_INTERVAL_MS', default=20.0, gt=0)
+
+	# Paginated list totals (see db/counting.py); clients pick with ?count=
+	pagination_count_default: CountStrategy = Field(
+		alias='PAGINATION_COUNT_DEFAULT', default=CountStrategy.exact
+	)
+	pagination_count_allowed: set[CountStrategy] = Field(
+		alias='PAGINATION_COUNT_ALLOWED', default_factory=lambda: set(CountStrategy)
+	)
+	pagination_count_cache_ttl: float = Field(alias='PAGINATION_COUNT_CACHE_TTL', default=30.0, ge=0)
+	pagination_estimate_exact_below: int = Field(alias='PAGINATION_ESTIMATE_EXACT_BELOW', default=10_000, ge=0)
+
+	# Read-through cache for public_id / name lookups (see db/lookup_cache.py); TTL 0 disables it
+	lookup_cache_ttl: float = Field(alias='LOOKUP_CACHE_TTL', default=30.0, ge=0)
+	lookup_cache_max_entries: int = Field(alias='LOOKUP_CACHE_MAX_ENTRIES', default=4096, ge=0)
+
+	# Prometheus /metrics (see monitoring/metrics.py); under gunicorn set a multiproc dir shared by the workers
+	metrics_enabled: bool = Field(alias='METRICS_ENABLED', default=True)
+	prometheus_multiproc_dir: Path | None = Field(alias='PROMETHEUS_MULTIPROC_DIR', default=None)
+
+	# Per-request SQL stats (see db/query_stats.py): Server-Timing header, debug log, N+1 warning
+	sql_stats_enabled: bool = Field(alias='SQL_STATS_ENABLED', default=True)
+	sql_repeat_warn_threshold: int = Field(alias='SQL_REPEAT_WARN_THRESHOLD', default=10, ge=2)
+	# fail requests that run more statements than this; meant for tests / CI
+	sql_query_budget: int | None = Field(alias='SQL_QUERY_BUDGET', default=None, ge=1)
+
+	# Fail on relationship lazy loads in request sessions (see db/lazy_guard.py); meant for tests / dev
+	raise_on_lazy_load: bool = Field(alias='RAISE_ON_LAZY_LOAD', default=False)
+
+	# Response compression (see core/compression.py); brotli is used when installed
+	compression_enabled: bool = Field(alias='COMPRESSION_ENABLED', default=True)
+	compression_min_size: int = Field(alias='COMPRESSION_MIN_SIZE', default=1024, ge=0)
+	compression_gzip_level: int = Field(alias='COMPRESSION_GZIP_LEVEL', default=6, ge=1, le=9)
+	compression_brotli_quality: int = Field(alias='COMPRESSION_BROTLI_QUALITY', default=5, ge=0, le=11)
+	compression_cache_max_bytes: int = Field(
+		alias='COMPRESSION_CACHE_MAX_BYTES', default=32 * 1024 * 1024, ge=0
+	)
+
+	# GET /modules/{public_id}/ rendered by Postgres (json_build_object) instead of the ORM + pydantic
+	composite_json_in_db: bool = Field(alias='COMPOSITE_JSON_IN_DB', default=False)
+
+	# Read replicas (see db/routing.py): comma-separated URLs; GET requests read from them
+	database_replica_urls: Annotated[list[PostgresDsn], NoDecode] = Field(
+		alias='DATABASE_REPLICA_URLS', default_factory=list
+	)
+	replica_retry_after: float = Field(alias='REPLICA_RETRY_AFTER', default=30.0, gt=0)
+	replica_health_interval: float = Field(alias='REPLICA_HEALTH_INTERVAL', default=5.0, gt=0)
+	replica_pin_seconds: float = Field(alias='REPLICA_PIN_SECONDS', default=5.0, ge=0)
+
 	model_config = SettingsConfigDict(env_file='.env', env_file_encoding='utf-8')
 
+	@field_validator('database_replica_urls', mode='before')
+	@classmethod
+	def _split_urls(cls, value):
+		if isinstance(value, str):
+			return [url.strip() for url in value.split(',') if url.strip()]
+		return value
+
 
-@lru_cache()
+@lru_cache
 def get_settings() -> Settings:
 	return Settings()
 
@@ -0,0 +1,245 @@
+# src/core/compression.py
+"""
+Negotiated response compression (brotli, else gzip).
+
+- Only textual bodies (JSON, NDJSON, CSV, text/*) of at least COMPRESSION_MIN_SIZE
+  bytes are compressed; everything else, 304s and pre-encoded bodies pass through.
+- Complete bodies are compressed in one go. Versioned ones (ETag / Last-Modified,
+  or `Cache-Control: immutable`) are kept in an LRU bounded by
+  COMPRESSION_CACHE_MAX_BYTES and keyed by (encoding, body digest), so a hot
+  payload (e.g. a large module composite polled by many clients) is compressed
+  once. Hashing costs a fraction of compressing. Other bodies, such as write
+  responses and error pages, rarely repeat and would only churn the cache.
+- Streamed bodies (StreamingResponse) are compressed chunk by chunk and flushed
+  per chunk, so clients still receive data as it is produced.
+"""
+
+from collections import Counter, OrderedDict
+import hashlib
+import threading
+from typing import Any
+import zlib
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+from config.settings import settings
+
+try:
+	import brotli
+except ImportError:  # a declared dependency, but gzip alone still works
+	brotli = None
+
+_COMPRESSIBLE = ('application/json', 'application/x-ndjson', 'application/problem+json', 'text/')
+# Bodies this large are compressed off the event loop (zlib and brotli release the GIL)
+_THREADPOOL_ABOVE = 256 * 1024
+
+
+def supported_encodings() -> tuple[str, ...]:
+	return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate(accept_encoding: str) -> str | None:
+	"""Best supported coding for an Accept-Encoding header; ties prefer brotli."""
+	weights: dict[str, float] = {}
+	for item in accept_encoding.lower().split(','):
+		coding, _, params = item.strip().partition(';')
+		q = 1.0
+		name, _, value = params.strip().partition('=')
+		if name.strip() == 'q':
+			try:
+				q = float(value)
+			except ValueError:
+				q = 0.0
+		if coding:
+			weights[coding.strip()] = q
+	best, best_q = None, 0.0
+	for coding in supported_encodings():
+		q = weights.get(coding, weights.get('*', 0.0))
+		if q > best_q:
+			best, best_q = coding, q
+	return best
+
+
+class _Compressor:
+	"""Incremental gzip / brotli encoder."""
+
+	def __init__(self, encoding: str):
+		self.encoding = encoding
+		if encoding == 'br':
+			self._br = brotli.Compressor(quality=settings.compression_brotli_quality)
+		else:
+			self._gz = zlib.compressobj(settings.compression_gzip_level, zlib.DEFLATED, 31)
+
+	def compress(self, data: bytes, *, final: bool = False) -> bytes:
+		if self.encoding == 'br':
+			out = self._br.process(data)
+			return out + (self._br.finish() if final else self._br.flush())
+		return self._gz.compress(data) + self._gz.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+	return _Compressor(encoding).compress(body, final=True)
+
+
+class CompressedBodyCache:
+	"""LRU of compressed bodies bounded by their total size, with hit/miss/eviction counters."""
+
+	def __init__(self, max_bytes: int):
+		self.max_bytes = max_bytes
+		self._entries: OrderedDict[tuple[str, bytes], bytes] = OrderedDict()
+		self._size = 0
+		self._stats: Counter[str] = Counter()
+		self._lock = threading.Lock()
+
+	@property
+	def enabled(self) -> bool:
+		return self.max_bytes > 0
+
+	def get(self, key: tuple[str, bytes]) -> bytes | None:
+		with self._lock:
+			value = self._entries.get(key)
+			if value is None:
+				self._stats['misses'] += 1
+				return None
+			self._entries.move_to_end(key)
+			self._stats['hits'] += 1
+			return value
+
+	def set(self, key: tuple[str, bytes], value: bytes) -> None:
+		if len(value) > self.max_bytes // 4:
+			return  # one payload must not flush the whole cache
+		with self._lock:
+			old = self._entries.pop(key, None)
+			self._size += len(value) - (len(old) if old is not None else 0)
+			self._entries[key] = value
+			while self._size > self.max_bytes:
+				_, evicted = self._entries.popitem(last=False)
+				self._size -= len(evicted)
+				self._stats['evictions'] += 1
+
+	def clear(self) -> None:
+		with self._lock:
+			self._entries.clear()
+			self._size = 0
+
+	def reset_stats(self) -> None:
+		with self._lock:
+			self._stats.clear()
+
+	def stats(self) -> dict[str, Any]:
+		with self._lock:
+			return {
+				'enabled': self.enabled,
+				'encodings': list(supported_encodings()),
+				'max_bytes': self.max_bytes,
+				'bytes': self._size,
+				'entries': len(self._entries),
+				**self._stats,
+			}
+
+
+compressed_cache = CompressedBodyCache(max_bytes=settings.compression_cache_max_bytes)
+
+
+async def compress_cached(body: bytes, encoding: str, *, cache: bool = True) -> bytes:
+	if not (cache and compressed_cache.enabled):
+		key = None
+	else:
+		key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+		if (hit := compressed_cache.get(key)) is not None:
+			return hit
+	if len(body) >= _THREADPOOL_ABOVE:
+		out = await run_in_threadpool(compress, body, encoding)
+	else:
+		out = compress(body, encoding)
+	if key is not None:
+		compressed_cache.set(key, out)
+	return out
+
+
+def _compressible(headers: Headers) -> bool:
+	return 'content-encoding' not in headers and headers.get('content-type', '').startswith(_COMPRESSIBLE)
+
+
+def _cacheable(headers: Headers) -> bool:
+	"""Bodies with a validator, or marked immutable, repeat until their resource changes."""
+	return (
+		'etag' in headers
+		or 'last-modified' in headers
+		or 'immutable' in headers.get('cache-control', '').lower()
+	)
+
+
+class CompressionMiddleware:
+	"""Pure ASGI middleware compressing responses with the client's preferred coding."""
+
+	def __init__(self, app, minimum_size: int = 1024):
+		self.app = app
+		self.minimum_size = minimum_size
+
+	async def __call__(self, scope, receive, send):
+		if scope['type'] != 'http':
+			await self.app(scope, receive, send)
+			return
+		encoding = negotiate(Headers(scope=scope).get('accept-encoding', ''))
+		await self.app(scope, receive, _Responder(send, encoding, self.minimum_size))
+
+
+class _Responder:
+	"""Holds back `http.response.start` until the first body chunk shows whether to compress."""
+
+	def __init__(self, send, encoding: str | None, minimum_size: int):
+		self.send = send
+		self.encoding = encoding
+		self.minimum_size = minimum_size
+		self.start: dict | None = None
+		self.compressor: _Compressor | None = None
+		self.passthrough = False
+
+	async def __call__(self, message):
+		if message['type'] == 'http.response.start':
+			self.start = message
+			return
+		if self.passthrough or self.compressor is not None:
+			await self._send_body(message)
+			return
+		if message['type'] != 'http.response.body' or self.start is None:
+			await self.send(message)
+			return
+
+		start, self.start = self.start, None
+		headers = MutableHeaders(scope=start)
+		if not _compressible(headers) or start['status'] in (204, 304):
+			self.passthrough = True
+			await self.send(start)
+			await self.send(message)
+			return
+
+		headers.add_vary_header('Accept-Encoding')
+		body, more_body = message.get('body', b''), message.get('more_body', False)
+		if self.encoding is None or (not more_body and len(body) < self.minimum_size):
+			self.passthrough = True
+			await self.send(start)
+			await self.send(message)
+			return
+
+		headers['Content-Encoding'] = self.encoding
+		if more_body:
+			del headers['Content-Length']
+			self.compressor = _Compressor(self.encoding)
+			await self.send(start)
+			await self._send_body(message)
+			return
+		body = await compress_cached(body, self.encoding, cache=_cacheable(headers))
+		headers['Content-Length'] = str(len(body))
+		await self.send(start)
+		await self.send({'type': 'http.response.body', 'body': body})
+
+	async def _send_body(self, message):
+		if self.compressor is None or message['type'] != 'http.response.body':
+			await self.send(message)
+			return
+		more_body = message.get('more_body', False)
+		body = self.compressor.compress(message.get('body', b''), final=not more_body)
+		await self.send({'type': 'http.response.body', 'body': body, 'more_body': more_body})
@@ -1,39 +1,74 @@
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from starlette import status as http_status
 
-from api import course_router, newsletter_router, track_router, module_router
+from api import course_router, module_router, monitoring_router, newsletter_router, track_router
 from config.settings import settings
-from db.conf import db_health, engine, init_db
+from core.compression import CompressionMiddleware
+from db.conf import async_db_health, async_engine, engine, init_db, replicas
+from db.routing import ReplicaPinMiddleware
+from monitoring import LoopMonitorMiddleware, MetricsMiddleware, QueryStatsMiddleware, loop_monitor, metrics
+from monitoring.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
 from schemas import make_response
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-	with engine.connect() as conn:
-		conn.exec_driver_sql('SELECT 1')
+	async with async_engine.connect() as conn:
+		await conn.exec_driver_sql('SELECT 1')
 	if getattr(settings, 'debug', False):
 		init_db()
+	if settings.loop_monitor_enabled:
+		loop_monitor.register_routes(app)
+		await loop_monitor.start()
+	await replicas.start()
 	yield
+	metrics.stop()
+	await replicas.stop()
+	await loop_monitor.stop()
+	await async_engine.dispose()
 	engine.dispose()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 
 app.include_router(newsletter_router)
 app.include_router(track_router)
 app.include_router(course_router)
 app.include_router(module_router)
+if settings.admin_endpoints_enabled:
+	app.include_router(monitoring_router)
+
+if settings.loop_monitor_enabled:
+	loop_monitor.attach_engine(engine)
+	app.add_middleware(LoopMonitorMiddleware, monitor=loop_monitor)
+
+if replicas:
+	app.add_middleware(ReplicaPinMiddleware, pin_seconds=settings.replica_pin_seconds)
+
+if settings.compression_enabled:
+	app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_min_size)
+
+if settings.sql_stats_enabled:
+	app.add_middleware(
+		QueryStatsMiddleware,
+		repeat_threshold=settings.sql_repeat_warn_threshold,
+		budget=settings.sql_query_budget,
+	)
+
+if settings.metrics_enabled:
+	# outermost, so latency covers every other middleware
+	app.add_middleware(MetricsMiddleware, metrics=metrics)
 
 
 # ---- Global exception handlers ----
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
-	return JSONResponse(
+	return ORJSONResponse(
 		status_code=http_status.HTTP_422_UNPROCESSABLE_ENTITY,
 		content=make_response(
 			status_code=http_status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -46,7 +81,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 @app.exception_handler(Exception)
 async def generic_exception_handler(request: Request, exc: Exception):
 	# You might log exc here.
-	return JSONResponse(
+	return ORJSONResponse(
 		status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
 		content=make_response(
 			status_code=http_status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -58,4 +93,11 @@ async def generic_exception_handler(request: Request, exc: Exception):
 
 @app.get('/info', tags=['Info'])
 async def info():
-	return {'app_name': settings.app_name, 'database_status': db_health()}
+	return {'app_name': settings.app_name, 'database_status': await async_db_health()}
+
+
+if settings.metrics_enabled:
+
+	@app.get('/metrics', include_in_schema=False)
+	async def prometheus_metrics():
+		return Response(metrics.render(), media_type=METRICS_CONTENT_TYPE)
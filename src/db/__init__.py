@@ -1,7 +1,68 @@
-from .pagination import build_paginated_response, paginate, paginate_select
+from .counting import CountCache, count_cache, install_count_invalidation
+from .lazy_guard import LazyLoadError, forbid_lazy_loads
+from .lookup_cache import (
+	LookupCache,
+	acached_first,
+	cached_first,
+	install_lookup_invalidation,
+	lookup_cache,
+	mark_written,
+)
+from .pagination import (
+	Cursor,
+	InvalidCursor,
+	Page,
+	acount_total,
+	apaginate_select,
+	build_paginated_response,
+	count_total,
+	decode_cursor,
+	encode_cursor,
+	keyset_cursors,
+	keyset_window,
+	paginate,
+	paginate_select,
+)
+from .pool import PoolMetrics, PoolRegistry, pool_metrics, pool_options
+from .query_stats import QueryBudgetExceeded, QueryStats, install_query_stats, query_budget, track_queries
+from .routing import ReplicaPinMiddleware, ReplicaSet, RoutingSession, allow_replica_reads
 
 __all__ = [
+	'CountCache',
+	'Cursor',
+	'InvalidCursor',
+	'LazyLoadError',
+	'LookupCache',
+	'Page',
+	'PoolMetrics',
+	'PoolRegistry',
+	'QueryBudgetExceeded',
+	'QueryStats',
+	'ReplicaPinMiddleware',
+	'ReplicaSet',
+	'RoutingSession',
+	'acached_first',
+	'acount_total',
+	'allow_replica_reads',
+	'apaginate_select',
 	'build_paginated_response',
+	'cached_first',
+	'count_cache',
+	'count_total',
+	'decode_cursor',
+	'encode_cursor',
+	'forbid_lazy_loads',
+	'install_count_invalidation',
+	'install_lookup_invalidation',
+	'install_query_stats',
+	'keyset_cursors',
+	'keyset_window',
+	'lookup_cache',
+	'mark_written',
 	'paginate',
 	'paginate_select',
+	'pool_metrics',
+	'pool_options',
+	'query_budget',
+	'track_queries',
 ]
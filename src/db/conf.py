@@ -1,31 +1,73 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel import SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from config.settings import settings
+from db.counting import install_count_invalidation
+from db.lookup_cache import install_lookup_invalidation
+from db.pool import pool_metrics, pool_options
+from db.query_stats import install_query_stats
+from db.routing import AsyncRoutingSession, ReplicaSet, RoutingSession
 
 DATABASE_URL = settings.database_url
 
+ECHO = getattr(settings, 'debug', False)
+
 if DATABASE_URL:
 	# Single engine
-	engine = create_engine(
-		str(DATABASE_URL),
-		echo=getattr(settings, 'debug', False),
-		pool_pre_ping=True,
-		pool_size=10,
-		max_overflow=20,
+	engine = create_engine(str(DATABASE_URL), echo=ECHO, **pool_options())
+	# Async twin of the engine above (psycopg 3 async driver, same database)
+	async_engine = create_async_engine(
+		make_url(str(DATABASE_URL)).set(drivername='postgresql+psycopg_async'),
+		echo=ECHO,
+		**pool_options(is_async=True),
 	)
 else:
 	raise NotImplementedError('Database URL not found')
 
+# writes through either engine drop cached list totals for the touched table
+install_count_invalidation(engine)
+install_count_invalidation(async_engine.sync_engine)
+# ... and cached public_id / name lookups
+install_lookup_invalidation(engine)
+install_lookup_invalidation(async_engine.sync_engine)
+pool_metrics.register('primary', engine)
+pool_metrics.register('primary_async', async_engine.sync_engine)
+# (replicas never see writes, so they need neither hook)
+
+# Read replicas; empty unless DATABASE_REPLICA_URLS is set
+replicas = ReplicaSet(
+	[str(url) for url in settings.database_replica_urls],
+	retry_after=settings.replica_retry_after,
+	health_interval=settings.replica_health_interval,
+	echo=ECHO,
+)
+
+# per-request statement counts and timings (Server-Timing, /metrics, query budgets)
+for _engine in (engine, async_engine.sync_engine, *replicas.engines()):
+	install_query_stats(_engine)
+
 # Factory to build sessions with consistent defaults
 SessionLocal = sessionmaker(
 	autocommit=False,
 	autoflush=False,
 	bind=engine,
-	class_=Session,
+	class_=RoutingSession,
+	replicas=replicas,
 	expire_on_commit=False,  # keep objects usable after commit (common for APIs)
 )
 
+AsyncSessionLocal = async_sessionmaker(
+	autoflush=False,
+	bind=async_engine,
+	class_=AsyncSession,
+	sync_session_class=AsyncRoutingSession,
+	replicas=replicas,
+	expire_on_commit=False,  # required for async: no implicit IO on attribute access after commit
+)
+
 
 def init_db() -> None:
 	import models  # noqa: F401
@@ -39,3 +81,9 @@ def db_health():
 	with engine.connect() as conn:
 		conn.exec_driver_sql('SELECT 1')
 	return {'status': 'ok'}
+
+
+async def async_db_health():
+	async with async_engine.connect() as conn:
+		await conn.exec_driver_sql('SELECT 1')
+	return {'status': 'ok'}
@@ -0,0 +1,123 @@
+# src/db/counting.py
+
+"""
+Count strategies behind `meta.total` on paginated lists (see `CountStrategy`).
+
+- exact:     SELECT count(*) FROM (<filtered query>)
+- estimated: pg_class.reltuples of the single table being listed. It is table-wide,
+             so soft-deleted rows are included. Tables smaller than
+             PAGINATION_ESTIMATE_EXACT_BELOW are counted exactly, because both
+             queries are cheap there.
+- cached:    exact, kept for PAGINATION_COUNT_CACHE_TTL seconds per statement and
+             dropped as soon as this process writes to one of its tables. Writes
+             from other workers are only bounded by the TTL.
+- window / none are folded into the page query by `db.pagination`.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+import threading
+import time
+
+from sqlalchemy import Table, event, func, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import Select
+from sqlmodel import select
+
+from config.settings import settings
+
+_ESTIMATE_SQL = text('SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)')
+
+
+def exact_count_stmt(stmt: Select) -> Select:
+	# optimized COUNT(*): remove ORDER BY, wrap original stmt as subquery
+	return select(func.count()).select_from(stmt.order_by(None).subquery())
+
+
+def listed_tables(stmt: Select) -> frozenset[str]:
+	return frozenset(f.name for f in stmt.get_final_froms() if isinstance(f, Table))
+
+
+def estimate_count_stmt(stmt: Select):
+	"""Planner estimate for single-table listings, None when it does not apply."""
+	tables = listed_tables(stmt)
+	if len(tables) != 1:
+		return None
+	return _ESTIMATE_SQL.bindparams(table=next(iter(tables)))
+
+
+def usable_estimate(estimate: int | None) -> int | None:
+	# reltuples is -1 until the table has been analyzed
+	if estimate is None or estimate < 0 or estimate < settings.pagination_estimate_exact_below:
+		return None
+	return int(estimate)
+
+
+@dataclass
+class _Entry:
+	total: int
+	expires: float
+	tables: frozenset[str]
+
+
+class CountCache:
+	"""Small TTL cache of exact totals keyed by compiled statement."""
+
+	def __init__(self, ttl: float, max_entries: int = 1024):
+		self.ttl = ttl
+		self.max_entries = max_entries
+		self._entries: dict[tuple, _Entry] = {}
+		self._lock = threading.Lock()
+
+	@staticmethod
+	def key(stmt: Select) -> tuple:
+		compiled = stmt.compile()
+		return str(compiled), repr(sorted(compiled.params.items()))
+
+	def get(self, stmt: Select) -> int | None:
+		key = self.key(stmt)
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is None:
+				return None
+			if entry.expires < time.monotonic():
+				del self._entries[key]
+				return None
+			return entry.total
+
+	def set(self, stmt: Select, total: int) -> None:
+		if self.ttl <= 0:
+			return
+		entry = _Entry(total=total, expires=time.monotonic() + self.ttl, tables=listed_tables(stmt))
+		with self._lock:
+			if len(self._entries) >= self.max_entries:
+				self._entries.pop(next(iter(self._entries)))
+			self._entries[self.key(stmt)] = entry
+
+	def invalidate(self, tables: Iterable[str]) -> None:
+		tables = set(tables)
+		with self._lock:
+			stale = [k for k, e in self._entries.items() if e.tables & tables]
+			for k in stale:
+				del self._entries[k]
+
+	def clear(self) -> None:
+		with self._lock:
+			self._entries.clear()
+
+
+count_cache = CountCache(ttl=settings.pagination_count_cache_ttl)
+
+
+def _invalidate_on_write(conn, cursor, statement, parameters, context, executemany) -> None:
+	if context is None or not (context.isinsert or context.isupdate or context.isdelete):
+		return
+	table = getattr(getattr(context.compiled, 'statement', None), 'table', None)
+	if isinstance(table, Table):
+		count_cache.invalidate([table.name])
+
+
+def install_count_invalidation(engine: Engine) -> None:
+	"""Drop cached totals for a table whenever `engine` writes to it (ORM flushes and Core DML)."""
+	if not event.contains(engine, 'after_cursor_execute', _invalidate_on_write):
+		event.listen(engine, 'after_cursor_execute', _invalidate_on_write)
@@ -0,0 +1,47 @@
+# src/db/lazy_guard.py
+"""
+Raise instead of silently lazy loading a relationship.
+
+A lazy load while serializing a list is one extra query per row (N+1). Reads are
+expected to eager-load what their output schema nests; with RAISE_ON_LAZY_LOAD on
+(tests, local runs) request sessions fail loudly when one slips through.
+`forbid_lazy_loads(session)` applies the same guard around any block.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import ORMExecuteState, Session
+
+_FORBID = 'forbid_lazy_loads'  # Session.info key
+
+
+class LazyLoadError(InvalidRequestError):
+	"""A relationship was lazy loaded inside a `forbid_lazy_loads` scope."""
+
+	def __init__(self, target: str, parent: str):
+		super().__init__(f'Lazy load of {target} from a {parent}; eager-load it in the query')
+
+
+@contextmanager
+def forbid_lazy_loads(session: Session) -> Iterator[Session]:
+	"""Make lazy relationship loads on `session` raise `LazyLoadError` inside the block."""
+	previous = session.info.get(_FORBID, False)
+	session.info[_FORBID] = True
+	try:
+		yield session
+	finally:
+		session.info[_FORBID] = previous
+
+
+def _check_lazy_load(state: ORMExecuteState) -> None:
+	# eager loaders (selectinload etc.) are relationship loads too, but not lazy ones
+	if not state.is_select or not state.session.info.get(_FORBID) or state.lazy_loaded_from is None:
+		return
+	target = ', '.join(m.class_.__name__ for m in state.all_mappers)
+	raise LazyLoadError(target, state.lazy_loaded_from.class_.__name__)
+
+
+event.listen(Session, 'do_orm_execute', _check_lazy_load)
@@ -0,0 +1,234 @@
+# src/db/lookup_cache.py
+"""
+Read-through cache for single-row lookups (`get_public_id`, `TrackRepository.get_by_name`).
+
+- One bounded LRU per table; entries expire after LOOKUP_CACHE_TTL seconds.
+- Misses are cached too (as None), so repeated 404 probes stay off the database.
+- Rows are kept as column snapshots, never as live ORM objects. A hit is re-attached
+  to the caller's session with `merge(load=False)`, which needs no connection.
+- Any DML this process runs against a table drops that table's entries, both when
+  the statement executes and again when its connection goes back to the pool (after
+  COMMIT/ROLLBACK). A per-table generation counter stops a read that raced with a
+  write from storing a stale row. A session that has written to a table bypasses
+  the cache for it until its transaction ends. Writes from other workers are only
+  bounded by the TTL.
+- Rows read from a replica are returned but never cached, since the replica may
+  lag. Sessions pinned to the primary (read-your-writes, see db/routing.py)
+  bypass the cache, because another worker may still cache the row as it was
+  before the client's write.
+"""
+
+from collections import Counter, OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import Table, event, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from config.settings import settings
+from db.routing import reads_from_replica, session_pinned
+
+_MISS = object()
+_DIRTY = 'lookup_cache_dirty'  # Connection.info / Session.info key: tables written in the open transaction
+
+
+class LookupCache:
+	"""Per-table LRU + TTL cache of row snapshots, with hit/miss/eviction counters."""
+
+	def __init__(self, ttl: float, max_entries: int = 1024):
+		self.ttl = ttl
+		self.max_entries = max_entries
+		self._tables: dict[str, OrderedDict[tuple, tuple[float, dict | None]]] = {}
+		self._generations: Counter[str] = Counter()
+		self._stats: dict[str, Counter[str]] = {}
+		self._lock = threading.Lock()
+
+	@property
+	def enabled(self) -> bool:
+		return self.ttl > 0 and self.max_entries > 0
+
+	def _count(self, table: str, name: str) -> None:
+		self._stats.setdefault(table, Counter())[name] += 1
+
+	def generation(self, table: str) -> int:
+		return self._generations[table]
+
+	def get(self, table: str, key: tuple) -> Any:
+		"""Snapshot dict, None for a cached miss, or `_MISS`."""
+		with self._lock:
+			entries = self._tables.get(table)
+			entry = entries.get(key) if entries else None
+			if entry is None:
+				self._count(table, 'misses')
+				return _MISS
+			expires, snapshot = entry
+			if expires < time.monotonic():
+				del entries[key]
+				self._count(table, 'expired')
+				self._count(table, 'misses')
+				return _MISS
+			entries.move_to_end(key)
+			self._count(table, 'hits' if snapshot is not None else 'negative_hits')
+			return snapshot
+
+	def set(self, table: str, key: tuple, snapshot: dict | None, generation: int) -> None:
+		with self._lock:
+			if self._generations[table] != generation:
+				return  # the table was written while we were reading
+			entries = self._tables.setdefault(table, OrderedDict())
+			entries[key] = (time.monotonic() + self.ttl, snapshot)
+			entries.move_to_end(key)
+			while len(entries) > self.max_entries:
+				entries.popitem(last=False)
+				self._count(table, 'evictions')
+
+	def invalidate(self, tables: Iterable[str]) -> None:
+		with self._lock:
+			for table in tables:
+				self._generations[table] += 1
+				if self._tables.pop(table, None):
+					self._count(table, 'invalidations')
+
+	def clear(self) -> None:
+		with self._lock:
+			self._tables.clear()
+
+	def reset_stats(self) -> None:
+		with self._lock:
+			self._stats.clear()
+
+	def stats(self) -> dict[str, Any]:
+		with self._lock:
+			tables = {
+				name: {'size': len(self._tables.get(name, ())), **counters}
+				for name, counters in sorted(self._stats.items())
+			}
+		return {'enabled': self.enabled, 'ttl': self.ttl, 'max_entries': self.max_entries, 'tables': tables}
+
+
+lookup_cache = LookupCache(ttl=settings.lookup_cache_ttl, max_entries=settings.lookup_cache_max_entries)
+
+
+# ---- snapshots ----
+
+
+def _snapshot(obj: SQLModel) -> dict:
+	return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+
+
+def _attach(session: Session, model: type[SQLModel], snapshot: dict) -> SQLModel:
+	obj = model(**snapshot)
+	make_transient_to_detached(obj)
+	# an instance already in the session wins; merge would overwrite its pending changes
+	existing = session.identity_map.get(inspect(obj).key)
+	return existing if existing is not None else session.merge(obj, load=False)
+
+
+def _bypass(session: Session, table: str) -> bool:
+	return not lookup_cache.enabled or session_pinned(session) or table in session.info.get(_DIRTY, ())
+
+
+# ---- read-through helpers ----
+
+
+def cached_first(
+	db: Session, model: type[SQLModel], key: tuple, load: Callable[[], SQLModel | None]
+) -> SQLModel | None:
+	"""Return the cached row for `key`, else call `load()` and cache its result."""
+	table = model.__tablename__
+	if _bypass(db, table):
+		return load()
+	hit = lookup_cache.get(table, key)
+	if hit is not _MISS:
+		return None if hit is None else _attach(db, model, hit)
+
+	generation = lookup_cache.generation(table)
+	obj = load()
+	if not reads_from_replica(db):
+		lookup_cache.set(table, key, None if obj is None else _snapshot(obj), generation)
+	return obj
+
+
+async def acached_first(
+	db: AsyncSession, model: type[SQLModel], key: tuple, load: Callable[[], Awaitable[SQLModel | None]]
+) -> SQLModel | None:
+	"""Async counterpart of `cached_first`."""
+	table = model.__tablename__
+	if _bypass(db.sync_session, table):
+		return await load()
+	hit = lookup_cache.get(table, key)
+	if hit is not _MISS:
+		return None if hit is None else _attach(db.sync_session, model, hit)
+
+	generation = lookup_cache.generation(table)
+	obj = await load()
+	if not reads_from_replica(db.sync_session):
+		lookup_cache.set(table, key, None if obj is None else _snapshot(obj), generation)
+	return obj
+
+
+# ---- invalidation ----
+
+
+def _invalidate_on_write(conn, cursor, statement, parameters, context, executemany) -> None:
+	if context is None or not (context.isinsert or context.isupdate or context.isdelete):
+		return
+	table = getattr(getattr(context.compiled, 'statement', None), 'table', None)
+	if isinstance(table, Table):
+		lookup_cache.invalidate([table.name])
+		conn.info.setdefault(_DIRTY, set()).add(table.name)
+
+
+def mark_written(session: Session, tables: Iterable[str]) -> None:
+	"""Invalidate `tables` for a write the engine hooks cannot see, e.g. an INSERT inside a CTE.
+
+	Same effect as a plain DML statement: entries drop now and again at checkin,
+	and `session` bypasses the cache for these tables until its transaction ends.
+	"""
+	tables = set(tables)
+	lookup_cache.invalidate(tables)
+	session.connection().info.setdefault(_DIRTY, set()).update(tables)
+	session.info.setdefault(_DIRTY, set()).update(tables)
+
+
+def _invalidate_on_checkin(dbapi_connection, connection_record) -> None:
+	# the transaction has committed or rolled back by now
+	tables = connection_record.info.pop(_DIRTY, None)
+	if tables:
+		lookup_cache.invalidate(tables)
+
+
+def _mark_orm_execute(state) -> None:
+	if state.is_insert or state.is_update or state.is_delete:
+		table = getattr(state.statement, 'table', None)
+		if isinstance(table, Table):
+			state.session.info.setdefault(_DIRTY, set()).add(table.name)
+
+
+def _mark_flush(session, flush_context) -> None:
+	written = {inspect(obj).mapper.local_table for obj in (*session.new, *session.dirty, *session.deleted)}
+	if written:
+		session.info.setdefault(_DIRTY, set()).update(t.name for t in written if isinstance(t, Table))
+
+
+def _clear_marks(session, transaction) -> None:
+	if transaction.parent is None:
+		session.info.pop(_DIRTY, None)
+
+
+# Track per session which tables its open transaction has written
+event.listen(Session, 'do_orm_execute', _mark_orm_execute)
+event.listen(Session, 'after_flush', _mark_flush)
+event.listen(Session, 'after_transaction_end', _clear_marks)
+
+
+def install_lookup_invalidation(engine: Engine) -> None:
+	"""Drop cached lookups for a table whenever `engine` writes to it."""
+	if not event.contains(engine, 'after_cursor_execute', _invalidate_on_write):
+		event.listen(engine, 'after_cursor_execute', _invalidate_on_write)
+		event.listen(engine, 'checkin', _invalidate_on_checkin)
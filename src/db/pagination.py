@@ -1,13 +1,148 @@
 # src/db/pagination.py
+import base64
 from collections.abc import Sequence
+from dataclasses import dataclass
+import json
 from math import ceil
-from typing import Any
+from typing import Any, NamedTuple
 
 from sqlalchemy import func
+from sqlalchemy.orm import InstrumentedAttribute
 from sqlalchemy.sql import Select
-from sqlmodel import Session, select
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from schemas import PageMeta, Paginated, PaginationParams
+from db.counting import count_cache, estimate_count_stmt, exact_count_stmt, usable_estimate
+from schemas import CountStrategy, PageMeta, Paginated, PaginationParams
+
+# ---- Keyset (cursor) pagination ----
+# Cursors are opaque to clients: urlsafe base64 of {"k": <last id>, "b": <backwards>}.
+# Pages are ordered by a unique, indexed key (the primary key `id` for every model),
+# so `WHERE id > :k ORDER BY id LIMIT n` costs the same on page 1 and page 10_000.
+
+
+@dataclass(frozen=True)
+class Cursor:
+	key: int
+	backwards: bool = False
+
+
+def encode_cursor(key: int, *, backwards: bool = False) -> str:
+	raw = json.dumps({'k': key, 'b': backwards}, separators=(',', ':')).encode()
+	return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+class InvalidCursor(ValueError):
+	"""A cursor token we did not issue."""
+
+	def __init__(self):
+		super().__init__('Invalid pagination cursor')
+
+
+def decode_cursor(token: str) -> Cursor:
+	"""Raises `InvalidCursor` (a ValueError) for anything that is not a cursor we issued."""
+	try:
+		data = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+		key, backwards = data['k'], data.get('b', False)
+	except (ValueError, TypeError, KeyError, AttributeError) as exc:
+		raise InvalidCursor from exc
+	if not isinstance(key, int) or isinstance(key, bool):
+		raise InvalidCursor
+	return Cursor(key=key, backwards=bool(backwards))
+
+
+def keyset_window(
+	stmt: Select,
+	key: InstrumentedAttribute,
+	*,
+	limit: int,
+	offset: int = 0,
+	cursor: str | None = None,
+) -> Select:
+	"""Window `stmt` by offset, or by keyset on `key` when a cursor is given.
+
+	Rows always come back in ascending `key` order, also when paging backwards.
+	"""
+	if cursor is None:
+		return stmt.order_by(key).limit(limit).offset(offset)
+
+	position = decode_cursor(cursor)
+	if not position.backwards:
+		return stmt.where(key > position.key).order_by(key).limit(limit)
+
+	# walk backwards through the index for the keys, then return the page in ascending order
+	# (filtering the original statement keeps its loader options intact)
+	keys = (
+		stmt.with_only_columns(key).where(key < position.key).order_by(None).order_by(key.desc()).limit(limit)
+	)
+	return stmt.where(key.in_(keys.scalar_subquery())).order_by(key)
+
+
+def keyset_cursors(
+	rows: Sequence[Any],
+	paginator: PaginationParams,
+	*,
+	key: str = 'id',
+	has_more: bool | None = None,
+) -> tuple[str | None, str | None]:
+	"""(next_cursor, prev_cursor) for a page fetched with `keyset_window`.
+
+	Without `has_more` a full page is assumed to have a successor.
+	"""
+	if not rows:
+		return None, None
+	backwards = _is_backwards(paginator)
+	first, last = getattr(rows[0], key), getattr(rows[-1], key)
+	more = len(rows) >= paginator.limit if has_more is None else has_more
+
+	has_next = backwards or more
+	has_prev = more if backwards else (paginator.cursor is not None or paginator.offset > 0)
+	return (
+		encode_cursor(last) if has_next else None,
+		encode_cursor(first, backwards=True) if has_prev else None,
+	)
+
+
+def _is_backwards(paginator: PaginationParams) -> bool:
+	return paginator.cursor is not None and decode_cursor(paginator.cursor).backwards
+
+
+# ---- Page + count strategies ----
+
+
+class Page(NamedTuple):
+	items: Sequence[Any]
+	total: int | None
+	has_more: bool | None = None
+	count_strategy: CountStrategy | None = None
+
+
+def _page_stmt(stmt: Select, paginator: PaginationParams, key: InstrumentedAttribute | None, extra: int = 0):
+	# page data (keyset when a key column is given, plain LIMIT/OFFSET otherwise)
+	limit = paginator.limit + extra
+	if key is not None:
+		return keyset_window(stmt, key, limit=limit, offset=paginator.offset, cursor=paginator.cursor)
+	return stmt.limit(limit).offset(paginator.offset)
+
+
+def _strategy(paginator: PaginationParams, *, count: bool) -> CountStrategy:
+	if not count:
+		return CountStrategy.none
+	if paginator.count is CountStrategy.window and paginator.cursor is not None:
+		# the window would only see rows past the cursor
+		return CountStrategy.exact
+	return paginator.count
+
+
+def _trim_lookahead(rows: Sequence[Any], paginator: PaginationParams) -> tuple[Sequence[Any], bool]:
+	"""Drop the extra row fetched to detect `has_more` (it is first when paging backwards)."""
+	if len(rows) <= paginator.limit:
+		return rows, False
+	return (rows[1:] if _is_backwards(paginator) else rows[: paginator.limit]), True
+
+
+def _with_window_total(stmt: Select) -> Select:
+	return stmt.add_columns(func.count().over().label('window_total'))
 
 
 def paginate_select(
@@ -17,32 +152,110 @@ def paginate_select(
 	*,
 	count: bool = True,
 	total_override: int | None = None,
-) -> tuple[Sequence[Any], int | None]:
-	# page data
-	rows = session.exec(stmt.limit(paginator.limit).offset(paginator.offset)).all()
+	key: InstrumentedAttribute | None = None,
+) -> Page:
+	if total_override is not None:
+		return Page(session.exec(_page_stmt(stmt, paginator, key)).all(), total_override)
+
+	strategy = _strategy(paginator, count=count)
+	if strategy is CountStrategy.none:
+		rows, has_more = _trim_lookahead(
+			session.exec(_page_stmt(stmt, paginator, key, extra=1)).all(), paginator
+		)
+		return Page(rows, None, has_more, strategy)
+
+	if strategy is CountStrategy.window:
+		result = session.execute(_page_stmt(_with_window_total(stmt), paginator, key)).all()
+		if result or paginator.offset == 0:
+			return Page([r[0] for r in result], result[0][-1] if result else 0, None, strategy)
+		# past the end: the window saw no rows, fall back to an exact count
+		return Page([], count_total(session, stmt, CountStrategy.exact), None, CountStrategy.exact)
+
+	rows = session.exec(_page_stmt(stmt, paginator, key)).all()
+	return Page(rows, count_total(session, stmt, strategy), None, strategy)
+
+
+def count_total(session: Session, stmt: Select, strategy: CountStrategy = CountStrategy.exact) -> int:
+	if strategy is CountStrategy.estimated and (estimate_stmt := estimate_count_stmt(stmt)) is not None:
+		estimate = usable_estimate(session.execute(estimate_stmt).scalar())
+		if estimate is not None:
+			return estimate
+	if strategy is CountStrategy.cached and (cached := count_cache.get(stmt)) is not None:
+		return cached
+
+	total = int(session.exec(exact_count_stmt(stmt)).one())
+	if strategy is CountStrategy.cached:
+		count_cache.set(stmt, total)
+	return total
 
+
+async def apaginate_select(
+	session: AsyncSession,
+	stmt: Select,
+	paginator: PaginationParams,
+	*,
+	count: bool = True,
+	total_override: int | None = None,
+	key: InstrumentedAttribute | None = None,
+) -> Page:
+	"""Async counterpart of `paginate_select`."""
 	if total_override is not None:
-		return rows, total_override
-	if not count:
-		return rows, None
+		return Page((await session.exec(_page_stmt(stmt, paginator, key))).all(), total_override)
+
+	strategy = _strategy(paginator, count=count)
+	if strategy is CountStrategy.none:
+		rows = (await session.exec(_page_stmt(stmt, paginator, key, extra=1))).all()
+		rows, has_more = _trim_lookahead(rows, paginator)
+		return Page(rows, None, has_more, strategy)
 
-	# optimized COUNT(*): remove ORDER BY, wrap original stmt as subquery
-	count_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
-	total = session.exec(count_stmt).scalar_one()
-	return rows, int(total)
+	if strategy is CountStrategy.window:
+		result = (await session.execute(_page_stmt(_with_window_total(stmt), paginator, key))).all()
+		if result or paginator.offset == 0:
+			return Page([r[0] for r in result], result[0][-1] if result else 0, None, strategy)
+		return Page([], await acount_total(session, stmt, CountStrategy.exact), None, CountStrategy.exact)
+
+	rows = (await session.exec(_page_stmt(stmt, paginator, key))).all()
+	return Page(rows, await acount_total(session, stmt, strategy), None, strategy)
+
+
+async def acount_total(
+	session: AsyncSession, stmt: Select, strategy: CountStrategy = CountStrategy.exact
+) -> int:
+	if strategy is CountStrategy.estimated and (estimate_stmt := estimate_count_stmt(stmt)) is not None:
+		estimate = usable_estimate((await session.execute(estimate_stmt)).scalar())
+		if estimate is not None:
+			return estimate
+	if strategy is CountStrategy.cached and (cached := count_cache.get(stmt)) is not None:
+		return cached
+
+	total = int((await session.exec(exact_count_stmt(stmt))).one())
+	if strategy is CountStrategy.cached:
+		count_cache.set(stmt, total)
+	return total
 
 
 def build_paginated_response(
 	items: Sequence[Any],
 	total: int | None,
 	paginator: PaginationParams,
+	*,
+	key: str | None = None,
+	has_more: bool | None = None,
+	count_strategy: CountStrategy | None = None,
 ) -> Paginated[Any]:
 	pages = None if total is None else (ceil(total / paginator.limit) if paginator.limit else 0)
+	next_cursor, prev_cursor = (
+		keyset_cursors(items, paginator, key=key, has_more=has_more) if key else (None, None)
+	)
 	meta = PageMeta(
 		total=total,
 		limit=paginator.limit,
 		offset=paginator.offset,
 		pages=pages,
+		next_cursor=next_cursor,
+		prev_cursor=prev_cursor,
+		has_more=has_more,
+		count_strategy=count_strategy,
 	)
 	return Paginated(
 		success=True,
@@ -60,6 +273,14 @@ def paginate(
 	*,
 	count: bool = True,
 	total_override: int | None = None,
+	key: InstrumentedAttribute | None = None,
 ) -> Paginated[Any]:
-	items, total = paginate_select(session, stmt, params, count=count, total_override=total_override)
-	return build_paginated_response(items, total, params)
+	page = paginate_select(session, stmt, params, count=count, total_override=total_override, key=key)
+	return build_paginated_response(
+		page.items,
+		page.total,
+		params,
+		key=key.key if key is not None else None,
+		has_more=page.has_more,
+		count_strategy=page.count_strategy,
+	)
@@ -0,0 +1,275 @@
+# src/db/pool.py
+"""
+Connection pool options and live pool metrics.
+
+- `pool_options()` builds create_engine() pool arguments from DB_POOL_* settings.
+  The pre-ping strategy is `always` (SQLAlchemy's pool_pre_ping, one round trip per
+  checkout), `idle` (ping only connections idle for DB_POOL_PRE_PING_IDLE seconds
+  or more) or `never`.
+- Engines use `MeteredQueuePool` / `MeteredAsyncQueuePool`. Once an engine is
+  `pool_metrics.register()`ed, every checkout is timed: the wait histogram covers
+  queueing for a free connection plus opening a new one. Checkouts that hit
+  DB_POOL_TIMEOUT are counted too.
+- `pool_metrics.listen(callback)` receives every event as it happens (for the
+  Prometheus metrics, see monitoring/metrics.py).
+
+Exposed at `GET /admin/pool` (ADMIN_ENDPOINTS_ENABLED); each worker process reports its own pools.
+"""
+
+from bisect import bisect_left
+from collections.abc import Callable
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import (
+	DisconnectionError,
+	TimeoutError as PoolTimeoutError,
+)
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from config.settings import PrePing, settings
+
+WAIT_BUCKETS_MS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+_CHECKED_IN_AT = 'checked_in_at'  # ConnectionRecord.info key
+
+# (pool name, event, value): 'checkout', 'timeouts', 'connects', 'invalidations' (1 each),
+# 'wait' (seconds), 'checked_out' and 'overflow' (current counts, after every checkout and checkin)
+type PoolListener = Callable[[str, str, float], None]
+
+
+class PoolMetrics:
+	"""Checkout counters and wait histogram of one pool (thread-safe)."""
+
+	def __init__(self, name: str, listeners: list[PoolListener] | None = None):
+		self.name = name
+		self.listeners = listeners if listeners is not None else []
+		self._lock = threading.Lock()
+		self.reset()
+
+	def _emit(self, event: str, value: float) -> None:
+		for listener in self.listeners:
+			listener(self.name, event, value)
+
+	def reset(self) -> None:
+		with self._lock:
+			self.checkouts = 0
+			self.timeouts = 0
+			self.connects = 0
+			self.invalidations = 0
+			self.peak_checked_out = 0
+			self.wait_counts = [0] * (len(WAIT_BUCKETS_MS) + 1)  # last one is +Inf
+			self.wait_sum_ms = 0.0
+			self.wait_max_ms = 0.0
+
+	def observe_wait(self, seconds: float) -> None:
+		ms = seconds * 1000
+		with self._lock:
+			self.wait_counts[bisect_left(WAIT_BUCKETS_MS, ms)] += 1
+			self.wait_sum_ms += ms
+			self.wait_max_ms = max(self.wait_max_ms, ms)
+		self._emit('wait', seconds)
+
+	def incr(self, counter: str) -> None:
+		with self._lock:
+			setattr(self, counter, getattr(self, counter) + 1)
+		self._emit(counter, 1)
+
+	def checkout(self, checked_out: int) -> None:
+		with self._lock:
+			self.checkouts += 1
+			self.peak_checked_out = max(self.peak_checked_out, checked_out)
+		self._emit('checkout', 1)
+
+	def usage(self, checked_out: int, overflow: int) -> None:
+		self._emit('checked_out', checked_out)
+		self._emit('overflow', overflow)
+
+	def _quantile(self, q: float) -> float | None:
+		# upper bound of the bucket holding the q-quantile; None past the last bound
+		total = sum(self.wait_counts)
+		if not total:
+			return None
+		seen = 0
+		for bound, count in zip(WAIT_BUCKETS_MS, self.wait_counts, strict=False):
+			seen += count
+			if seen >= q * total:
+				return bound
+		return None
+
+	def snapshot(self) -> dict[str, Any]:
+		with self._lock:
+			cumulative, buckets = 0, {}
+			for bound, count in zip((*WAIT_BUCKETS_MS, '+Inf'), self.wait_counts, strict=True):
+				cumulative += count
+				buckets[f'le_{bound}'] = cumulative
+			return {
+				'checkouts': self.checkouts,
+				'timeouts': self.timeouts,
+				'connects': self.connects,
+				'invalidations': self.invalidations,
+				'peak_checked_out': self.peak_checked_out,
+				'wait_ms': {
+					'count': cumulative,
+					'sum': round(self.wait_sum_ms, 3),
+					'max': round(self.wait_max_ms, 3),
+					'p50': self._quantile(0.5),
+					'p95': self._quantile(0.95),
+					'p99': self._quantile(0.99),
+					'buckets': buckets,
+				},
+			}
+
+
+class _Metered:
+	"""Times `_do_get` (queue wait + new connection) once `metrics` is attached."""
+
+	metrics: PoolMetrics | None = None
+
+	def _do_get(self):
+		metrics = self.metrics
+		if metrics is None:
+			return super()._do_get()
+		start = time.perf_counter()
+		try:
+			record = super()._do_get()
+		except PoolTimeoutError:
+			metrics.incr('timeouts')
+			raise
+		metrics.observe_wait(time.perf_counter() - start)
+		return record
+
+	def recreate(self):
+		# engine.dispose() swaps in a fresh pool; keep counting into the same metrics
+		pool = super().recreate()
+		pool.metrics = self.metrics
+		return pool
+
+
+class MeteredQueuePool(_Metered, QueuePool):
+	pass
+
+
+class MeteredAsyncQueuePool(_Metered, AsyncAdaptedQueuePool):
+	pass
+
+
+def pool_options(*, is_async: bool = False) -> dict[str, Any]:
+	"""create_engine() / create_async_engine() pool arguments from settings."""
+	return {
+		'poolclass': MeteredAsyncQueuePool if is_async else MeteredQueuePool,
+		'pool_size': settings.db_pool_size,
+		'max_overflow': settings.db_max_overflow,
+		'pool_timeout': settings.db_pool_timeout,
+		'pool_recycle': settings.db_pool_recycle,
+		'pool_pre_ping': settings.db_pool_pre_ping is PrePing.always,
+	}
+
+
+def _install_idle_pre_ping(engine: Engine, idle: float) -> None:
+	dialect = engine.dialect
+
+	def on_checkin(dbapi_connection, record) -> None:
+		record.info[_CHECKED_IN_AT] = time.monotonic()
+
+	def on_checkout(dbapi_connection, record, proxy) -> None:
+		checked_in_at = record.info.get(_CHECKED_IN_AT)
+		if checked_in_at is None or time.monotonic() - checked_in_at < idle:
+			return
+		try:
+			dialect.do_ping(dbapi_connection)
+		except dialect.loaded_dbapi.Error as exc:
+			# the pool invalidates this connection and retries with a new one
+			raise DisconnectionError from exc
+
+	event.listen(engine, 'checkin', on_checkin)
+	event.listen(engine, 'checkout', on_checkout)
+
+
+def _report_usage(engine: Engine, metrics: PoolMetrics, returning: bool = False) -> None:
+	pool = engine.pool
+	if not isinstance(pool, QueuePool):
+		return
+	checked_out, overflow = pool.checkedout(), pool.overflow()
+	if returning:
+		# checkin fires before the pool takes the connection back; into a full queue
+		# it is closed instead, giving up its overflow slot
+		if overflow >= checked_out:
+			overflow -= 1
+		checked_out -= 1
+	metrics.usage(checked_out, max(overflow, 0))
+
+
+class PoolRegistry:
+	"""The engines whose pools are reported by `GET /admin/pool`."""
+
+	def __init__(self):
+		self._engines: dict[str, Engine] = {}
+		self._listeners: list[PoolListener] = []  # shared with every PoolMetrics
+
+	def listen(self, listener: PoolListener) -> None:
+		"""Call `listener` on every event of every registered pool, past and future registrations alike."""
+		self._listeners.append(listener)
+
+	def register(self, name: str, engine: Engine) -> None:
+		"""Attach metrics (and the idle pre-ping, if configured) to a sync engine or an async one's `sync_engine`."""
+		pool = engine.pool
+		metrics = PoolMetrics(name, self._listeners)
+		if isinstance(pool, _Metered):
+			pool.metrics = metrics
+		if settings.db_pool_pre_ping is PrePing.idle:
+			_install_idle_pre_ping(engine, settings.db_pool_pre_ping_idle)
+
+		def on_checkout(dbapi_connection, record, proxy) -> None:
+			metrics.checkout(engine.pool.checkedout())
+			_report_usage(engine, metrics)
+
+		def on_checkin(dbapi_connection, record) -> None:
+			_report_usage(engine, metrics, returning=True)
+
+		def on_connect(dbapi_connection, record) -> None:
+			metrics.incr('connects')
+
+		def on_invalidate(dbapi_connection, record, exception) -> None:
+			metrics.incr('invalidations')
+
+		event.listen(engine, 'checkout', on_checkout)
+		event.listen(engine, 'checkin', on_checkin)
+		event.listen(engine, 'connect', on_connect)
+		event.listen(engine, 'invalidate', on_invalidate)
+		self._engines[name] = engine
+
+	def stats(self) -> dict[str, Any]:
+		pools = {}
+		for name, engine in self._engines.items():
+			pool = engine.pool
+			entry: dict[str, Any] = {'class': type(pool).__name__}
+			if isinstance(pool, QueuePool):
+				entry |= {
+					'size': pool.size(),
+					'max_overflow': pool._max_overflow,
+					'checked_in': pool.checkedin(),
+					'checked_out': pool.checkedout(),
+					'overflow': max(pool.overflow(), 0),
+				}
+			metrics = getattr(pool, 'metrics', None)
+			if metrics is not None:
+				entry |= metrics.snapshot()
+			pools[name] = entry
+		return {
+			'pre_ping': settings.db_pool_pre_ping.value,
+			'timeout': settings.db_pool_timeout,
+			'recycle': settings.db_pool_recycle,
+			'pools': pools,
+		}
+
+	def reset_stats(self) -> None:
+		for engine in self._engines.values():
+			metrics = getattr(engine.pool, 'metrics', None)
+			if metrics is not None:
+				metrics.reset()
+
+
+pool_metrics = PoolRegistry()
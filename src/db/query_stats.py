@@ -0,0 +1,154 @@
+# src/db/query_stats.py
+"""
+Per-request SQL statistics and query budgets.
+
+`install_query_stats(engine)` hooks cursor execution. The statements run inside
+`track_queries()` are counted and timed into one `QueryStats`, together with
+how often each statement shape repeats: many runs of one shape are the N+1
+signature. The request middleware (monitoring/query_stats.py) opens that scope
+for every request.
+
+- SQL_QUERY_BUDGET makes a request fail with `QueryBudgetExceeded` at the first
+  statement past the budget (CI / local runs).
+- `query_budget(n)` does the same check around any block. It counts statements
+  from every thread, so it also covers requests made through a TestClient.
+"""
+
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+import re
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_STARTED = '_query_stats_started'  # ExecutionContext attribute
+_WHITESPACE = re.compile(r'\s+')
+_PARAM_LIST = re.compile(r'\((?:%\(\w+\)s, )+%\(\w+\)s\)')  # expanded IN (...) lists vary in length
+
+
+@lru_cache(maxsize=1024)
+def statement_shape(statement: str) -> str:
+	"""`statement` with whitespace collapsed and expanded parameter lists folded to `(...)`."""
+	return _PARAM_LIST.sub('(...)', _WHITESPACE.sub(' ', statement).strip())
+
+
+@dataclass
+class QueryStats:
+	statements: int = 0
+	seconds: float = 0.0
+	budget: int | None = None
+	raw: dict[str, int] = field(default_factory=dict)  # statement text -> runs; shaped on demand
+
+	def record(self, statement: str, seconds: float) -> None:
+		self.statements += 1
+		self.seconds += seconds
+		self.raw[statement] = self.raw.get(statement, 0) + 1
+
+	def shapes(self) -> Counter[str]:
+		shapes: Counter[str] = Counter()
+		for statement, runs in self.raw.items():
+			shapes[statement_shape(statement)] += runs
+		return shapes
+
+	def repeated(self, threshold: int = 2) -> list[tuple[str, int]]:
+		"""Shapes run at least `threshold` times, most repeated first."""
+		return [(shape, runs) for shape, runs in self.shapes().most_common() if runs >= threshold]
+
+	def summary(self) -> str:
+		return (
+			f'{self.statements} statement(s), {len(self.shapes())} shape(s), {self.seconds * 1000:.1f} ms in DB'
+		)
+
+
+class QueryBudgetExceeded(RuntimeError):
+	"""More statements than the budget allows; lists the most repeated shapes."""
+
+	def __init__(self, stats: QueryStats, budget: int):
+		top = '; '.join(f'{runs}x {shape[:160]}' for shape, runs in stats.repeated()[:3])
+		super().__init__(
+			f'Query budget of {budget} exceeded ({stats.summary()})' + (f'. Repeated: {top}' if top else '')
+		)
+		self.stats = stats
+		self.budget = budget
+
+
+_current: ContextVar[QueryStats | None] = ContextVar('query_stats', default=None)
+_observers: list[QueryStats] = []  # query_budget() blocks, fed from every thread
+
+
+class track_queries:
+	"""Collect the statements run in this context; a nested call shares the outer stats.
+
+	A plain class rather than @contextmanager: it runs on every request.
+	"""
+
+	__slots__ = ('budget', 'token')
+
+	def __init__(self, budget: int | None = None):
+		self.budget = budget
+		self.token = None
+
+	def __enter__(self) -> QueryStats:
+		stats = _current.get()
+		if stats is None:
+			stats = QueryStats(budget=self.budget)
+			self.token = _current.set(stats)
+		elif stats.budget is None:
+			stats.budget = self.budget
+		return stats
+
+	def __exit__(self, *exc_info) -> None:
+		if self.token is not None:
+			_current.reset(self.token)
+
+
+@contextmanager
+def query_budget(max_statements: int, *, max_repeats: int | None = None) -> Iterator[QueryStats]:
+	"""Raise `QueryBudgetExceeded` if the block runs more than `max_statements` statements,
+	or one shape more than `max_repeats` times.
+
+		with query_budget(3):
+			client.get('/courses/?limit=50')
+	"""
+	stats = QueryStats()
+	_observers.append(stats)
+	try:
+		yield stats
+	finally:
+		_observers.remove(stats)
+	if stats.statements > max_statements:
+		raise QueryBudgetExceeded(stats, max_statements)
+	if max_repeats is not None and (worst := stats.repeated()) and worst[0][1] > max_repeats:
+		raise QueryBudgetExceeded(stats, max_statements)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+	stats = _current.get()
+	if context is None or (stats is None and not _observers):
+		return
+	if stats is not None and stats.budget is not None and stats.statements >= stats.budget:
+		raise QueryBudgetExceeded(stats, stats.budget)
+	setattr(context, _STARTED, perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+	started = getattr(context, _STARTED, None)
+	if started is None:
+		return
+	elapsed = perf_counter() - started
+	stats = _current.get()
+	if stats is not None:
+		stats.record(statement, elapsed)
+	for observer in tuple(_observers):
+		observer.record(statement, elapsed)
+
+
+def install_query_stats(engine: Engine) -> None:
+	"""Feed `engine`'s statements (sync, or an async engine's `sync_engine`) into the stats above."""
+	event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+	event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
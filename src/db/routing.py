@@ -0,0 +1,306 @@
+# src/db/routing.py
+"""
+Read-replica routing (DATABASE_REPLICA_URLS).
+
+- Sessions are `RoutingSession`s. Only sessions opened with `replica_reads=True`
+  may use a replica: request sessions of GET / HEAD requests whose client is not
+  pinned to the primary.
+- In such a session, plain SELECTs (no FOR UPDATE) go to one replica, picked
+  round-robin at the first read, so a request reads from a single server. Any
+  other statement goes to the primary, and so does everything after it.
+- A replica that fails to connect or drops a connection is skipped for
+  REPLICA_RETRY_AFTER seconds. `ReplicaSet.start()` also pings every replica each
+  REPLICA_HEALTH_INTERVAL seconds and reports their replication lag.
+- Read-your-writes: `ReplicaPinMiddleware` answers successful writes with a cookie;
+  for REPLICA_PIN_SECONDS that client's requests read from the primary.
+"""
+
+import asyncio
+from contextlib import suppress
+from dataclasses import dataclass, field
+import itertools
+import logging
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlmodel import Session, create_engine
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+
+from db.pool import pool_metrics, pool_options
+
+logger = logging.getLogger('cerebro.replicas')
+
+_REPLICA = 'replica'  # Session.info keys: the replica this session reads from,
+_REPLICA_READS = 'replica_reads'  # whether it may read from one at all,
+_PRIMARY_ONLY = 'primary_only'  # whether it has switched to the primary for good,
+_PINNED = 'pinned_to_primary'  # and whether its client wrote moments ago
+
+PIN_COOKIE = 'db_primary_until'
+_SAFE_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+# seconds since the last replayed commit; on an idle primary this grows without real lag
+_LAG_SQL = (
+	'SELECT CASE WHEN pg_is_in_recovery() THEN extract(epoch FROM now() - pg_last_xact_replay_timestamp()) END'
+)
+
+
+@dataclass
+class Replica:
+	name: str
+	engine: Engine
+	async_engine: AsyncEngine
+	down_until: float = 0.0
+	sessions: int = 0
+	failures: int = 0
+	lag_seconds: float | None = None
+	last_error: str | None = field(default=None, repr=False)
+
+	@property
+	def healthy(self) -> bool:
+		return self.down_until <= time.monotonic()
+
+
+class ReplicaSet:
+	"""Replica engines (sync + async) with round-robin selection and failover."""
+
+	def __init__(self, urls: list[str], *, retry_after: float, health_interval: float, echo: bool = False):
+		self.retry_after = retry_after
+		self.health_interval = health_interval
+		self.replicas: list[Replica] = []
+		for raw in urls:
+			url = make_url(raw)
+			replica = Replica(
+				name=url.render_as_string(hide_password=True),
+				engine=create_engine(url, echo=echo, **pool_options()),
+				async_engine=create_async_engine(
+					url.set(drivername='postgresql+psycopg_async'), echo=echo, **pool_options(is_async=True)
+				),
+			)
+			pool_metrics.register(replica.name, replica.engine)
+			pool_metrics.register(f'{replica.name} async', replica.async_engine.sync_engine)
+			for engine in (replica.engine, replica.async_engine.sync_engine):
+				event.listen(engine, 'handle_error', self._on_error(replica))
+			self.replicas.append(replica)
+		self._turn = itertools.count()
+		self._lock = threading.Lock()
+		self._task: asyncio.Task | None = None
+
+	def __bool__(self) -> bool:
+		return bool(self.replicas)
+
+	def engines(self) -> list[Engine]:
+		"""Every replica engine; the async ones as their `sync_engine`."""
+		return [e for r in self.replicas for e in (r.engine, r.async_engine.sync_engine)]
+
+	def pick(self) -> Replica | None:
+		"""Next healthy replica in turn, or None when all are down."""
+		with self._lock:
+			start = next(self._turn)
+			for i in range(len(self.replicas)):
+				replica = self.replicas[(start + i) % len(self.replicas)]
+				if replica.healthy:
+					replica.sessions += 1
+					return replica
+		return None
+
+	def mark_down(self, replica: Replica, error: BaseException | str) -> None:
+		with self._lock:
+			if replica.healthy:
+				logger.warning('replica %s marked down for %ss: %s', replica.name, self.retry_after, error)
+				replica.failures += 1
+			replica.down_until = time.monotonic() + self.retry_after
+			replica.last_error = str(error)
+
+	def mark_up(self, replica: Replica) -> None:
+		with self._lock:
+			if not replica.healthy:
+				logger.info('replica %s back in rotation', replica.name)
+			replica.down_until = 0.0
+
+	def _on_error(self, replica: Replica):
+		def handle_error(context) -> None:
+			# connection-level failures only; a bad query says nothing about the server, and a
+			# stale pooled connection caught by pre-ping is simply replaced
+			if context.is_pre_ping:
+				return
+			if context.is_disconnect or context.connection is None:
+				self.mark_down(replica, context.original_exception)
+
+		return handle_error
+
+	# -------- active health checks --------
+	async def check(self, replica: Replica) -> None:
+		try:
+			async with asyncio.timeout(self.health_interval):
+				async with replica.async_engine.connect() as conn:
+					lag = (await conn.exec_driver_sql(_LAG_SQL)).scalar()
+		except Exception as exc:  # any failure takes the replica out
+			self.mark_down(replica, exc)
+			return
+		replica.lag_seconds = None if lag is None else float(lag)
+		self.mark_up(replica)
+
+	async def _monitor(self) -> None:
+		while True:
+			await asyncio.gather(*(self.check(r) for r in self.replicas))
+			await asyncio.sleep(self.health_interval)
+
+	async def start(self) -> None:
+		if self.replicas and self._task is None:
+			self._task = asyncio.create_task(self._monitor(), name='replica-health')
+
+	async def stop(self) -> None:
+		if self._task is not None:
+			self._task.cancel()
+			with suppress(asyncio.CancelledError):
+				await self._task
+			self._task = None
+		for replica in self.replicas:
+			await replica.async_engine.dispose()
+			replica.engine.dispose()
+
+	def reset_stats(self) -> None:
+		with self._lock:
+			for replica in self.replicas:
+				replica.sessions = replica.failures = 0
+
+	def stats(self) -> dict[str, Any]:
+		with self._lock:
+			return {
+				'replicas': [
+					{
+						'name': r.name,
+						'healthy': r.healthy,
+						'sessions': r.sessions,
+						'failures': r.failures,
+						'lag_seconds': r.lag_seconds,
+						'last_error': r.last_error,
+					}
+					for r in self.replicas
+				],
+			}
+
+
+# ---- sessions ----
+
+
+def _plain_select(clause) -> bool:
+	return getattr(clause, 'is_select', False) and getattr(clause, '_for_update_arg', None) is None
+
+
+class RoutingSession(Session):
+	"""Session that sends eligible reads to a replica (see module docstring)."""
+
+	_async_bind = False
+
+	def __init__(self, *args, replicas: ReplicaSet | None = None, replica_reads: bool = False, **kwargs):
+		super().__init__(*args, **kwargs)
+		self.replicas = replicas
+		self.info[_REPLICA_READS] = replica_reads
+
+	def get_bind(self, mapper=None, clause=None, **kw):
+		replica = self._replica_for(clause)
+		if replica is None:
+			return super().get_bind(mapper, clause=clause, **kw)
+		return self._engine(replica)
+
+	def _engine(self, replica: Replica) -> Engine:
+		return replica.async_engine.sync_engine if self._async_bind else replica.engine
+
+	def _replica_for(self, clause) -> Replica | None:
+		info = self.info
+		if not self.replicas or not info.get(_REPLICA_READS) or info.get(_PRIMARY_ONLY):
+			return None
+		if self._flushing or (clause is not None and not _plain_select(clause)):
+			info[_PRIMARY_ONLY] = True
+			return None
+		if clause is None:
+			return None  # bare connection() / unknown work: primary, but later reads may still go out
+		if _REPLICA not in info:
+			info[_REPLICA] = self._connect_replica()
+		return info[_REPLICA]
+
+	def _connect_replica(self) -> Replica | None:
+		# check the connection out now, so a replica that just died fails over inside this request
+		while (replica := self.replicas.pick()) is not None:
+			try:
+				self.connection(bind_arguments={'bind': self._engine(replica)})
+			except DBAPIError as exc:
+				self.replicas.mark_down(replica, exc.orig or exc)
+				continue
+			return replica
+		return None
+
+
+class AsyncRoutingSession(RoutingSession):
+	"""`sync_session_class` for AsyncSession: routes to the replicas' async engines."""
+
+	_async_bind = True
+
+
+def allow_replica_reads(session: Session, allowed: bool = True) -> None:
+	session.info[_REPLICA_READS] = allowed
+
+
+def session_replica(session: Session) -> Replica | None:
+	"""The replica `session` has read from, if any."""
+	return session.info.get(_REPLICA)
+
+
+def reads_from_replica(session: Session) -> bool:
+	"""Whether `session`'s plain SELECTs currently go to a replica."""
+	return session.info.get(_REPLICA) is not None and not session.info.get(_PRIMARY_ONLY)
+
+
+def pin_session(session: Session) -> None:
+	"""Mark `session` as serving a pinned client: primary only, and no process-wide cached reads."""
+	session.info[_PINNED] = True
+	session.info[_REPLICA_READS] = False
+
+
+def session_pinned(session: Session) -> bool:
+	return session.info.get(_PINNED, False)
+
+
+# ---- read-your-writes pinning ----
+
+
+def pinned_to_primary(conn: HTTPConnection) -> bool:
+	try:
+		return float(conn.cookies.get(PIN_COOKIE, 0)) > time.time()
+	except ValueError:
+		return False
+
+
+def replica_eligible(conn: HTTPConnection) -> bool:
+	return conn.scope.get('method') in ('GET', 'HEAD') and not pinned_to_primary(conn)
+
+
+class ReplicaPinMiddleware:
+	"""Pure ASGI middleware: after a successful write, pin the client to the primary."""
+
+	def __init__(self, app, pin_seconds: float):
+		self.app = app
+		self.pin_seconds = pin_seconds
+
+	async def __call__(self, scope, receive, send):
+		if scope['type'] != 'http' or scope['method'] in _SAFE_METHODS or self.pin_seconds <= 0:
+			await self.app(scope, receive, send)
+			return
+
+		async def send_with_pin(message):
+			if message['type'] == 'http.response.start' and message['status'] < 400:
+				until = time.time() + self.pin_seconds
+				MutableHeaders(scope=message).append(
+					'Set-Cookie',
+					f'{PIN_COOKIE}={until:.3f}; Max-Age={max(1, round(self.pin_seconds))}; Path=/; HttpOnly; SameSite=Lax',
+				)
+			await send(message)
+
+		await self.app(scope, receive, send_with_pin)
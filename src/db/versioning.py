@@ -0,0 +1,84 @@
+# src/db/versioning.py
+
+"""
+Cheap resource versions for conditional GETs (ETag / Last-Modified).
+
+A version is (row count, sum of xmin, max(updated)) over every table a
+representation reads, soft-deleted rows included. Hard deletes move the count.
+Every committed insert or update gives its rows a new xmin (the writing
+transaction's id), so the sum moves too. `updated` alone cannot be trusted:
+`now()` is the transaction's start time, so a transaction that started before
+an already-committed one can commit an older `updated`. `updated` still feeds
+Last-Modified, which is therefore only a hint, and ETags carry the whole version.
+Computing it is one aggregate query that never loads or serializes rows, though
+reading xmin visits the heap.
+"""
+
+from datetime import UTC, datetime
+from typing import NamedTuple
+
+from sqlalchemy import BigInteger, Text, func, literal_column, select, true
+from sqlalchemy.sql import ColumnElement, Select
+from sqlmodel import Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+class ResourceVersion(NamedTuple):
+	rows: int
+	updated: datetime | None
+	writes: int = 0  # sum of the rows' xmin
+
+	@property
+	def last_modified(self) -> datetime | None:
+		"""`updated` as an aware UTC datetime (columns are naive, written by the UTC server clock)."""
+		if self.updated is None:
+			return None
+		return self.updated.replace(tzinfo=UTC) if self.updated.tzinfo is None else self.updated
+
+	@property
+	def token(self) -> str:
+		stamp = self.updated.isoformat() if self.updated is not None else '-'
+		return f'{self.rows}:{self.writes}:{stamp}'
+
+
+def _xmin(model: type[SQLModel]):
+	# xid has no cast to bigint; its text form does
+	return literal_column(f'{model.__tablename__}.xmin').cast(Text).cast(BigInteger)
+
+
+def version_stmt(*sources: tuple[type[SQLModel], ColumnElement[bool] | None] | type[SQLModel]) -> Select:
+	"""One row (rows, updated, writes) aggregated over `sources`.
+
+	Each source is a model, or (model, where clause) to version a subset of its rows.
+	"""
+	parts = []
+	for source in sources:
+		model, where = source if isinstance(source, tuple) else (source, None)
+		stmt = select(
+			func.count().label('rows'),
+			func.max(model.updated).label('updated'),
+			func.coalesce(func.sum(_xmin(model)), 0).label('writes'),
+		).select_from(model)
+		if where is not None:
+			stmt = stmt.where(where)
+		parts.append(stmt.subquery())
+	if len(parts) == 1:
+		return select(parts[0].c.rows, parts[0].c.updated, parts[0].c.writes)
+	rows = sum((p.c.rows for p in parts[1:]), parts[0].c.rows)
+	writes = sum((p.c.writes for p in parts[1:]), parts[0].c.writes)
+	# greatest() skips NULLs, so an empty table does not hide the others
+	updated = func.greatest(*(p.c.updated for p in parts))
+	joined = parts[0]
+	for part in parts[1:]:
+		joined = joined.join(part, true())  # one-row aggregates: a cross join is one row
+	return select(rows.label('rows'), updated.label('updated'), writes.label('writes')).select_from(joined)
+
+
+def get_version(db: Session, stmt: Select) -> ResourceVersion:
+	rows, updated, writes = db.execute(stmt).one()
+	return ResourceVersion(rows, updated, int(writes))
+
+
+async def aget_version(db: AsyncSession, stmt: Select) -> ResourceVersion:
+	rows, updated, writes = (await db.execute(stmt)).one()
+	return ResourceVersion(rows, updated, int(writes))
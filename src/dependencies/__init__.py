@@ -1,8 +1,14 @@
-from .db_session import DbSession
+from .conditional import Conditional, ConditionalGet
+from .db_session import AsyncDbSession, DbSession, async_unit_of_work, unit_of_work
 from .pagination import Pagination, PaginationParams
 
 __all__ = [
+	'AsyncDbSession',
+	'Conditional',
+	'ConditionalGet',
 	'DbSession',
 	'Pagination',
 	'PaginationParams',
+	'async_unit_of_work',
+	'unit_of_work',
 ]
@@ -0,0 +1,72 @@
+# src/dependencies/conditional.py
+
+from email.utils import format_datetime, parsedate_to_datetime
+import hashlib
+from typing import Annotated
+
+from fastapi import Depends, Request, Response, status
+
+from db.versioning import ResourceVersion
+
+
+def _etag(request: Request, version: ResourceVersion) -> str:
+	# the query string selects the page (limit/offset/cursor/count), so it is part of the tag
+	query = '&'.join(sorted(f'{k}={v}' for k, v in request.query_params.multi_items()))
+	digest = hashlib.blake2b(f'{request.url.path}?{query}|{version.token}'.encode(), digest_size=12).hexdigest()
+	# weak: the same version may be sent with different encodings
+	return f'W/"{digest}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+	if if_none_match.strip() == '*':
+		return True
+	opaque = etag.removeprefix('W/')
+	return any(tag.strip().removeprefix('W/') == opaque for tag in if_none_match.split(','))
+
+
+def _not_modified_since(if_modified_since: str, version: ResourceVersion) -> bool:
+	if version.last_modified is None:
+		return False
+	try:
+		since = parsedate_to_datetime(if_modified_since)
+	except (TypeError, ValueError):
+		return False
+	if since.tzinfo is None:
+		return False
+	return version.last_modified.replace(microsecond=0) <= since
+
+
+class ConditionalGet:
+	"""Validators for one GET: compare the request's preconditions with a resource version.
+
+	`not_modified(version)` sets ETag / Last-Modified on the response and returns a
+	bodiless 304 when the client's copy is current, so handlers can return it before
+	loading anything; handlers that build their own Response pass `headers` on.
+	If-None-Match wins over If-Modified-Since (RFC 9110 13.2.2); the date alone
+	cannot see hard deletes that leave `updated` untouched.
+	"""
+
+	def __init__(self, request: Request, response: Response):
+		self.request = request
+		self.response = response
+		self.headers: dict[str, str] = {}
+
+	def not_modified(self, version: ResourceVersion) -> Response | None:
+		headers = {'ETag': _etag(self.request, version), 'Cache-Control': 'no-cache'}
+		if version.last_modified is not None:
+			headers['Last-Modified'] = format_datetime(version.last_modified, usegmt=True)
+		self.headers = headers
+		self.response.headers.update(headers)
+
+		if_none_match = self.request.headers.get('if-none-match')
+		if if_none_match is not None:
+			fresh = _matches(if_none_match, headers['ETag'])
+		else:
+			if_modified_since = self.request.headers.get('if-modified-since')
+			fresh = if_modified_since is not None and _not_modified_since(if_modified_since, version)
+		if fresh:
+			return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+		return None
+
+
+Conditional = Annotated[ConditionalGet, Depends()]
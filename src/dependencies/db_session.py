@@ -1,18 +1,32 @@
 # src/dependencies/db_session.py
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, AsyncIterator, Generator, Iterator
+from contextlib import AbstractContextManager, asynccontextmanager, contextmanager, nullcontext
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, Request
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from db.conf import SessionLocal
+from config.settings import settings
+from db.conf import AsyncSessionLocal, SessionLocal
+from db.lazy_guard import forbid_lazy_loads
+from db.routing import pin_session, pinned_to_primary, replica_eligible
 
 
-def get_session() -> Generator[Session]:
-	db = SessionLocal()
+@contextmanager
+def unit_of_work(replica_reads: bool = False) -> Iterator[Session]:
+	"""Session scope for one unit of work.
+
+	Repositories only stage and flush; the scope commits once on a clean exit and
+	rolls back if anything raised. Usable outside requests (scripts, CLIs).
+	`replica_reads` lets its SELECTs go to a read replica (see db/routing.py).
+	"""
+	db = SessionLocal(replica_reads=replica_reads)
 	try:
 		yield db
+		if db.in_transaction():
+			db.commit()
 	except Exception:
 		db.rollback()
 		raise
@@ -20,5 +34,45 @@ def get_session() -> Generator[Session]:
 		db.close()
 
 
-# Type alias for injection
+@asynccontextmanager
+async def async_unit_of_work(replica_reads: bool = False) -> AsyncIterator[AsyncSession]:
+	"""Async counterpart of `unit_of_work`."""
+	db = AsyncSessionLocal(replica_reads=replica_reads)
+	try:
+		yield db
+		if db.in_transaction():
+			await db.commit()
+	except Exception:
+		await db.rollback()
+		raise
+	finally:
+		await db.close()
+
+
+def _lazy_guard(db: Session) -> AbstractContextManager:
+	return forbid_lazy_loads(db) if settings.raise_on_lazy_load else nullcontext()
+
+
+def get_session(request: Request) -> Generator[Session]:
+	"""Request-scoped unit of work: commits after the handler, before the response is sent.
+
+	GET / HEAD requests read from a replica unless the client wrote moments ago; such a
+	pinned client also skips the lookup cache, which other workers may hold stale.
+	"""
+	with unit_of_work(replica_eligible(request)) as db, _lazy_guard(db):
+		if pinned_to_primary(request):
+			pin_session(db)
+		yield db
+
+
+async def get_async_session(request: Request) -> AsyncGenerator[AsyncSession]:
+	async with async_unit_of_work(replica_eligible(request)) as db:
+		if pinned_to_primary(request):
+			pin_session(db.sync_session)
+		with _lazy_guard(db.sync_session):
+			yield db
+
+
+# Type aliases for injection
 DbSession = Annotated[Session, Depends(get_session)]
+AsyncDbSession = Annotated[AsyncSession, Depends(get_async_session)]
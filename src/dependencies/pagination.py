@@ -4,9 +4,11 @@ from __future__ import annotations
 
 from typing import Annotated
 
-from fastapi import Depends, Query
+from fastapi import Depends, HTTPException, Query, status
 
-from schemas import PaginationParams
+from config.settings import settings
+from db.pagination import decode_cursor
+from schemas import CountStrategy, PaginationParams
 
 DEFAULT_LIMIT = 50
 MAX_LIMIT = 200
@@ -16,8 +18,26 @@ MAX_LIMIT = 200
 def pagination_params(
 	limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
 	offset: int = Query(0, ge=0),
+	cursor: str | None = Query(
+		None, description='Opaque keyset cursor (meta.next_cursor / meta.prev_cursor); overrides offset'
+	),
+	count: CountStrategy | None = Query(
+		None, description='How meta.total is computed; defaults to the server setting'
+	),
 ) -> PaginationParams:
-	return PaginationParams(limit=limit, offset=offset)
+	strategy = count or settings.pagination_count_default
+	if strategy not in settings.pagination_count_allowed:
+		allowed = ', '.join(sorted(settings.pagination_count_allowed))
+		raise HTTPException(
+			status_code=status.HTTP_400_BAD_REQUEST,
+			detail=f"Count strategy '{strategy}' is not allowed (allowed: {allowed})",
+		)
+	if cursor is not None:
+		try:
+			decode_cursor(cursor)
+		except ValueError as exc:
+			raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+	return PaginationParams(limit=limit, offset=offset, cursor=cursor, count=strategy)
 
 
 Pagination = Annotated[PaginationParams, Depends(pagination_params)]
@@ -0,0 +1,20 @@
+# src/gunicorn.conf.py
+"""gunicorn hooks (read from the working directory): Prometheus multiprocess housekeeping."""
+
+from config.settings import settings
+
+
+def on_starting(server):
+	# values left by a previous run would be summed into this one's
+	directory = settings.prometheus_multiproc_dir
+	if directory is not None and directory.is_dir():
+		for path in directory.glob('*.db'):
+			path.unlink()
+
+
+def child_exit(server, worker):
+	# a worker killed outright never ran its own shutdown
+	if settings.prometheus_multiproc_dir is not None:
+		from prometheus_client.multiprocess import mark_process_dead
+
+		mark_process_dead(worker.pid, path=str(settings.prometheus_multiproc_dir))
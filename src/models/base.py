@@ -34,3 +34,6 @@ class TimestampMixin(SQLModel):
 		},
 		description='Last modification timestamp',
 	)
+
+	# Fetch server-generated timestamps with RETURNING on flush instead of a refresh SELECT
+	__mapper_args__ = {'eager_defaults': True}
@@ -1,3 +1,3 @@
-from .newsletter import NewsletterSubscriber  # noqa: F401
+from .newsletter import NewsletterSubscriber
 
 __all__ = ['NewsletterSubscriber']
@@ -0,0 +1,13 @@
+from .loop_monitor import LoopMonitor, LoopMonitorMiddleware, loop_monitor
+from .metrics import Metrics, MetricsMiddleware, metrics
+from .query_stats import QueryStatsMiddleware
+
+__all__ = [
+	'LoopMonitor',
+	'LoopMonitorMiddleware',
+	'Metrics',
+	'MetricsMiddleware',
+	'QueryStatsMiddleware',
+	'loop_monitor',
+	'metrics',
+]
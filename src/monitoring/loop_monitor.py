@@ -0,0 +1,259 @@
+# src/monitoring/loop_monitor.py
+
+"""
+Opt-in event-loop stall detector (LOOP_MONITOR_ENABLED=true).
+
+- A sampler task sleeps `interval` and measures how late it wakes up (loop lag).
+- A watchdog thread notices when that heartbeat stops and captures the loop
+  thread's stack, mapping it back to the endpoint that is hogging the loop.
+- Sync engine statements executed *on the loop thread* are collected so a
+  stall can be reported together with the SQL that ran during it.
+- `LoopMonitorMiddleware` tags each request with its route template.
+
+Results are logged (logger `cerebro.loop`) and exposed at `GET /admin/loop-stalls`
+(ADMIN_ENDPOINTS_ENABLED).
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextlib import suppress
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+import logging
+import sys
+import threading
+import time
+from types import CodeType
+from typing import Any
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config.settings import settings
+
+logger = logging.getLogger('cerebro.loop')
+
+MAX_SQL_PER_STALL = 10
+
+_current_scope: ContextVar[dict | None] = ContextVar('loop_monitor_scope', default=None)
+
+
+def route_label(scope: dict | None) -> str | None:
+	"""'GET /tracks/' style label from an ASGI scope, once routing has matched."""
+	if not scope:
+		return None
+	route = scope.get('route')
+	if route is None:
+		return None
+	return f'{scope.get("method", "")} {route.path}'.strip()
+
+
+@dataclass
+class RouteStalls:
+	requests: int = 0
+	stalls: int = 0
+	blocked_ms: float = 0.0
+	max_ms: float = 0.0
+
+
+@dataclass
+class Stall:
+	route: str | None
+	duration_ms: float
+	sql: list[str]
+	at: float
+
+
+class LoopMonitor:
+	def __init__(self, *, threshold_ms: float = 100.0, interval_ms: float = 20.0, history: int = 100):
+		self.threshold = threshold_ms / 1000
+		self.interval = interval_ms / 1000
+		self.running = False
+
+		self._lock = threading.Lock()
+		self._routes: dict[str, RouteStalls] = {}
+		self._recent: deque[Stall] = deque(maxlen=history)
+		self._endpoints: dict[CodeType, str] = {}
+
+		self._loop_thread_id: int | None = None
+		self._heartbeat = time.monotonic()
+		self._suspect: str | None = None  # route captured by the watchdog mid-stall
+		self._window_sql: list[tuple[str | None, str]] = []  # (route, sql) run on the loop since last tick
+
+		self._lag_last_ms = 0.0
+		self._lag_max_ms = 0.0
+		self._samples = 0
+		self._over_threshold = 0
+
+		self._task: asyncio.Task | None = None
+		self._watchdog: threading.Thread | None = None
+		self._stop = threading.Event()
+
+	# -------- wiring --------
+	def register_routes(self, app: FastAPI) -> None:
+		for route in app.routes:
+			if isinstance(route, APIRoute):
+				code = getattr(route.endpoint, '__code__', None)
+				if code is not None:
+					self._endpoints[code] = f'{",".join(sorted(route.methods))} {route.path}'
+
+	def attach_engine(self, engine: Engine) -> None:
+		"""Record statements that a *sync* engine runs on the event-loop thread."""
+		event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+
+	def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+		if not self.running or threading.get_ident() != self._loop_thread_id:
+			return
+		if len(self._window_sql) < MAX_SQL_PER_STALL:
+			self._window_sql.append((route_label(_current_scope.get()), statement))
+
+	# -------- lifecycle --------
+	async def start(self) -> None:
+		if self.running:
+			return
+		self._loop_thread_id = threading.get_ident()
+		self._heartbeat = time.monotonic()
+		self._stop.clear()
+		self.running = True
+		self._task = asyncio.create_task(self._sample(), name='loop-monitor')
+		self._watchdog = threading.Thread(target=self._watch, name='loop-monitor-watchdog', daemon=True)
+		self._watchdog.start()
+
+	async def stop(self) -> None:
+		self.running = False
+		self._stop.set()
+		if self._task:
+			self._task.cancel()
+			with suppress(asyncio.CancelledError):
+				await self._task
+		if self._watchdog:
+			self._watchdog.join(timeout=1)
+
+	# -------- sampling --------
+	async def _sample(self) -> None:
+		while True:
+			started = time.monotonic()
+			await asyncio.sleep(self.interval)
+			now = time.monotonic()
+			lag = max(0.0, now - started - self.interval)
+			self._heartbeat = now
+			self._record_lag(lag)
+			if lag >= self.threshold:
+				self._record_stall(lag)
+			self._window_sql = []
+
+	def _watch(self) -> None:
+		poll = max(self.interval / 2, 0.005)
+		while not self._stop.wait(poll):
+			if time.monotonic() - self._heartbeat < self.threshold:
+				continue
+			with self._lock:
+				if self._suspect is None:
+					self._suspect = self._blocking_route() or ''
+
+	def _blocking_route(self) -> str | None:
+		frame = sys._current_frames().get(self._loop_thread_id)
+		while frame is not None:
+			label = self._endpoints.get(frame.f_code)
+			if label:
+				return label
+			frame = frame.f_back
+		return None
+
+	# -------- bookkeeping --------
+	def _record_lag(self, lag: float) -> None:
+		lag_ms = lag * 1000
+		self._lag_last_ms = lag_ms
+		self._lag_max_ms = max(self._lag_max_ms, lag_ms)
+		self._samples += 1
+		if lag >= self.threshold:
+			self._over_threshold += 1
+
+	def _record_stall(self, lag: float) -> None:
+		with self._lock:
+			suspect, self._suspect = self._suspect, None
+		sql = [s for _, s in self._window_sql]
+		route = suspect or next((r for r, _ in self._window_sql if r), None)
+		duration_ms = lag * 1000
+		stall = Stall(route=route, duration_ms=round(duration_ms, 2), sql=sql, at=time.time())
+		with self._lock:
+			self._recent.append(stall)
+			stats = self._routes.setdefault(route or '<unknown>', RouteStalls())
+			stats.stalls += 1
+			stats.blocked_ms += duration_ms
+			stats.max_ms = max(stats.max_ms, duration_ms)
+		logger.warning(
+			'Event loop blocked for %.1f ms in %s (%d SQL statement(s) on loop thread)%s',
+			duration_ms,
+			route or '<unknown>',
+			len(sql),
+			f': {sql[0]}' if sql else '',
+		)
+
+	def record_request(self, route: str | None) -> None:
+		if route is None:
+			return
+		with self._lock:
+			self._routes.setdefault(route, RouteStalls()).requests += 1
+
+	def reset(self) -> None:
+		with self._lock:
+			self._routes.clear()
+			self._recent.clear()
+		self._lag_max_ms = 0.0
+		self._samples = 0
+		self._over_threshold = 0
+
+	def snapshot(self) -> dict[str, Any]:
+		with self._lock:
+			routes = {
+				name: {
+					**asdict(stats),
+					'blocked_ms': round(stats.blocked_ms, 2),
+					'max_ms': round(stats.max_ms, 2),
+				}
+				for name, stats in sorted(self._routes.items(), key=lambda kv: kv[1].blocked_ms, reverse=True)
+			}
+			recent = [asdict(s) for s in reversed(self._recent)]
+		return {
+			'enabled': self.running,
+			'threshold_ms': self.threshold * 1000,
+			'interval_ms': self.interval * 1000,
+			'lag': {
+				'last_ms': round(self._lag_last_ms, 2),
+				'max_ms': round(self._lag_max_ms, 2),
+				'samples': self._samples,
+				'over_threshold': self._over_threshold,
+			},
+			'routes': routes,
+			'recent': recent,
+		}
+
+
+class LoopMonitorMiddleware:
+	"""Pure ASGI middleware: exposes the request scope to SQL hooks and counts requests per route."""
+
+	def __init__(self, app, monitor: LoopMonitor):
+		self.app = app
+		self.monitor = monitor
+
+	async def __call__(self, scope, receive, send):
+		if scope['type'] != 'http':
+			await self.app(scope, receive, send)
+			return
+		token = _current_scope.set(scope)
+		try:
+			await self.app(scope, receive, send)
+		finally:
+			_current_scope.reset(token)
+			self.monitor.record_request(route_label(scope))
+
+
+loop_monitor = LoopMonitor(
+	threshold_ms=settings.loop_block_threshold_ms,
+	interval_ms=settings.loop_sample_interval_ms,
+)
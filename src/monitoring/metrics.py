@@ -0,0 +1,191 @@
+# src/monitoring/metrics.py
+
+"""
+Prometheus metrics at `GET /metrics` (METRICS_ENABLED, on by default), kept by
+prometheus_client.
+
+- `MetricsMiddleware` counts requests and observes their latency by method,
+  route template and status. It also tracks the requests in flight, by method:
+  the route is only known once routing has run.
+- SQL statements run while serving a request are counted and timed per route,
+  from the request's `db.query_stats.track_queries()` scope.
+- Pool gauges, counters and the checkout wait histogram follow db/pool.py's
+  events as they happen.
+
+Under gunicorn, point PROMETHEUS_MULTIPROC_DIR at an empty directory shared by
+the workers. prometheus_client then keeps every value in per-process mmap files
+that each update writes through, so a scrape served by any worker sums the exact
+current totals of all of them. Counters never go backwards between scrapes and
+survive a worker killed outright. gunicorn.conf.py wipes the directory when the
+master starts and drops the gauges of exited workers (`mark_process_dead`).
+"""
+
+import os
+from pathlib import Path
+from time import perf_counter
+
+from config.settings import settings
+from db.pool import WAIT_BUCKETS_MS, pool_metrics
+from db.query_stats import QueryStats, track_queries
+
+# prometheus_client picks its value store when first imported, from the environment
+# only; settings may have come from a .env file
+if settings.prometheus_multiproc_dir is not None:
+	os.environ['PROMETHEUS_MULTIPROC_DIR'] = str(settings.prometheus_multiproc_dir)
+	settings.prometheus_multiproc_dir.mkdir(parents=True, exist_ok=True)
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.exposition import CONTENT_TYPE_PLAIN_0_0_4
+from prometheus_client.multiprocess import MultiProcessCollector, mark_process_dead
+
+CONTENT_TYPE = CONTENT_TYPE_PLAIN_0_0_4
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+POOL_WAIT_BUCKETS = tuple(ms / 1000 for ms in WAIT_BUCKETS_MS)
+UNMATCHED = 'unmatched'  # route label of requests no route matched (404s), so paths never become labels
+
+
+def _route(scope: dict) -> str:
+	route = scope.get('route')
+	if route is None:
+		return UNMATCHED
+	return getattr(route, 'path_format', None) or route.path
+
+
+class Metrics:
+	"""The app's metric families, in a registry of their own.
+
+	In multiprocess mode (`multiproc_dir` set) a scrape reads every worker's files
+	instead of the registry.
+	"""
+
+	def __init__(self, multiproc_dir: Path | None = None):
+		self.multiproc_dir = multiproc_dir
+		self.registry = registry = CollectorRegistry(auto_describe=True)
+		self.requests = Counter(
+			'http_requests', 'HTTP requests served.', ('method', 'route', 'status'), registry=registry
+		)
+		self.duration = Histogram(
+			'http_request_duration_seconds',
+			'HTTP request latency, first byte received to last byte sent.',
+			('method', 'route'),
+			buckets=REQUEST_BUCKETS,
+			registry=registry,
+		)
+		self.in_progress = Gauge(
+			'http_requests_in_progress',
+			'HTTP requests being served.',
+			('method',),
+			multiprocess_mode='livesum',
+			registry=registry,
+		)
+		self.queries = Counter(
+			'db_queries',
+			'SQL statements executed while serving a route.',
+			('method', 'route'),
+			registry=registry,
+		)
+		self.query_seconds = Counter(
+			'db_query_duration_seconds',
+			'Time spent executing SQL statements while serving a route.',
+			('method', 'route'),
+			registry=registry,
+		)
+		self.pool_checked_out = Gauge(
+			'db_pool_checked_out',
+			'Connections checked out of the pool.',
+			('pool',),
+			multiprocess_mode='livesum',
+			registry=registry,
+		)
+		self.pool_overflow = Gauge(
+			'db_pool_overflow',
+			'Connections open beyond the pool size.',
+			('pool',),
+			multiprocess_mode='livesum',
+			registry=registry,
+		)
+		self.pool_checkouts = Counter('db_pool_checkouts', 'Pool checkouts.', ('pool',), registry=registry)
+		self.pool_timeouts = Counter(
+			'db_pool_checkout_timeouts',
+			'Checkouts that gave up after DB_POOL_TIMEOUT.',
+			('pool',),
+			registry=registry,
+		)
+		self.pool_wait = Histogram(
+			'db_pool_checkout_wait_seconds',
+			'Time to obtain a pooled connection, including opening a new one.',
+			('pool',),
+			buckets=POOL_WAIT_BUCKETS,
+			registry=registry,
+		)
+
+	# -------- recording --------
+	def record_request(self, scope: dict, status: int, duration: float, stats: QueryStats) -> None:
+		method, route = scope['method'], _route(scope)
+		self.requests.labels(method, route, str(status)).inc()
+		self.duration.labels(method, route).observe(duration)
+		if stats.statements:
+			self.queries.labels(method, route).inc(stats.statements)
+			self.query_seconds.labels(method, route).inc(stats.seconds)
+
+	def record_pool_event(self, pool: str, event: str, value: float) -> None:
+		"""`db.pool.PoolListener`."""
+		if event == 'checkout':
+			self.pool_checkouts.labels(pool).inc()
+		elif event == 'timeouts':
+			self.pool_timeouts.labels(pool).inc()
+		elif event == 'wait':
+			self.pool_wait.labels(pool).observe(value)
+		elif event == 'checked_out':
+			self.pool_checked_out.labels(pool).set(value)
+		elif event == 'overflow':
+			self.pool_overflow.labels(pool).set(value)
+
+	# -------- exposition --------
+	def render(self) -> bytes:
+		"""Prometheus text exposition format 0.0.4; every worker's totals in multiprocess mode."""
+		if self.multiproc_dir is None:
+			return generate_latest(self.registry)
+		registry = CollectorRegistry()
+		MultiProcessCollector(registry, path=str(self.multiproc_dir))
+		return generate_latest(registry)
+
+	def stop(self) -> None:
+		"""Drop this worker's live gauges (its counters stay in the totals)."""
+		if self.multiproc_dir is not None:
+			mark_process_dead(os.getpid(), path=str(self.multiproc_dir))
+
+
+class MetricsMiddleware:
+	"""Pure ASGI middleware recording request count, latency, in-flight and SQL per route."""
+
+	def __init__(self, app, metrics: Metrics):
+		self.app = app
+		self.metrics = metrics
+
+	async def __call__(self, scope, receive, send):
+		if scope['type'] != 'http':
+			await self.app(scope, receive, send)
+			return
+		status = 500  # if the app raises before starting a response
+
+		async def send_status(message):
+			nonlocal status
+			if message['type'] == 'http.response.start':
+				status = message['status']
+			await send(message)
+
+		in_progress = self.metrics.in_progress.labels(scope['method'])
+		in_progress.inc()
+		start = perf_counter()
+		with track_queries() as stats:
+			try:
+				await self.app(scope, receive, send_status)
+			finally:
+				duration = perf_counter() - start
+				in_progress.dec()
+				self.metrics.record_request(scope, status, duration, stats)
+
+
+metrics = Metrics(settings.prometheus_multiproc_dir)
+pool_metrics.listen(metrics.record_pool_event)
@@ -0,0 +1,58 @@
+# src/monitoring/query_stats.py
+
+"""
+Per-request SQL report (SQL_STATS_ENABLED, on by default).
+
+Each request runs inside `db.query_stats.track_queries()`. Its statement count
+and DB time go out in a `Server-Timing: db;dur=...` header and to the
+`cerebro.sql` debug log. A statement shape repeated SQL_REPEAT_WARN_THRESHOLD
+times or more is logged as a possible N+1. SQL_QUERY_BUDGET fails the request
+at the first statement past the budget.
+"""
+
+import logging
+
+from starlette.datastructures import MutableHeaders
+
+from db.query_stats import QueryStats, track_queries
+from monitoring.loop_monitor import route_label
+
+logger = logging.getLogger('cerebro.sql')
+
+
+class QueryStatsMiddleware:
+	"""Pure ASGI middleware: Server-Timing header and log line with the request's SQL stats."""
+
+	def __init__(self, app, *, repeat_threshold: int = 10, budget: int | None = None):
+		self.app = app
+		self.repeat_threshold = repeat_threshold
+		self.budget = budget
+
+	async def __call__(self, scope, receive, send):
+		if scope['type'] != 'http':
+			await self.app(scope, receive, send)
+			return
+		with track_queries(self.budget) as stats:
+
+			async def send_with_timing(message):
+				if message['type'] == 'http.response.start':
+					MutableHeaders(scope=message).append(
+						'Server-Timing',
+						f'db;dur={stats.seconds * 1000:.2f};desc="{stats.statements} statements"',
+					)
+				await send(message)
+
+			try:
+				await self.app(scope, receive, send_with_timing)
+			finally:
+				self._report(scope, stats)
+
+	def _report(self, scope: dict, stats: QueryStats) -> None:
+		debug = logger.isEnabledFor(logging.DEBUG)
+		if not debug and stats.statements < self.repeat_threshold:
+			return  # nothing to log, and no shape can have repeated often enough
+		label = route_label(scope) or f'{scope["method"]} {scope["path"]}'
+		if debug:
+			logger.debug('%s: %s', label, stats.summary())
+		for shape, runs in stats.repeated(self.repeat_threshold):
+			logger.warning('Possible N+1 in %s: %d runs of %s', label, runs, shape[:300])
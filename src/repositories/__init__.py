@@ -1,11 +1,28 @@
-from .base import get_public_id
-from .news.newsletter_repo import NewsletterRepository
-from .track.module_repo import ModuleRepository
-from .track.track_repo import TrackRepository
+from .base import async_get_public_id, get_public_id, insert_returning, set_deleted_stmt
+from .news.newsletter_repo import AsyncNewsletterRepository, NewsletterRepository, SubscribeStatus
+from .track.course_repo import AsyncCourseRepository, CourseRepository
+from .track.module_repo import (
+	AsyncContentMediaRepository,
+	AsyncModuleContentRepository,
+	AsyncModuleRepository,
+	ModuleRepository,
+)
+from .track.track_repo import AsyncTrackRepository, TrackRepository
 
 __all__ = [
+	'AsyncContentMediaRepository',
+	'AsyncCourseRepository',
+	'AsyncModuleContentRepository',
+	'AsyncModuleRepository',
+	'AsyncNewsletterRepository',
+	'AsyncTrackRepository',
+	'CourseRepository',
 	'ModuleRepository',
 	'NewsletterRepository',
+	'SubscribeStatus',
 	'TrackRepository',
+	'async_get_public_id',
 	'get_public_id',
+	'insert_returning',
+	'set_deleted_stmt',
 ]
@@ -1,14 +1,65 @@
 from uuid import UUID
 
+from sqlalchemy import insert, update
 from sqlmodel import Session, SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from db.lookup_cache import acached_first, cached_first
 
-def get_public_id(
-	db: Session, model: type[SQLModel], public_id: str | UUID, *, include_deleted: bool = False
-) -> SQLModel | None:
-	"""Generic function to fetch a record by public_id."""
+
+def _public_id_stmt(model: type[SQLModel], public_id: str | UUID, include_deleted: bool):
 	public_id_str = str(public_id)  # ensure string to match varchar column
 	stmt = select(model).where(model.public_id == public_id_str)
 	if (not include_deleted) and hasattr(model, 'is_deleted'):
 		stmt = stmt.where(model.is_deleted.is_(False))
-	return db.exec(stmt).first()
+	return stmt
+
+
+def get_public_id(
+	db: Session, model: type[SQLModel], public_id: str | UUID, *, include_deleted: bool = False
+) -> SQLModel | None:
+	"""Generic function to fetch a record by public_id (read-through `lookup_cache`)."""
+	stmt = _public_id_stmt(model, public_id, include_deleted)
+	key = ('public_id', str(public_id), include_deleted)
+	return cached_first(db, model, key, lambda: db.exec(stmt).first())
+
+
+async def async_get_public_id(
+	db: AsyncSession, model: type[SQLModel], public_id: str | UUID, *, include_deleted: bool = False
+) -> SQLModel | None:
+	"""Async counterpart of `get_public_id`."""
+	stmt = _public_id_stmt(model, public_id, include_deleted)
+
+	async def load():
+		return (await db.exec(stmt)).first()
+
+	return await acached_first(db, model, ('public_id', str(public_id), include_deleted), load)
+
+
+def insert_returning(db: Session, model: type[SQLModel], rows: list[dict]) -> list[SQLModel]:
+	"""Multi-row `INSERT ... RETURNING` staged in the current transaction (no commit).
+
+	Rows come back as ORM objects in input order, with server defaults populated.
+	"""
+	if not rows:
+		return []
+	stmt = insert(model).returning(model, sort_by_parameter_order=True)
+	return list(db.scalars(stmt, rows).all())
+
+
+def set_deleted_stmt(
+	model: type[SQLModel], key: int | str | UUID, *, deleted: bool, by: str = 'public_id', **values
+):
+	"""Soft delete / restore as one `UPDATE ... RETURNING id`, matching `key` on the `by` column.
+
+	Only rows currently in the opposite state match, so an empty result means
+	"not found" (or already deleted/restored) without a prior lookup.
+	"""
+	value = str(key) if by == 'public_id' else key
+	return (
+		update(model)
+		.where(getattr(model, by) == value, model.is_deleted.is_(not deleted))
+		.values(is_deleted=deleted, **values)
+		.returning(model.id)
+		.execution_options(synchronize_session=False)
+	)
@@ -1,18 +1,85 @@
 # src/repos/newsletter_repo.py
-from uuid import UUID
+from enum import StrEnum
+from uuid import UUID, uuid4
 
 from pydantic import EmailStr
-from sqlalchemy import func
+from sqlalchemy import func, literal_column, or_, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from db.pagination import Page, apaginate_select, keyset_window, paginate_select
 from models.news import NewsletterSubscriber
-from repositories import get_public_id
+from repositories import async_get_public_id, get_public_id, set_deleted_stmt
+from schemas import PaginationParams
 
 
 def _normalize_email(email: str) -> str:
 	return email.strip().lower()
 
 
+def _unsubscribe_stmt(public_id: str | UUID):
+	return set_deleted_stmt(
+		NewsletterSubscriber, public_id, deleted=True, is_active=False, unsubscribed_at=func.now()
+	)
+
+
+def _restore_stmt(email: str):
+	return (
+		update(NewsletterSubscriber)
+		.where(
+			NewsletterSubscriber.email == _normalize_email(email),
+			or_(NewsletterSubscriber.is_deleted.is_(True), NewsletterSubscriber.is_active.is_(False)),
+		)
+		.values(is_active=True, is_deleted=False)
+		.returning(NewsletterSubscriber)
+		# refresh an already-loaded instance with the returned row
+		.execution_options(synchronize_session=False, populate_existing=True)
+	)
+
+
+class SubscribeStatus(StrEnum):
+	CREATED = 'created'
+	RESTORED = 'restored'
+	ACTIVE = 'active'  # already subscribed; nothing changed
+
+
+# True in RETURNING for rows the INSERT created, False for rows ON CONFLICT updated
+_inserted = literal_column('xmax') == 0
+
+
+def _reactivate_on_conflict(stmt):
+	"""Re-activate inactive / soft-deleted subscribers that collide on email; leave active ones alone."""
+	table = NewsletterSubscriber.__table__
+	return stmt.on_conflict_do_update(
+		index_elements=[table.c.email],
+		set_={'is_active': True, 'is_deleted': False, 'updated': func.now()},
+		where=or_(table.c.is_active.is_(False), table.c.is_deleted.is_(True)),
+	)
+
+
+def _subscribe_stmt(email: str):
+	"""`INSERT ... ON CONFLICT (email) DO UPDATE ... RETURNING` for subscribe.
+
+	Inactive rows are re-activated; an already active row matches the conflict but
+	not the update predicate, so nothing is returned. `xmax = 0` tells a fresh insert
+	from an update. Concurrent signups for one address serialize on the unique index.
+	"""
+	stmt = insert(NewsletterSubscriber).values(email=_normalize_email(email), public_id=str(uuid4()))
+	return (
+		_reactivate_on_conflict(stmt)
+		.returning(NewsletterSubscriber, _inserted.label('created'))
+		.execution_options(populate_existing=True)
+	)
+
+
+def _subscribe_result(row) -> tuple[NewsletterSubscriber | None, SubscribeStatus]:
+	if row is None:
+		return None, SubscribeStatus.ACTIVE
+	sub, created = row
+	return sub, SubscribeStatus.CREATED if created else SubscribeStatus.RESTORED
+
+
 class NewsletterRepository:
 	"""Lean repository: stage objects; caller controls commit."""
 
@@ -48,15 +115,23 @@ class NewsletterRepository:
 		*,
 		limit: int,
 		offset: int = 0,
+		cursor: str | None = None,
 		include_deleted: bool = False,
 	) -> list[NewsletterSubscriber]:
 		"""Windowed fetch with limit/offset (non-deleted by default)."""
 		stmt = select(NewsletterSubscriber)
 		if (not include_deleted) and hasattr(NewsletterSubscriber, 'is_deleted'):
 			stmt = stmt.where(NewsletterSubscriber.is_deleted.is_(False))
-		stmt = stmt.limit(limit).offset(offset)
+		stmt = keyset_window(stmt, NewsletterSubscriber.id, limit=limit, offset=offset, cursor=cursor)
 		return self.db.exec(stmt).all()
 
+	def paginate(self, paginator: PaginationParams, *, include_deleted: bool = False) -> Page:
+		"""One page plus `total` computed with the client's count strategy."""
+		stmt = select(NewsletterSubscriber)
+		if (not include_deleted) and hasattr(NewsletterSubscriber, 'is_deleted'):
+			stmt = stmt.where(NewsletterSubscriber.is_deleted.is_(False))
+		return paginate_select(self.db, stmt, paginator, key=NewsletterSubscriber.id)
+
 	def count(self, *, include_deleted: bool = False) -> int:
 		stmt = select(func.count()).select_from(NewsletterSubscriber)
 		if (not include_deleted) and hasattr(NewsletterSubscriber, 'is_deleted'):
@@ -68,30 +143,95 @@ class NewsletterRepository:
 		email = _normalize_email(email)
 		sub = NewsletterSubscriber(email=email)
 		self.db.add(sub)
-		self.db.commit()
-		self.db.refresh(sub)
+		self.db.flush()
 		return sub
 
+	def subscribe(self, email: EmailStr) -> tuple[NewsletterSubscriber | None, SubscribeStatus]:
+		"""Create or re-activate in one round trip; the subscriber is None when already active."""
+		return _subscribe_result(self.db.execute(_subscribe_stmt(email)).first())
+
 	# -------- soft deletes --------
-	def soft_delete(self, public_id: str | UUID) -> None:
-		public_id_str = str(public_id)  # ensure string to match varchar column
-		stmt = select(NewsletterSubscriber).where(NewsletterSubscriber.public_id == public_id_str)
-		sub = self.db.exec(stmt).first()
-		if sub:
-			sub.is_active = False
-			sub.is_deleted = True
-			sub.unsubscribed_at = func.now()
-			self.db.add(sub)
-			self.db.commit()
-			self.db.refresh(sub)
+	def soft_delete(self, public_id: str | UUID) -> bool:
+		"""Unsubscribe in one UPDATE; returns False when no active subscriber matched."""
+		return self.db.execute(_unsubscribe_stmt(public_id)).first() is not None
 
 	# -------- restores --------
-	def restore(self, email: EmailStr) -> None:
+	def restore(self, email: EmailStr) -> NewsletterSubscriber | None:
+		"""Re-activate in one UPDATE ... RETURNING; None when nothing was inactive."""
+		return self.db.scalars(_restore_stmt(email)).first()
+
+
+class AsyncNewsletterRepository:
+	"""Async counterpart of `NewsletterRepository`."""
+
+	def __init__(self, db: AsyncSession):
+		self.db = db
+
+	# -------- getters --------
+	async def get(self, pk: int, *, include_deleted: bool = False) -> NewsletterSubscriber | None:
+		stmt = select(NewsletterSubscriber).where(NewsletterSubscriber.id == pk)
+		if (not include_deleted) and hasattr(NewsletterSubscriber, 'is_deleted'):
+			stmt = stmt.where(NewsletterSubscriber.is_deleted.is_(False))
+		return (await self.db.exec(stmt)).first()
+
+	async def get_by_email(self, email: EmailStr, include_deleted: bool = False) -> NewsletterSubscriber | None:
 		stmt = select(NewsletterSubscriber).where(NewsletterSubscriber.email == email)
-		sub = self.db.exec(stmt).first()
-		if sub:
-			sub.is_active = True
-			sub.is_deleted = False
-			self.db.add(sub)
-			self.db.commit()
-			self.db.refresh(sub)
+		if (not include_deleted) and hasattr(NewsletterSubscriber, 'is_deleted'):
+			stmt = stmt.where(NewsletterSubscriber.is_deleted.is_(False))
+		return (await self.db.exec(stmt)).first()
+
+	async def get_by_public_id(
+		self, public_id: str | UUID, *, include_deleted: bool = False
+	) -> NewsletterSubscriber | None:
+		return await async_get_public_id(
+			self.db,
+			NewsletterSubscriber,
+			str(public_id),
+			include_deleted=include_deleted,
+		)
+
+	async def get_all(
+		self,
+		*,
+		limit: int,
+		offset: int = 0,
+		cursor: str | None = None,
+		include_deleted: bool = False,
+	) -> list[NewsletterSubscriber]:
+		"""Windowed fetch with limit/offset (non-deleted by default)."""
+		stmt = select(NewsletterSubscriber)
+		if (not include_deleted) and hasattr(NewsletterSubscriber, 'is_deleted'):
+			stmt = stmt.where(NewsletterSubscriber.is_deleted.is_(False))
+		stmt = keyset_window(stmt, NewsletterSubscriber.id, limit=limit, offset=offset, cursor=cursor)
+		return (await self.db.exec(stmt)).all()
+
+	async def paginate(self, paginator: PaginationParams, *, include_deleted: bool = False) -> Page:
+		"""One page plus `total` computed with the client's count strategy."""
+		stmt = select(NewsletterSubscriber)
+		if (not include_deleted) and hasattr(NewsletterSubscriber, 'is_deleted'):
+			stmt = stmt.where(NewsletterSubscriber.is_deleted.is_(False))
+		return await apaginate_select(self.db, stmt, paginator, key=NewsletterSubscriber.id)
+
+	async def count(self, *, include_deleted: bool = False) -> int:
+		stmt = select(func.count()).select_from(NewsletterSubscriber)
+		if (not include_deleted) and hasattr(NewsletterSubscriber, 'is_deleted'):
+			stmt = stmt.where(NewsletterSubscriber.is_deleted.is_(False))
+		return int((await self.db.exec(stmt)).one())
+
+	# -------- mutations --------
+	async def create(self, email: EmailStr) -> NewsletterSubscriber:
+		sub = NewsletterSubscriber(email=_normalize_email(email))
+		self.db.add(sub)
+		await self.db.flush()
+		return sub
+
+	async def subscribe(self, email: EmailStr) -> tuple[NewsletterSubscriber | None, SubscribeStatus]:
+		return _subscribe_result((await self.db.execute(_subscribe_stmt(email))).first())
+
+	# -------- soft deletes --------
+	async def soft_delete(self, public_id: str | UUID) -> bool:
+		return (await self.db.execute(_unsubscribe_stmt(public_id))).first() is not None
+
+	# -------- restores --------
+	async def restore(self, email: EmailStr) -> NewsletterSubscriber | None:
+		return (await self.db.scalars(_restore_stmt(email))).first()
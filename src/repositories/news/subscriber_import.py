@@ -0,0 +1,171 @@
+# src/repositories/news/subscriber_import.py
+"""Bulk subscriber import: stream CSV / NDJSON -> COPY into a staging table -> one merge."""
+
+import codecs
+from collections.abc import AsyncIterable, Iterable
+import csv
+import json
+import re
+
+from sqlalchemy import String, column, func, select, table, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from db.counting import count_cache
+from db.lookup_cache import mark_written
+from models.news import NewsletterSubscriber
+from repositories.news.newsletter_repo import _inserted, _normalize_email, _reactivate_on_conflict
+from schemas.news import SubscriberFileFormat, SubscriberImportOut
+
+# Shape check only: full EmailStr validation costs ~80us/row and would cap imports
+# well below the target rate. Rows failing it are counted as invalid.
+_EMAIL_RE = re.compile(r'[^@\s]+@[^@\s]+\.[^@\s]+')
+_MAX_EMAIL_LEN = 320  # newsletter_subscribers.email is varchar(320)
+
+_STAGING = 'subscriber_import'
+_staging = table(_STAGING, column('email', String))
+
+
+class EmailStreamParser:
+	"""Incremental email extractor fed with raw byte chunks.
+
+	CSV uploads may carry a header row naming an `email` column; otherwise the first
+	column is used. NDJSON lines are objects with an `email` key or bare strings.
+	"""
+
+	def __init__(self, fmt: SubscriberFileFormat):
+		self.fmt = fmt
+		self.received = 0
+		self.invalid = 0
+		self._decoder = codecs.getincrementaldecoder('utf-8-sig')(errors='replace')
+		self._tail = ''
+		self._column: int | None = None
+
+	def feed(self, chunk: bytes, *, final: bool = False) -> list[str]:
+		lines = (self._tail + self._decoder.decode(chunk, final)).split('\n')
+		self._tail = '' if final else lines.pop()
+		emails = []
+		for line in lines:
+			email = self._parse(line.strip())
+			if email is not None:
+				emails.append(email)
+		return emails
+
+	def close(self) -> list[str]:
+		return self.feed(b'', final=True)
+
+	def _parse(self, line: str) -> str | None:
+		if not line:
+			return None
+		if self.fmt is SubscriberFileFormat.CSV:
+			fields = next(csv.reader([line]))
+			if self._column is None:
+				header = [f.strip().lower() for f in fields]
+				self._column = header.index('email') if 'email' in header else 0
+				if 'email' in header:
+					return None
+			value = fields[self._column] if self._column < len(fields) else None
+		else:
+			try:
+				obj = json.loads(line)
+			except ValueError:
+				obj = None
+			value = obj.get('email') if isinstance(obj, dict) else obj
+
+		self.received += 1
+		email = _normalize_email(value) if isinstance(value, str) else ''
+		if len(email) > _MAX_EMAIL_LEN or not _EMAIL_RE.fullmatch(email):
+			self.invalid += 1
+			return None
+		return email
+
+
+def _merge_stmt():
+	"""Upsert the distinct staged emails; returns (inserted, restored) counts.
+
+	Rows go in email order so concurrent imports take row locks in the same order.
+	"""
+	staged = select(_staging.c.email).distinct().subquery()
+	rows = select(func.gen_random_uuid().cast(String), staged.c.email).order_by(staged.c.email)
+	upserted = (
+		_reactivate_on_conflict(
+			insert(NewsletterSubscriber.__table__).from_select(['public_id', 'email'], rows)
+		)
+		.returning(_inserted.label('inserted'))
+		.cte('upserted')
+	)
+	return select(
+		func.count().filter(upserted.c.inserted),
+		func.count().filter(~upserted.c.inserted),
+	)
+
+
+def _invalidate_caches(db: Session) -> None:
+	# the INSERT sits in a CTE, so the engine's write hooks see a SELECT and skip it
+	tables = [NewsletterSubscriber.__tablename__]
+	count_cache.invalidate(tables)
+	mark_written(db, tables)
+
+
+_CREATE_STAGING = text(f'CREATE TEMP TABLE IF NOT EXISTS {_STAGING} (email text NOT NULL) ON COMMIT DROP')
+_TRUNCATE_STAGING = text(f'TRUNCATE {_STAGING}')
+_COPY_STAGING = f'COPY {_STAGING} (email) FROM STDIN'
+
+
+def _summary(parser: EmailStreamParser, staged: int, inserted: int, restored: int) -> SubscriberImportOut:
+	return SubscriberImportOut(
+		received=parser.received,
+		inserted=inserted,
+		restored=restored,
+		skipped=staged - inserted - restored,
+		invalid=parser.invalid,
+	)
+
+
+def import_subscribers(db: Session, chunks: Iterable[bytes], fmt: SubscriberFileFormat) -> SubscriberImportOut:
+	"""Stream `chunks` into the staging table with COPY and merge them in the caller's transaction."""
+	parser = EmailStreamParser(fmt)
+	db.execute(_CREATE_STAGING)
+	db.execute(_TRUNCATE_STAGING)
+
+	staged = 0
+	raw = db.connection().connection.driver_connection
+	with raw.cursor() as cur, cur.copy(_COPY_STAGING) as copy:
+		for chunk in chunks:
+			for email in parser.feed(chunk):
+				copy.write_row((email,))
+				staged += 1
+		for email in parser.close():
+			copy.write_row((email,))
+			staged += 1
+
+	inserted, restored = db.execute(_merge_stmt()).one()
+	_invalidate_caches(db)
+	return _summary(parser, staged, inserted, restored)
+
+
+async def aimport_subscribers(
+	db: AsyncSession, chunks: AsyncIterable[bytes], fmt: SubscriberFileFormat
+) -> SubscriberImportOut:
+	"""Async counterpart of `import_subscribers`; parsing runs off the event loop."""
+	parser = EmailStreamParser(fmt)
+	await db.execute(_CREATE_STAGING)
+	await db.execute(_TRUNCATE_STAGING)
+
+	staged = 0
+	conn = await db.connection()
+	raw = (await conn.get_raw_connection()).driver_connection
+	async with raw.cursor() as cur, cur.copy(_COPY_STAGING) as copy:
+		async for chunk in chunks:
+			for email in await run_in_threadpool(parser.feed, chunk):
+				await copy.write_row((email,))
+				staged += 1
+		for email in parser.close():
+			await copy.write_row((email,))
+			staged += 1
+
+	inserted, restored = (await db.execute(_merge_stmt())).one()
+	_invalidate_caches(db.sync_session)
+	return _summary(parser, staged, inserted, restored)
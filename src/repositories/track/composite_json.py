@@ -0,0 +1,119 @@
+# src/repositories/track/composite_json.py
+
+"""
+Postgres-side rendering of `ModuleCompositeOut`.
+
+The whole document (module, ordered contents, ordered media) is produced by one
+statement with json_build_object / json_agg and comes back as text, so the hot
+`GET /modules/{public_id}/` read skips ORM hydration and pydantic entirely.
+
+It must stay byte-identical to the python serializer in `module_composite.py`:
+same keys, same ordering, pydantic's datetime format. Postgres pads json_build_object
+output (`"key" : value`) and `json` columns keep the text they were written with,
+so the document is compacted with an order-preserving orjson round trip (about
+1 ms per MB). `check_composite_json_parity` compares both paths byte for byte.
+"""
+
+from itertools import chain
+from typing import Any
+from uuid import UUID
+
+import orjson
+from sqlalchemy import Text, case, cast, func, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+
+from models import ContentMedia, Module, ModuleContent
+
+_ISO_SECONDS = literal_column('\'YYYY-MM-DD"T"HH24:MI:SS\'')
+_ISO_MICROS = literal_column('\'YYYY-MM-DD"T"HH24:MI:SS.US\'')
+_EMPTY = literal_column("'[]'::json")
+
+
+def _iso(column):
+	"""Naive timestamp formatted like pydantic: fraction only when non-zero, always 6 digits."""
+	return case(
+		(column == func.date_trunc('second', column), func.to_char(column, _ISO_SECONDS)),
+		else_=func.to_char(column, _ISO_MICROS),
+	)
+
+
+def _object(**fields: Any):
+	return func.json_build_object(
+		*chain.from_iterable((literal_column(f"'{k}'"), v) for k, v in fields.items())
+	)
+
+
+def _media_json():
+	media = _object(
+		public_id=ContentMedia.public_id,
+		caption=ContentMedia.caption,
+		position=ContentMedia.position,
+		url=ContentMedia.url,
+		meta=ContentMedia.meta,
+		created=_iso(ContentMedia.created),
+		updated=_iso(ContentMedia.updated),
+	)
+	return (
+		select(func.json_agg(aggregate_order_by(media, ContentMedia.position, ContentMedia.id)))
+		.where(ContentMedia.module_content_public_id == ModuleContent.public_id)
+		.correlate(ModuleContent)
+		.scalar_subquery()
+	)
+
+
+def _contents_json():
+	content = _object(
+		title=ModuleContent.title,
+		summary=ModuleContent.summary,
+		markdown=ModuleContent.markdown,
+		primary_media_url=ModuleContent.primary_media_url,
+		cover_image_url=ModuleContent.cover_image_url,
+		order=ModuleContent.order,
+		draft=ModuleContent.draft,
+		is_published=ModuleContent.is_published,
+		published_at=_iso(ModuleContent.published_at),
+		estimated_minutes=ModuleContent.estimated_minutes,
+		tags=ModuleContent.tags,
+		media=func.coalesce(_media_json(), _EMPTY),
+		created=_iso(ModuleContent.created),
+		updated=_iso(ModuleContent.updated),
+	)
+	return (
+		select(func.json_agg(aggregate_order_by(content, ModuleContent.order.nulls_last(), ModuleContent.id)))
+		.where(ModuleContent.module_public_id == Module.public_id)
+		.correlate(Module)
+		.scalar_subquery()
+	)
+
+
+def module_composite_json_stmt(public_id: UUID):
+	document = _object(
+		module=_object(
+			name=Module.name,
+			description=Module.description,
+			order=Module.order,
+			public_id=Module.public_id,
+			created=_iso(Module.created),
+			updated=_iso(Module.updated),
+		),
+		contents=func.coalesce(_contents_json(), _EMPTY),
+	)
+	return select(cast(document, Text)).where(Module.public_id == public_id, Module.is_deleted.is_(False))
+
+
+def render_module_composite_json(db: Session, public_id: UUID) -> bytes | None:
+	"""`ModuleCompositeOut` JSON for a module, or None when it does not exist."""
+	document = db.execute(module_composite_json_stmt(public_id)).scalar_one_or_none()
+	return None if document is None else orjson.dumps(orjson.loads(document))
+
+
+def check_composite_json_parity(db: Session, public_id: UUID) -> bool:
+	"""True when the SQL-rendered document is byte-identical to the python serializer's output."""
+	from repositories.track.module_composite import get_module_composite
+
+	rendered = render_module_composite_json(db, public_id)
+	composite = get_module_composite(db, public_id)
+	if rendered is None or composite is None:
+		return rendered is None and composite is None
+	return rendered == composite.__pydantic_serializer__.to_json(composite)
@@ -1,44 +1,85 @@
 from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlmodel import UUID, Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from models.track.programs import Course
-from repositories import get_public_id
+from db.pagination import Page, apaginate_select, keyset_window, paginate_select
+from models.track.programs import Course, Track
+from repositories import async_get_public_id, get_public_id, set_deleted_stmt
+from schemas import PaginationParams
+
+
+def _track_courses_stmt(track_public_id: UUID):
+	"""Live courses of one track.
+
+	Paged by keyset on `order`, this is a range scan of the unique (track_public_id,
+	order) index. Courses without an `order` have no place in the sequence and are
+	not listed.
+	"""
+	return (
+		select(Course)
+		.where(
+			Course.track_public_id == track_public_id,
+			Course.order.is_not(None),
+			Course.is_deleted.is_(False),
+		)
+		.options(selectinload(Course.track))
+	)
 
 
 class CourseRepository:
-	"""CRUD repository for Course."""
+	"""CRUD repository for Course.
+
+	`CourseOut` nests the track, so reads eager-load `Course.track` (one extra
+	query per call, not per row).
+	"""
 
 	def __init__(self, db: Session):
 		self.db = db
 
 	# -------- getters --------
-	def get(self, pk: int) -> Course | None:
-		stmt = select(Course).where(Course.id == pk)
+	def get(self, pk: int, *, include_deleted: bool = False) -> Course | None:
+		stmt = select(Course).where(Course.id == pk).options(selectinload(Course.track))
+		if not include_deleted:
+			stmt = stmt.where(Course.is_deleted.is_(False))
 		return self.db.exec(stmt).first()
 
-	def get_all(self, *, limit: int, offset: int = 0) -> list[Course]:
-		stmt = select(Course).limit(limit).offset(offset)
+	def get_all(self, *, limit: int, offset: int = 0, cursor: str | None = None) -> list[Course]:
+		stmt = select(Course).options(selectinload(Course.track))
+		stmt = keyset_window(stmt, Course.id, limit=limit, offset=offset, cursor=cursor)
 		return self.db.exec(stmt).all()
 
 	def get_by_public_id(self, public_id: str | UUID, *, include_deleted: bool = False) -> Course | None:
-		public_id_str = str(public_id)
-		return get_public_id(
-			self.db,
-			Course,
-			public_id_str,
-			include_deleted=include_deleted,
-		)
+		stmt = select(Course).where(Course.public_id == str(public_id)).options(selectinload(Course.track))
+		if not include_deleted:
+			stmt = stmt.where(Course.is_deleted.is_(False))
+		return self.db.exec(stmt).first()
+
+	def paginate(self, paginator: PaginationParams) -> Page:
+		"""One page plus `total` computed with the client's count strategy."""
+		stmt = select(Course).options(selectinload(Course.track))
+		return paginate_select(self.db, stmt, paginator, key=Course.id)
+
+	def paginate_for_track(self, track_public_id: UUID, paginator: PaginationParams) -> Page:
+		"""One track's courses in `order`; cursors carry the last `order` seen."""
+		return paginate_select(self.db, _track_courses_stmt(track_public_id), paginator, key=Course.order)
 
 	def count(self) -> int:
 		stmt = select(func.count()).select_from(Course)
 		return int(self.db.exec(stmt).one())
 
+	def _load_track(self, obj: Course) -> None:
+		# through the cached public_id lookup; refresh(obj, ['track']) would be a lazy load
+		track = get_public_id(self.db, Track, obj.track_public_id, include_deleted=True)
+		set_committed_value(obj, 'track', track)
+
 	# -------- mutations --------
 	def create(self, payload: dict) -> Course:
 		obj = Course(**payload)
 		self.db.add(obj)
-		self.db.commit()
-		self.db.refresh(obj)
+		self.db.flush()
+		self._load_track(obj)
 		return obj
 
 	def update(self, public_id, payload: dict) -> Course | None:
@@ -50,14 +91,83 @@ class CourseRepository:
 			if value is not None:
 				setattr(obj, field, value)
 		self.db.add(obj)
-		self.db.commit()
-		self.db.refresh(obj)
+		self.db.flush()
+		if 'track_public_id' in payload:
+			self._load_track(obj)
 		return obj
 
-	def soft_delete(self, public_id: UUID) -> None:
-		obj = self.get_by_public_id(public_id)
+	def soft_delete(self, pk: int) -> bool:
+		"""Returns False when no live course matched."""
+		return self.db.execute(set_deleted_stmt(Course, pk, deleted=True, by='id')).first() is not None
+
+
+class AsyncCourseRepository:
+	"""Async counterpart of `CourseRepository`.
+
+	`CourseOut` nests the track, and async sessions cannot lazy load, so every
+	read eager-loads `Course.track`.
+	"""
+
+	def __init__(self, db: AsyncSession):
+		self.db = db
+
+	# -------- getters --------
+	async def get(self, pk: int, *, include_deleted: bool = False) -> Course | None:
+		stmt = select(Course).where(Course.id == pk).options(selectinload(Course.track))
+		if not include_deleted:
+			stmt = stmt.where(Course.is_deleted.is_(False))
+		return (await self.db.exec(stmt)).first()
+
+	async def get_all(self, *, limit: int, offset: int = 0, cursor: str | None = None) -> list[Course]:
+		stmt = select(Course).options(selectinload(Course.track))
+		stmt = keyset_window(stmt, Course.id, limit=limit, offset=offset, cursor=cursor)
+		return (await self.db.exec(stmt)).all()
+
+	async def get_by_public_id(self, public_id: str | UUID, *, include_deleted: bool = False) -> Course | None:
+		stmt = select(Course).where(Course.public_id == str(public_id)).options(selectinload(Course.track))
+		if not include_deleted:
+			stmt = stmt.where(Course.is_deleted.is_(False))
+		return (await self.db.exec(stmt)).first()
+
+	async def paginate(self, paginator: PaginationParams) -> Page:
+		"""One page plus `total` computed with the client's count strategy."""
+		stmt = select(Course).options(selectinload(Course.track))
+		return await apaginate_select(self.db, stmt, paginator, key=Course.id)
+
+	async def paginate_for_track(self, track_public_id: UUID, paginator: PaginationParams) -> Page:
+		return await apaginate_select(
+			self.db, _track_courses_stmt(track_public_id), paginator, key=Course.order
+		)
+
+	async def count(self) -> int:
+		stmt = select(func.count()).select_from(Course)
+		return int((await self.db.exec(stmt)).one())
+
+	async def _load_track(self, obj: Course) -> None:
+		track = await async_get_public_id(self.db, Track, obj.track_public_id, include_deleted=True)
+		set_committed_value(obj, 'track', track)
+
+	# -------- mutations --------
+	async def create(self, payload: dict) -> Course:
+		obj = Course(**payload)
+		self.db.add(obj)
+		await self.db.flush()
+		await self._load_track(obj)
+		return obj
+
+	async def update(self, public_id, payload: dict) -> Course | None:
+		obj = await self.get_by_public_id(public_id)
 		if not obj:
-			return
-		obj.is_deleted = True
-		self.db.commit()
-		self.db.refresh(obj)
+			return None
+
+		for field, value in payload.items():
+			if value is not None:
+				setattr(obj, field, value)
+		self.db.add(obj)
+		await self.db.flush()
+		if 'track_public_id' in payload:
+			await self._load_track(obj)
+		return obj
+
+	async def soft_delete(self, pk: int) -> bool:
+		return (await self.db.execute(set_deleted_stmt(Course, pk, deleted=True, by='id'))).first() is not None
@@ -1,64 +1,60 @@
 from collections.abc import Sequence
 from uuid import UUID
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
 
+from db.pagination import Page
+from db.versioning import ResourceVersion, get_version, version_stmt
 from models import ContentMedia, Module, ModuleContent
+from repositories.track.composite_json import render_module_composite_json
 from repositories.track.module_repo import ContentMediaRepository, ModuleContentRepository, ModuleRepository
+from schemas import PaginationParams, validate_one
 from schemas.tracks import (
-	ContentMediaOut,
+	ModuleCompositeDeleted,
 	ModuleCompositeIn,
 	ModuleCompositeOut,
 	ModuleCompositeUpdate,
-	ModuleContentOut,
-	ModuleOut,
 )
 
 # ----------------- Serialization helpers -----------------
+# Each composite is validated once, from the ORM objects, by a cached TypeAdapter.
 
 
-def _serialize_module(module: Module) -> ModuleOut:
-	return ModuleOut.model_validate(module, from_attributes=True)
-
-
-def _serialize_content(
-	content: ModuleContent,
-	*,
-	module: Module | None = None,
-	media: Sequence[ContentMedia] | None = None,
-) -> ModuleContentOut:
-	return ModuleContentOut.model_validate(
-		{
-			**content.model_dump(),
-			'module': _serialize_module(module or content.module),
-			'media': [
-				ContentMediaOut.model_validate(m, from_attributes=True) for m in (media or content.media)
-			],
-		},
-		from_attributes=True,
-	)
+def _attach_media(content: ModuleContent, media: Sequence[ContentMedia]) -> None:
+	# load the relationship as if it came from the database: no lazy load, no dirty state
+	set_committed_value(content, 'media', list(media))
 
 
 def _serialize_composite(
 	module: Module, contents: Sequence[ModuleContent], media_map: dict[UUID, list[ContentMedia]]
 ) -> ModuleCompositeOut:
-	serialized_contents: list[ModuleContentOut] = [
-		_serialize_content(c, module=module, media=media_map.get(c.public_id, [])) for c in contents
-	]
-	return ModuleCompositeOut(module=_serialize_module(module), contents=serialized_contents)
+	for content in contents:
+		_attach_media(content, media_map.get(content.public_id, []))
+	return validate_one(ModuleCompositeOut, {'module': module, 'contents': contents})
 
 
 class ModuleCompositeService:
 	@staticmethod
-	def get_all(db: Session, *, limit: int, offset: int = 0) -> list[Module]:
+	def get_all(db: Session, *, limit: int, offset: int = 0, cursor: str | None = None) -> list[Module]:
+		repo = ModuleRepository(db)
+		return repo.get_all(limit=limit, offset=offset, cursor=cursor)
+
+	@staticmethod
+	def paginate(db: Session, paginator: PaginationParams) -> Page:
 		repo = ModuleRepository(db)
-		return repo.get_all(limit=limit, offset=offset)
+		return repo.paginate(paginator)
 
 	@staticmethod
 	def count(db: Session) -> int:
 		repo = ModuleRepository(db)
 		return repo.count()
 
+	@staticmethod
+	def version(db: Session, public_id: UUID) -> ResourceVersion | None:
+		return module_composite_version(db, public_id)
+
 	@staticmethod
 	def create_module_composite(db: Session, payload: ModuleCompositeIn) -> ModuleCompositeOut:
 		return create_module_composite(db, payload)
@@ -67,6 +63,10 @@ class ModuleCompositeService:
 	def get_module_composite(db: Session, public_id: UUID) -> ModuleCompositeOut | None:
 		return get_module_composite(db, public_id)
 
+	@staticmethod
+	def render_module_composite_json(db: Session, public_id: UUID) -> bytes | None:
+		return render_module_composite_json(db, public_id)
+
 	@staticmethod
 	def update_module_composite(
 		db: Session, public_id: UUID, payload: ModuleCompositeUpdate
@@ -74,103 +74,115 @@ class ModuleCompositeService:
 		return update_module_composite(db, public_id, payload)
 
 	@staticmethod
-	def delete_module_composite(db: Session, public_id: UUID) -> bool:
+	def delete_module_composite(db: Session, public_id: UUID) -> ModuleCompositeDeleted | None:
 		return delete_module_composite(db, public_id)
 
 
 # ----------------- Core operations -----------------
 
 
-def create_module_composite(db: Session, payload: ModuleCompositeIn) -> ModuleCompositeOut:
-	module_repo = ModuleRepository(db)
-	content_repo = ModuleContentRepository(db)
-	media_repo = ContentMediaRepository(db)
+def _media_row(media, content_public_id: UUID) -> dict:
+	row = media.model_dump()
+	# Map name -> caption (DB column mapped to caption attribute)
+	row['caption'] = row.pop('name')
+	row['module_content_public_id'] = content_public_id
+	return row
 
-	module = module_repo.create(payload.module.model_dump())
-
-	contents: list[ModuleContent] = []
-	media_map: dict[UUID, list[ContentMedia]] = {}
 
-	if payload.contents:
-		content_payload = payload.contents.model_dump(exclude={'media'})
-		content_payload['module_public_id'] = module.public_id
-		content = content_repo.create(content_payload)
-		contents.append(content)
-
-		if payload.contents.media:
-			for m in payload.contents.media:
-				media_payload = m.model_dump()
-				# Map name -> caption (DB column mapped to caption attribute)
-				media_payload['caption'] = media_payload.pop('name')
-				meta_val = media_payload.get('meta')
-				if meta_val and hasattr(meta_val, 'model_dump'):
-					media_payload['meta'] = meta_val.model_dump()
-				media_payload['module_content_public_id'] = content.public_id
-				media = media_repo.create(media_payload)
-				media_map.setdefault(content.public_id, []).append(media)
+def create_module_composite(db: Session, payload: ModuleCompositeIn) -> ModuleCompositeOut:
+	"""Create a module with its contents and media.
+
+	One multi-row INSERT ... RETURNING per table, so the statement count stays at
+	three however many contents/media the payload carries. Everything lands in the
+	caller's unit of work, so a failure rolls back the whole composite.
+	"""
+	items = payload.contents or []
+	(module,) = ModuleRepository(db).create_many([payload.module.model_dump()])
+	contents = ModuleContentRepository(db).create_many(
+		[{**c.model_dump(exclude={'media'}), 'module_public_id': module.public_id} for c in items]
+	)
+	media = ContentMediaRepository(db).create_many(
+		[
+			_media_row(m, content.public_id)
+			for c, content in zip(items, contents, strict=True)
+			for m in c.media or []
+		]
+	)
 
+	media_map: dict[UUID, list[ContentMedia]] = {}
+	for m in media:
+		media_map.setdefault(m.module_content_public_id, []).append(m)
 	return _serialize_composite(module, contents, media_map)
 
 
-def get_module_composite(db: Session, public_id: UUID) -> ModuleCompositeOut | None:
-	module_repo = ModuleRepository(db)
-	content_repo = ModuleContentRepository(db)
-	media_repo = ContentMediaRepository(db)
-
-	module = module_repo.get_by_public_id(public_id)
-	if not module:
+def load_module_composite(
+	db: Session, public_id: UUID
+) -> tuple[Module, list[ModuleContent], dict[UUID, list[ContentMedia]]] | None:
+	"""Module, its ordered contents and all their media in two queries, whatever the module size."""
+	loaded = ModuleRepository(db).get_with_contents(public_id)
+	if loaded is None:
 		return None
+	module, contents = loaded
+	media_map = ContentMediaRepository(db).get_for_contents([c.public_id for c in contents])
+	return module, contents, media_map
 
-	contents = [c for c in content_repo.get_all(limit=500, offset=0) if c.module_public_id == module.public_id]
-	media_map: dict[UUID, list[ContentMedia]] = {}
-	for c in contents:
-		media_items = media_repo.get_all(limit=500, offset=0, module_content_public_id=c.public_id)
-		if media_items:
-			media_map[c.public_id] = media_items
 
-	return _serialize_composite(module, contents, media_map)
+def get_module_composite(db: Session, public_id: UUID) -> ModuleCompositeOut | None:
+	loaded = load_module_composite(db, public_id)
+	if loaded is None:
+		return None
+	return _serialize_composite(*loaded)
+
+
+def module_composite_version(db: Session, public_id: UUID) -> ResourceVersion | None:
+	"""Version of the module row, its contents and their media; None when no live module has `public_id`.
+
+	Every source is scoped to the live module, so a soft-deleted one versions as
+	absent and a conditional GET gets the same 404 as a plain one, never a 304.
+	"""
+	live = select(Module.public_id).where(Module.public_id == public_id, Module.is_deleted.is_(False))
+	content_ids = select(ModuleContent.public_id).where(ModuleContent.module_public_id.in_(live))
+	version = get_version(
+		db,
+		version_stmt(
+			(Module, Module.public_id.in_(live)),
+			(ModuleContent, ModuleContent.module_public_id.in_(live)),
+			(ContentMedia, ContentMedia.module_content_public_id.in_(content_ids)),
+		),
+	)
+	# contents and media cannot outlive their module (foreign keys), so no rows means no module
+	return version if version.rows else None
 
 
 def update_module_composite(
 	db: Session, public_id: UUID, payload: ModuleCompositeUpdate
 ) -> ModuleCompositeOut | None:
 	module_repo = ModuleRepository(db)
-	content_repo = ModuleContentRepository(db)
-	media_repo = ContentMediaRepository(db)
 
 	module = module_repo.get_by_public_id(public_id)
 	if not module:
 		return None
 
 	if payload.module:
-		module = module_repo.update(public_id, payload.module.model_dump(exclude_unset=True)) or module
+		module_repo.update(public_id, payload.module.model_dump(exclude_unset=True))
 
 	# NOTE: granular updates for nested contents/media not yet implemented
-	contents = [c for c in content_repo.get_all(limit=500, offset=0) if c.module_public_id == module.public_id]
-	all_media = media_repo.get_all(limit=1000, offset=0)
-	media_map: dict[UUID, list[ContentMedia]] = {}
-	valid_content_ids = {c.public_id for c in contents}
-	for cm in all_media:
-		if cm.module_content_public_id in valid_content_ids:
-			media_map.setdefault(cm.module_content_public_id, []).append(cm)
+	return get_module_composite(db, public_id)
 
-	return _serialize_composite(module, contents, media_map)
 
+def delete_module_composite(db: Session, public_id: UUID) -> ModuleCompositeDeleted | None:
+	"""Delete a module with all its contents and media.
 
-def delete_module_composite(db: Session, public_id: UUID) -> bool:
-	module_repo = ModuleRepository(db)
-	content_repo = ModuleContentRepository(db)
-	media_repo = ContentMediaRepository(db)
+	Three set-based DELETEs (media -> contents -> module) keyed by subqueries, so the
+	cost does not grow with round trips per row. Runs in the caller's unit of work;
+	returns None when no live module matched.
+	"""
+	module_ids = select(Module.public_id).where(Module.public_id == public_id, Module.is_deleted.is_(False))
+	content_ids = select(ModuleContent.public_id).where(ModuleContent.module_public_id.in_(module_ids))
 
-	module = module_repo.get_by_public_id(public_id)
-	if not module:
-		return False
-
-	contents = [c for c in content_repo.get_all(limit=500, offset=0) if c.module_public_id == module.public_id]
-	for c in contents:
-		media_items = media_repo.get_all(limit=500, offset=0, module_content_public_id=c.public_id)
-		for m in media_items:
-			media_repo.delete(m.public_id)
-		content_repo.delete(c.public_id)
-	module_repo.delete(module.public_id)
-	return True
+	media = ContentMediaRepository(db).delete_for_contents(content_ids)
+	contents = ModuleContentRepository(db).delete_for_modules(module_ids)
+	modules = ModuleRepository(db).delete_many([public_id])
+	if not modules:
+		return None
+	return ModuleCompositeDeleted(modules=modules, contents=contents, media=media)
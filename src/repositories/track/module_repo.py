@@ -1,9 +1,13 @@
-from sqlalchemy import func
+from collections.abc import Sequence
+
+from sqlalchemy import delete, func
 from sqlmodel import UUID, Session, select
-from fastapi import HTTPException
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from db.pagination import Page, apaginate_select, keyset_window, paginate_select
 from models.track.programs import ContentMedia, Module, ModuleContent
-from repositories import get_public_id
+from repositories import async_get_public_id, get_public_id, insert_returning
+from schemas import PaginationParams
 
 
 class ModuleRepository:
@@ -26,10 +30,32 @@ class ModuleRepository:
 			include_deleted=include_deleted,
 		)
 
-	def get_all(self, *, limit: int, offset: int = 0) -> list[Module]:
-		stmt = select(Module).limit(limit).offset(offset)
+	def get_with_contents(
+		self, public_id: str | UUID, *, include_deleted: bool = False
+	) -> tuple[Module, list[ModuleContent]] | None:
+		"""Module plus its contents (ordered by `order`) in one round trip."""
+		stmt = (
+			select(Module, ModuleContent)
+			.outerjoin(ModuleContent, ModuleContent.module_public_id == Module.public_id)
+			.where(Module.public_id == public_id)
+			.order_by(ModuleContent.order.nulls_last(), ModuleContent.id)
+		)
+		if not include_deleted:
+			stmt = stmt.where(Module.is_deleted.is_(False))
+		rows = self.db.exec(stmt).all()
+		if not rows:
+			return None
+		return rows[0][0], [content for _, content in rows if content is not None]
+
+	def get_all(self, *, limit: int, offset: int = 0, cursor: str | None = None) -> list[Module]:
+		stmt = keyset_window(select(Module), Module.id, limit=limit, offset=offset, cursor=cursor)
 		return self.db.exec(stmt).all()
 
+	def paginate(self, paginator: PaginationParams) -> Page:
+		"""One page plus `total` computed with the client's count strategy."""
+		stmt = select(Module)
+		return paginate_select(self.db, stmt, paginator, key=Module.id)
+
 	def count(self) -> int:
 		stmt = select(func.count()).select_from(Module)
 		return int(self.db.exec(stmt).one())
@@ -38,11 +64,13 @@ class ModuleRepository:
 	def create(self, payload: dict) -> Module:
 		obj = Module(**payload)
 		self.db.add(obj)
-		self.db.commit()
-
-		self.db.refresh(obj)
+		self.db.flush()
 		return obj
 
+	def create_many(self, payloads: list[dict]) -> list[Module]:
+		"""Insert a batch in one round trip; the caller owns the commit."""
+		return insert_returning(self.db, Module, payloads)
+
 	def update(self, public_id: UUID, payload: dict) -> Module | None:
 		obj = self.get_by_public_id(public_id)
 		if not obj:
@@ -52,8 +80,7 @@ class ModuleRepository:
 			if value is not None:
 				setattr(obj, field, value)
 		self.db.add(obj)
-		self.db.commit()
-		self.db.refresh(obj)
+		self.db.flush()
 		return obj
 
 	def delete(self, public_id: UUID) -> None:
@@ -61,7 +88,19 @@ class ModuleRepository:
 		if not obj:
 			return
 		self.db.delete(obj)
-		self.db.commit()
+		self.db.flush()
+
+	def delete_many(self, module_ids) -> int:
+		"""Delete live modules by public_id in one statement; returns the row count.
+
+		`module_ids` may be a list or a scalar subquery, so callers can chain deletes.
+		"""
+		stmt = (
+			delete(Module)
+			.where(Module.public_id.in_(module_ids), Module.is_deleted.is_(False))
+			.execution_options(synchronize_session=False)
+		)
+		return self.db.execute(stmt).rowcount
 
 
 class ModuleContentRepository:
@@ -84,8 +123,8 @@ class ModuleContentRepository:
 			include_deleted=include_deleted,
 		)
 
-	def get_all(self, *, limit: int, offset: int = 0) -> list[ModuleContent]:
-		stmt = select(ModuleContent).limit(limit).offset(offset)
+	def get_all(self, *, limit: int, offset: int = 0, cursor: str | None = None) -> list[ModuleContent]:
+		stmt = keyset_window(select(ModuleContent), ModuleContent.id, limit=limit, offset=offset, cursor=cursor)
 		return self.db.exec(stmt).all()
 
 	def count(self) -> int:
@@ -96,10 +135,13 @@ class ModuleContentRepository:
 	def create(self, payload: dict) -> ModuleContent:
 		obj = ModuleContent(**payload)
 		self.db.add(obj)
-		self.db.commit()
-		self.db.refresh(obj)
+		self.db.flush()
 		return obj
 
+	def create_many(self, payloads: list[dict]) -> list[ModuleContent]:
+		"""Insert a batch in one round trip; the caller owns the commit."""
+		return insert_returning(self.db, ModuleContent, payloads)
+
 	def update(self, public_id: UUID, payload: dict) -> ModuleContent | None:
 		obj = self.get_by_public_id(public_id)
 		if not obj:
@@ -109,8 +151,7 @@ class ModuleContentRepository:
 			if value is not None:
 				setattr(obj, field, value)
 		self.db.add(obj)
-		self.db.commit()
-		self.db.refresh(obj)
+		self.db.flush()
 		return obj
 
 	def delete(self, public_id: UUID) -> None:
@@ -118,7 +159,19 @@ class ModuleContentRepository:
 		if not obj:
 			return
 		self.db.delete(obj)
-		self.db.commit()
+		self.db.flush()
+
+	def delete_for_modules(self, module_ids) -> int:
+		"""Delete all contents of the given modules in one statement; returns the row count.
+
+		`module_ids` may be a list or a scalar subquery, so callers can chain deletes.
+		"""
+		stmt = (
+			delete(ModuleContent)
+			.where(ModuleContent.module_public_id.in_(module_ids))
+			.execution_options(synchronize_session=False)
+		)
+		return self.db.execute(stmt).rowcount
 
 
 class ContentMediaRepository:
@@ -141,12 +194,32 @@ class ContentMediaRepository:
 			include_deleted=include_deleted,
 		)
 
+	def get_for_contents(self, content_public_ids: Sequence[UUID]) -> dict[UUID, list[ContentMedia]]:
+		"""All media of the given contents in one query, grouped by content and ordered by position."""
+		media_map: dict[UUID, list[ContentMedia]] = {cid: [] for cid in content_public_ids}
+		if not media_map:
+			return media_map
+		stmt = (
+			select(ContentMedia)
+			.where(ContentMedia.module_content_public_id.in_(list(media_map)))
+			.order_by(ContentMedia.module_content_public_id, ContentMedia.position, ContentMedia.id)
+		)
+		for media in self.db.exec(stmt).all():
+			media_map[media.module_content_public_id].append(media)
+		return media_map
+
 	def get_all(
-		self, *, limit: int, offset: int = 0, module_content_public_id: UUID | None = None
+		self,
+		*,
+		limit: int,
+		offset: int = 0,
+		cursor: str | None = None,
+		module_content_public_id: UUID | None = None,
 	) -> list[ContentMedia]:
-		stmt = select(ContentMedia).limit(limit).offset(offset)
+		stmt = select(ContentMedia)
 		if module_content_public_id is not None:
 			stmt = stmt.where(ContentMedia.module_content_public_id == module_content_public_id)
+		stmt = keyset_window(stmt, ContentMedia.id, limit=limit, offset=offset, cursor=cursor)
 		return self.db.exec(stmt).all()
 
 	def count(self) -> int:
@@ -157,10 +230,13 @@ class ContentMediaRepository:
 	def create(self, payload: dict) -> ContentMedia:
 		obj = ContentMedia(**payload)
 		self.db.add(obj)
-		self.db.commit()
-		self.db.refresh(obj)
+		self.db.flush()
 		return obj
 
+	def create_many(self, payloads: list[dict]) -> list[ContentMedia]:
+		"""Insert a batch in one round trip; the caller owns the commit."""
+		return insert_returning(self.db, ContentMedia, payloads)
+
 	def update(self, public_id: UUID, payload: dict) -> ContentMedia | None:
 		obj = self.get_by_public_id(public_id)
 		if not obj:
@@ -170,8 +246,7 @@ class ContentMediaRepository:
 			if value is not None:
 				setattr(obj, field, value)
 		self.db.add(obj)
-		self.db.commit()
-		self.db.refresh(obj)
+		self.db.flush()
 		return obj
 
 	def delete(self, public_id: UUID) -> None:
@@ -179,4 +254,184 @@ class ContentMediaRepository:
 		if not obj:
 			return
 		self.db.delete(obj)
-		self.db.commit()
+		self.db.flush()
+
+	def delete_for_contents(self, content_ids) -> int:
+		"""Delete all media of the given contents in one statement; returns the row count.
+
+		`content_ids` may be a list or a scalar subquery, so callers can chain deletes.
+		"""
+		stmt = (
+			delete(ContentMedia)
+			.where(ContentMedia.module_content_public_id.in_(content_ids))
+			.execution_options(synchronize_session=False)
+		)
+		return self.db.execute(stmt).rowcount
+
+
+class AsyncModuleRepository:
+	"""Async counterpart of `ModuleRepository`."""
+
+	def __init__(self, db: AsyncSession):
+		self.db = db
+
+	# -------- getters --------
+	async def get(self, pk: int) -> Module | None:
+		stmt = select(Module).where(Module.id == pk)
+		return (await self.db.exec(stmt)).first()
+
+	async def get_by_public_id(self, public_id: str | UUID, *, include_deleted: bool = False) -> Module | None:
+		return await async_get_public_id(self.db, Module, str(public_id), include_deleted=include_deleted)
+
+	async def get_all(self, *, limit: int, offset: int = 0, cursor: str | None = None) -> list[Module]:
+		stmt = keyset_window(select(Module), Module.id, limit=limit, offset=offset, cursor=cursor)
+		return (await self.db.exec(stmt)).all()
+
+	async def paginate(self, paginator: PaginationParams) -> Page:
+		"""One page plus `total` computed with the client's count strategy."""
+		stmt = select(Module)
+		return await apaginate_select(self.db, stmt, paginator, key=Module.id)
+
+	async def count(self) -> int:
+		stmt = select(func.count()).select_from(Module)
+		return int((await self.db.exec(stmt)).one())
+
+	# -------- mutations --------
+	async def create(self, payload: dict) -> Module:
+		obj = Module(**payload)
+		self.db.add(obj)
+		await self.db.flush()
+		return obj
+
+	async def update(self, public_id: UUID, payload: dict) -> Module | None:
+		obj = await self.get_by_public_id(public_id)
+		if not obj:
+			return None
+
+		for field, value in payload.items():
+			if value is not None:
+				setattr(obj, field, value)
+		self.db.add(obj)
+		await self.db.flush()
+		return obj
+
+	async def delete(self, public_id: UUID) -> None:
+		obj = await self.get_by_public_id(public_id)
+		if not obj:
+			return
+		await self.db.delete(obj)
+		await self.db.flush()
+
+
+class AsyncModuleContentRepository:
+	"""Async counterpart of `ModuleContentRepository`."""
+
+	def __init__(self, db: AsyncSession):
+		self.db = db
+
+	# -------- getters --------
+	async def get(self, pk: int) -> ModuleContent | None:
+		stmt = select(ModuleContent).where(ModuleContent.id == pk)
+		return (await self.db.exec(stmt)).first()
+
+	async def get_by_public_id(
+		self, public_id: str | UUID, *, include_deleted: bool = False
+	) -> ModuleContent | None:
+		return await async_get_public_id(
+			self.db, ModuleContent, str(public_id), include_deleted=include_deleted
+		)
+
+	async def get_all(self, *, limit: int, offset: int = 0, cursor: str | None = None) -> list[ModuleContent]:
+		stmt = keyset_window(select(ModuleContent), ModuleContent.id, limit=limit, offset=offset, cursor=cursor)
+		return (await self.db.exec(stmt)).all()
+
+	async def count(self) -> int:
+		stmt = select(func.count()).select_from(ModuleContent)
+		return int((await self.db.exec(stmt)).one())
+
+	# -------- mutations --------
+	async def create(self, payload: dict) -> ModuleContent:
+		obj = ModuleContent(**payload)
+		self.db.add(obj)
+		await self.db.flush()
+		return obj
+
+	async def update(self, public_id: UUID, payload: dict) -> ModuleContent | None:
+		obj = await self.get_by_public_id(public_id)
+		if not obj:
+			return None
+
+		for field, value in payload.items():
+			if value is not None:
+				setattr(obj, field, value)
+		self.db.add(obj)
+		await self.db.flush()
+		return obj
+
+	async def delete(self, public_id: UUID) -> None:
+		obj = await self.get_by_public_id(public_id)
+		if not obj:
+			return
+		await self.db.delete(obj)
+		await self.db.flush()
+
+
+class AsyncContentMediaRepository:
+	"""Async counterpart of `ContentMediaRepository`."""
+
+	def __init__(self, db: AsyncSession):
+		self.db = db
+
+	# -------- getters --------
+	async def get(self, pk: int) -> ContentMedia | None:
+		stmt = select(ContentMedia).where(ContentMedia.id == pk)
+		return (await self.db.exec(stmt)).first()
+
+	async def get_by_public_id(
+		self, public_id: str | UUID, *, include_deleted: bool = False
+	) -> ContentMedia | None:
+		return await async_get_public_id(self.db, ContentMedia, str(public_id), include_deleted=include_deleted)
+
+	async def get_all(
+		self,
+		*,
+		limit: int,
+		offset: int = 0,
+		cursor: str | None = None,
+		module_content_public_id: UUID | None = None,
+	) -> list[ContentMedia]:
+		stmt = select(ContentMedia)
+		if module_content_public_id is not None:
+			stmt = stmt.where(ContentMedia.module_content_public_id == module_content_public_id)
+		stmt = keyset_window(stmt, ContentMedia.id, limit=limit, offset=offset, cursor=cursor)
+		return (await self.db.exec(stmt)).all()
+
+	async def count(self) -> int:
+		stmt = select(func.count()).select_from(ContentMedia)
+		return int((await self.db.exec(stmt)).one())
+
+	# -------- mutations --------
+	async def create(self, payload: dict) -> ContentMedia:
+		obj = ContentMedia(**payload)
+		self.db.add(obj)
+		await self.db.flush()
+		return obj
+
+	async def update(self, public_id: UUID, payload: dict) -> ContentMedia | None:
+		obj = await self.get_by_public_id(public_id)
+		if not obj:
+			return None
+
+		for field, value in payload.items():
+			if value is not None:
+				setattr(obj, field, value)
+		self.db.add(obj)
+		await self.db.flush()
+		return obj
+
+	async def delete(self, public_id: UUID) -> None:
+		obj = await self.get_by_public_id(public_id)
+		if not obj:
+			return
+		await self.db.delete(obj)
+		await self.db.flush()
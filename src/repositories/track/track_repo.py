@@ -5,13 +5,17 @@ from uuid import UUID
 
 from sqlalchemy import func
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from db.lookup_cache import acached_first, cached_first
+from db.pagination import Page, apaginate_select, keyset_window, paginate_select
 from models import Track
-from repositories import get_public_id
+from repositories import async_get_public_id, get_public_id, set_deleted_stmt
+from schemas import PaginationParams
 
 
 class TrackRepository:
-	"""CRUD repository for Track (lean: commits inside write ops like existing style)."""
+	"""CRUD repository for Track (lean: write ops flush; the request's unit of work commits)."""
 
 	def __init__(self, db: Session):
 		self.db = db
@@ -27,7 +31,7 @@ class TrackRepository:
 		stmt = select(Track).where(Track.name == name)
 		if (not include_deleted) and hasattr(Track, 'is_deleted'):
 			stmt = stmt.where(Track.is_deleted.is_(False))
-		return self.db.exec(stmt).first()
+		return cached_first(self.db, Track, ('name', name, include_deleted), lambda: self.db.exec(stmt).first())
 
 	def get_by_public_id(self, public_id: str | UUID, *, include_deleted: bool = False) -> Track | None:
 		public_id_str = str(public_id)
@@ -43,14 +47,22 @@ class TrackRepository:
 		*,
 		limit: int,
 		offset: int = 0,
+		cursor: str | None = None,
 		include_deleted: bool = False,
 	) -> list[Track]:
 		stmt = select(Track)
 		if (not include_deleted) and hasattr(Track, 'is_deleted'):
 			stmt = stmt.where(Track.is_deleted.is_(False))
-		stmt = stmt.limit(limit).offset(offset)
+		stmt = keyset_window(stmt, Track.id, limit=limit, offset=offset, cursor=cursor)
 		return self.db.exec(stmt).all()
 
+	def paginate(self, paginator: PaginationParams, *, include_deleted: bool = False) -> Page:
+		"""One page plus `total` computed with the client's count strategy."""
+		stmt = select(Track)
+		if (not include_deleted) and hasattr(Track, 'is_deleted'):
+			stmt = stmt.where(Track.is_deleted.is_(False))
+		return paginate_select(self.db, stmt, paginator, key=Track.id)
+
 	def count(self, *, include_deleted: bool = False) -> int:
 		stmt = select(func.count()).select_from(Track)
 		if (not include_deleted) and hasattr(Track, 'is_deleted'):
@@ -61,8 +73,7 @@ class TrackRepository:
 	def create(self, payload: dict) -> Track:
 		obj = Track(**payload)
 		self.db.add(obj)
-		self.db.commit()
-		self.db.refresh(obj)
+		self.db.flush()
 		return obj
 
 	def update(self, public_id: UUID, payload: dict) -> Track | None:
@@ -71,23 +82,92 @@ class TrackRepository:
 			return None
 		for key, value in payload.items():
 			setattr(obj, key, value)
-		self.db.commit()
-		self.db.refresh(obj)
+		self.db.flush()
 		return obj
+
 	# -------- soft deletes --------
 
-	def soft_delete(self, public_id: UUID) -> None:
-		obj = self.get_by_public_id(public_id)
-		if not obj:
-			return
-		obj.is_deleted = True
-		self.db.commit()
-		self.db.refresh(obj)
+	def soft_delete(self, public_id: UUID) -> bool:
+		"""Returns False when no live track matched."""
+		return self.db.execute(set_deleted_stmt(Track, public_id, deleted=True)).first() is not None
+
+	def restore(self, public_id: UUID) -> bool:
+		"""Returns False when no deleted track matched."""
+		return self.db.execute(set_deleted_stmt(Track, public_id, deleted=False)).first() is not None
+
+
+class AsyncTrackRepository:
+	"""Async counterpart of `TrackRepository` for `AsyncDbSession` handlers."""
+
+	def __init__(self, db: AsyncSession):
+		self.db = db
+
+	# -------- getters --------
+	async def get(self, pk: int, *, include_deleted: bool = False) -> Track | None:
+		stmt = select(Track).where(Track.id == pk)
+		if (not include_deleted) and hasattr(Track, 'is_deleted'):
+			stmt = stmt.where(Track.is_deleted.is_(False))
+		return (await self.db.exec(stmt)).first()
+
+	async def get_by_name(self, name: str, *, include_deleted: bool = False) -> Track | None:
+		stmt = select(Track).where(Track.name == name)
+		if (not include_deleted) and hasattr(Track, 'is_deleted'):
+			stmt = stmt.where(Track.is_deleted.is_(False))
+
+		async def load():
+			return (await self.db.exec(stmt)).first()
+
+		return await acached_first(self.db, Track, ('name', name, include_deleted), load)
+
+	async def get_by_public_id(self, public_id: str | UUID, *, include_deleted: bool = False) -> Track | None:
+		return await async_get_public_id(self.db, Track, str(public_id), include_deleted=include_deleted)
 
-	def restore(self, public_id: UUID) -> None:
-		obj = self.get_by_public_id(public_id, include_deleted=True)
+	async def get_all(
+		self,
+		*,
+		limit: int,
+		offset: int = 0,
+		cursor: str | None = None,
+		include_deleted: bool = False,
+	) -> list[Track]:
+		stmt = select(Track)
+		if (not include_deleted) and hasattr(Track, 'is_deleted'):
+			stmt = stmt.where(Track.is_deleted.is_(False))
+		stmt = keyset_window(stmt, Track.id, limit=limit, offset=offset, cursor=cursor)
+		return (await self.db.exec(stmt)).all()
+
+	async def paginate(self, paginator: PaginationParams, *, include_deleted: bool = False) -> Page:
+		"""One page plus `total` computed with the client's count strategy."""
+		stmt = select(Track)
+		if (not include_deleted) and hasattr(Track, 'is_deleted'):
+			stmt = stmt.where(Track.is_deleted.is_(False))
+		return await apaginate_select(self.db, stmt, paginator, key=Track.id)
+
+	async def count(self, *, include_deleted: bool = False) -> int:
+		stmt = select(func.count()).select_from(Track)
+		if (not include_deleted) and hasattr(Track, 'is_deleted'):
+			stmt = stmt.where(Track.is_deleted.is_(False))
+		return int((await self.db.exec(stmt)).one())
+
+	# -------- mutations --------
+	async def create(self, payload: dict) -> Track:
+		obj = Track(**payload)
+		self.db.add(obj)
+		await self.db.flush()
+		return obj
+
+	async def update(self, public_id: UUID, payload: dict) -> Track | None:
+		obj = await self.get_by_public_id(public_id)
 		if not obj:
-			return
-		obj.is_deleted = False
-		self.db.commit()
-		self.db.refresh(obj)
+			return None
+		for key, value in payload.items():
+			setattr(obj, key, value)
+		await self.db.flush()
+		return obj
+
+	# -------- soft deletes --------
+	async def soft_delete(self, public_id: UUID) -> bool:
+		return (await self.db.execute(set_deleted_stmt(Track, public_id, deleted=True))).first() is not None
+
+	async def restore(self, public_id: UUID) -> bool:
+		return (await self.db.execute(set_deleted_stmt(Track, public_id, deleted=False))).first() is not None
@@ -1,4 +1,5 @@
 from .common.responses import (
+	CountStrategy,
 	PageMeta,
 	Paginated,
 	PaginationParams,
@@ -7,15 +8,23 @@ from .common.responses import (
 	make_data_response,
 	make_paginated_response,
 	make_response,
+	render_data_response,
 )
+from .common.serialization import SchemaResponse, adapter, validate_many, validate_one
 
 __all__ = [
+	'CountStrategy',
 	'PageMeta',
 	'Paginated',
 	'PaginationParams',
 	'ResponseBase',
 	'ResponseData',
+	'SchemaResponse',
+	'adapter',
 	'make_data_response',
 	'make_paginated_response',
 	'make_response',
+	'render_data_response',
+	'validate_many',
+	'validate_one',
 ]
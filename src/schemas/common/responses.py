@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
+from enum import StrEnum
 from typing import Any, TypeVar
 
+import orjson
 from pydantic import BaseModel, Field
 
 # TypeVar for helper functions
@@ -21,9 +23,21 @@ class ResponseData[T](ResponseBase):
 	data: T | None = Field(default=None)
 
 
+class CountStrategy(StrEnum):
+	"""How a paginated list computes `meta.total`."""
+
+	exact = 'exact'  # SELECT count(*) over the filtered query
+	estimated = 'estimated'  # planner estimate (pg_class.reltuples); exact for small tables
+	cached = 'cached'  # exact, cached per table with a TTL, dropped on writes to that table
+	window = 'window'  # count(*) OVER () on the page query itself (single round trip)
+	none = 'none'  # no total; `meta.has_more` tells whether another page exists
+
+
 class PaginationParams(BaseModel):
 	limit: int
 	offset: int
+	cursor: str | None = None  # opaque keyset cursor; when set, offset is ignored
+	count: CountStrategy = CountStrategy.exact
 
 	@property
 	def slice(self) -> tuple[int, int]:
@@ -35,6 +49,10 @@ class PageMeta(BaseModel):
 	limit: int
 	offset: int
 	pages: int | None
+	next_cursor: str | None = None
+	prev_cursor: str | None = None
+	has_more: bool | None = None
+	count_strategy: CountStrategy | None = None
 
 
 class Paginated[T](ResponseBase):
@@ -67,20 +85,39 @@ def make_data_response[T](
 	)
 
 
+def render_data_response(
+	data_json: bytes,
+	status_code: int = 200,
+	message: Any = None,
+) -> bytes:
+	"""`ResponseData` envelope around an already-serialized JSON document."""
+	head = {'success': True, 'status_code': status_code, 'message': message}
+	return orjson.dumps(head)[:-1] + b',"data":' + data_json + b'}'
+
+
 def make_paginated_response[T](
 	items: Sequence[T],
-	total: int,
+	total: int | None,
 	limit: int,
 	offset: int,
 	message: str = 'Request successful',
 	status_code: int = 200,
+	*,
+	next_cursor: str | None = None,
+	prev_cursor: str | None = None,
+	has_more: bool | None = None,
+	count_strategy: CountStrategy | None = None,
 ) -> Paginated[T]:
-	pages = (total // limit + (1 if total % limit else 0)) if limit else None
+	pages = (total // limit + (1 if total % limit else 0)) if limit and total is not None else None
 	meta = PageMeta(
 		total=total,
 		limit=limit,
 		offset=offset,
 		pages=pages,
+		next_cursor=next_cursor,
+		prev_cursor=prev_cursor,
+		has_more=has_more,
+		count_strategy=count_strategy,
 	)
 	return Paginated[T](
 		success=True,
@@ -0,0 +1,54 @@
+# src/schemas/common/serialization.py
+
+"""
+Validate-once response path.
+
+Handlers validate ORM rows into output schemas with a cached `TypeAdapter` (one
+pass over a whole list), wrap them with `make_data_response` /
+`make_paginated_response`, and return a `SchemaResponse`. Returning a Response
+makes FastAPI skip its `response_model` pass (model_dump -> validate ->
+serialize), which would repeat work already done; `response_model` stays on the
+route for the OpenAPI schema.
+"""
+
+from collections.abc import Iterable, Mapping
+from functools import cache
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+
+
+@cache
+def adapter[T](tp: type[T]) -> TypeAdapter[T]:
+	"""Process-wide `TypeAdapter` for `tp`; building one compiles a validator and serializer."""
+	return TypeAdapter(tp)
+
+
+def validate_one[T: BaseModel](schema: type[T], obj: Any) -> T:
+	"""`schema.model_validate(obj, from_attributes=True)` through the cached adapter."""
+	return adapter(schema).validate_python(obj, from_attributes=True)
+
+
+def validate_many[T: BaseModel](schema: type[T], objs: Iterable[Any]) -> list[T]:
+	"""Validate a whole list of ORM rows (or dicts) in a single call."""
+	return adapter(list[schema]).validate_python(objs, from_attributes=True)
+
+
+class SchemaResponse(Response):
+	"""JSON response for an already validated pydantic model, serialized by pydantic-core."""
+
+	media_type = 'application/json'
+
+	def __init__(
+		self,
+		content: BaseModel,
+		status_code: int = 200,
+		headers: Mapping[str, str] | None = None,
+		background: BackgroundTask | None = None,
+	):
+		super().__init__(content, status_code=status_code, headers=headers, background=background)
+
+	def render(self, content: BaseModel) -> bytes:
+		return content.__pydantic_serializer__.to_json(content)
@@ -1,3 +1,17 @@
-from .newsletter import SubscribeIn, SubscriberOut, Unsubscribe
+from .newsletter import (
+	SubscribeIn,
+	SubscriberExportParams,
+	SubscriberFileFormat,
+	SubscriberImportOut,
+	SubscriberOut,
+	Unsubscribe,
+)
 
-__all__ = ['SubscribeIn', 'SubscriberOut', 'Unsubscribe']
+__all__ = [
+	'SubscribeIn',
+	'SubscriberExportParams',
+	'SubscriberFileFormat',
+	'SubscriberImportOut',
+	'SubscriberOut',
+	'Unsubscribe',
+]
@@ -1,6 +1,7 @@
 # src/schemas/news/newsletter.py
 
 from datetime import datetime
+from enum import StrEnum
 from uuid import UUID
 
 from pydantic import BaseModel, EmailStr
@@ -22,3 +23,39 @@ class SubscriberOut(BaseModel):
 	unsubscribed_at: datetime | None
 	created: datetime
 	updated: datetime
+
+
+class SubscriberImportOut(BaseModel):
+	received: int  # non-blank rows read from the upload
+	inserted: int
+	restored: int
+	skipped: int  # already active, or repeated within the upload
+	invalid: int  # rows without a valid email address
+
+
+class SubscriberFileFormat(StrEnum):
+	"""Bulk import / export file formats."""
+
+	CSV = 'csv'
+	NDJSON = 'ndjson'
+
+	@property
+	def media_type(self) -> str:
+		return 'text/csv; charset=utf-8' if self is SubscriberFileFormat.CSV else 'application/x-ndjson'
+
+	@classmethod
+	def from_content_type(cls, content_type: str | None) -> 'SubscriberFileFormat | None':
+		media_type = (content_type or '').split(';')[0].strip().lower()
+		if media_type in {'text/csv', 'application/csv'}:
+			return cls.CSV
+		if media_type in {'application/x-ndjson', 'application/ndjson', 'application/jsonl'}:
+			return cls.NDJSON
+		return None
+
+
+class SubscriberExportParams(BaseModel):
+	format: SubscriberFileFormat = SubscriberFileFormat.CSV
+	active: bool | None = None
+	deleted: bool | None = None
+	created_from: datetime | None = None
+	created_to: datetime | None = None
@@ -5,6 +5,7 @@ from .programs import (
 	CourseCreate,
 	CourseOut,
 	CourseUpdate,
+	ModuleCompositeDeleted,
 	ModuleCompositeIn,
 	ModuleCompositeOut,
 	ModuleCompositeUpdate,
@@ -25,6 +26,7 @@ __all__ = [
 	'CourseCreate',
 	'CourseOut',
 	'CourseUpdate',
+	'ModuleCompositeDeleted',
 	'ModuleCompositeIn',
 	'ModuleCompositeOut',
 	'ModuleCompositeUpdate',
@@ -3,7 +3,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 
 from models.track import CourseBase, MediaMeta, ModuleBase, ModuleContentBase, TrackBase
 
@@ -124,7 +124,13 @@ class ModuleContentUpdate(BaseModel):
 
 class ModuleCompositeIn(BaseModel):
 	module: ModuleCreate
-	contents: ModuleContentCreate | None = None
+	contents: list[ModuleContentCreate] | None = None
+
+	@field_validator('contents', mode='before')
+	@classmethod
+	def wrap_single_content(cls, v):
+		# Older clients send a single content object
+		return [v] if isinstance(v, dict) else v
 
 
 class ModuleCompositeOut(BaseModel):
@@ -132,6 +138,12 @@ class ModuleCompositeOut(BaseModel):
 	contents: list[ModuleContentOut] | None = None
 
 
+class ModuleCompositeDeleted(BaseModel):
+	modules: int
+	contents: int
+	media: int
+
+
 class ModuleCompositeUpdate(BaseModel):
 	module: ModuleUpdate | None = None
 	contents: list[ModuleContentUpdate] | None = None
@@ -0,0 +1,91 @@
+# tests/conftest.py
+"""
+The suite runs against a real Postgres: TEST_DATABASE_URL, or DATABASE_URL with
+`_test` appended to the database name. That database is dropped and recreated
+for every session, so never point TEST_DATABASE_URL at data you want to keep.
+
+Run from the repository root:
+	TEST_DATABASE_URL=postgresql+psycopg://postgres@localhost:5432/cerebro_test pytest
+"""
+
+from collections.abc import Iterator
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+
+
+def _test_database_url() -> str | None:
+	if url := os.environ.get('TEST_DATABASE_URL'):
+		return url
+	if url := os.environ.get('DATABASE_URL'):
+		parsed = make_url(url)
+		return parsed.set(database=f'{parsed.database}_test').render_as_string(hide_password=False)
+	return None
+
+
+TEST_DATABASE_URL = _test_database_url()
+if TEST_DATABASE_URL is None:
+	pytest.exit('Set TEST_DATABASE_URL (or DATABASE_URL) to a Postgres server to run the tests.', returncode=4)
+
+# settings are read once at import: point the app at the test database before anything imports it
+os.environ['DATABASE_URL'] = TEST_DATABASE_URL
+os.environ.pop('DATABASE_REPLICA_URLS', None)
+os.environ.pop('PROMETHEUS_MULTIPROC_DIR', None)
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlmodel import Session, SQLModel  # noqa: E402
+
+from core.compression import compressed_cache  # noqa: E402
+from db.conf import engine  # noqa: E402
+from db.counting import count_cache  # noqa: E402
+from db.lookup_cache import lookup_cache  # noqa: E402
+from dependencies import unit_of_work  # noqa: E402
+import models  # noqa: E402, F401
+
+
+def _recreate_database(url: str) -> None:
+	target = make_url(url)
+	admin = create_engine(target.set(database='postgres'), isolation_level='AUTOCOMMIT')
+	with admin.connect() as conn:
+		conn.exec_driver_sql(f'DROP DATABASE IF EXISTS "{target.database}" WITH (FORCE)')
+		conn.exec_driver_sql(f'CREATE DATABASE "{target.database}"')
+	admin.dispose()
+
+
+@pytest.fixture(scope='session', autouse=True)
+def database() -> Iterator[None]:
+	_recreate_database(TEST_DATABASE_URL)
+	SQLModel.metadata.create_all(engine)
+	yield
+	engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def _isolate() -> Iterator[None]:
+	"""Every test starts with empty tables and cold caches."""
+	yield
+	tables = ', '.join(table.name for table in SQLModel.metadata.sorted_tables)
+	with engine.begin() as conn:
+		conn.exec_driver_sql(f'TRUNCATE {tables} RESTART IDENTITY CASCADE')
+	count_cache.clear()
+	lookup_cache.clear()
+	lookup_cache.reset_stats()
+	compressed_cache.clear()
+	compressed_cache.reset_stats()
+
+
+@pytest.fixture
+def db() -> Iterator[Session]:
+	"""A unit of work; commits when the test body returns."""
+	with unit_of_work() as session:
+		yield session
+
+
+@pytest.fixture
+def client() -> Iterator[TestClient]:
+	from core.main import app
+
+	with TestClient(app) as test_client:
+		yield test_client
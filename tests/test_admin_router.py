@@ -0,0 +1,45 @@
+# tests/test_admin_router.py
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+
+from api import monitoring_router
+from db.lookup_cache import lookup_cache
+from models import Track
+from repositories import get_public_id
+
+REPORTS = ('loop-stalls', 'lookup-cache', 'compression-cache', 'pool', 'replicas')
+
+
+@pytest.fixture
+def admin() -> TestClient:
+	app = FastAPI()
+	app.include_router(monitoring_router)
+	return TestClient(app)
+
+
+def test_admin_is_off_by_default(client):
+	for name in REPORTS:
+		assert client.get(f'/admin/{name}').status_code == 404
+		assert client.post(f'/admin/{name}/reset').status_code == 404
+
+
+@pytest.mark.parametrize('name', REPORTS)
+def test_reports_and_resets(admin, name):
+	assert admin.get(f'/admin/{name}').status_code == 200
+	assert admin.post(f'/admin/{name}/reset').status_code == 200
+	assert admin.get(f'/admin/{name}/reset').status_code == 405
+
+
+def test_only_post_resets(admin, db):
+	get_public_id(db, Track, '00000000-0000-0000-0000-000000000000')  # one miss
+
+	def misses() -> int:
+		return admin.get('/admin/lookup-cache').json()['data']['tables'][Track.__tablename__]['misses']
+
+	assert admin.get('/admin/lookup-cache', params={'reset': True}).status_code == 200
+	assert misses() == 1
+
+	report = admin.post('/admin/lookup-cache/reset').json()['data']
+	assert report['tables'][Track.__tablename__]['misses'] == 1  # the counters as they were
+	assert lookup_cache.stats()['tables'] == {}
@@ -0,0 +1,129 @@
+# tests/test_composite_json.py
+from datetime import UTC, datetime
+from uuid import UUID
+
+import pytest
+
+from config.settings import settings
+from models import ContentMedia, Module, ModuleContent
+from repositories.track.composite_json import check_composite_json_parity, render_module_composite_json
+from repositories.track.module_composite import get_module_composite
+
+# naive UTC, like the timestamp columns
+WHOLE_SECOND = datetime(2024, 3, 1, 12, 30, 5, tzinfo=UTC).replace(tzinfo=None)
+FRACTION = WHOLE_SECOND.replace(microsecond=120)  # pydantic prints .000120
+
+
+def _seed_module(db) -> UUID:
+	module = Module(name='Parity', description='quotes " and \\ and\nnewlines', order=1)
+	module.created, module.updated = WHOLE_SECOND, FRACTION
+	db.add(module)
+	db.flush()
+
+	unpublished = ModuleContent(
+		module_public_id=module.public_id,
+		title='Draft: ünïcode ✓',
+		markdown='# Heading\n\n\ttabbed\u0001control',
+		order=1,
+		tags=['sql', 'json', 'ünï'],
+		draft=True,
+		is_published=False,
+		published_at=None,
+	)
+	published = ModuleContent(
+		module_public_id=module.public_id,
+		title='Published',
+		order=2,
+		tags=[],
+		draft=False,
+		is_published=True,
+		published_at=FRACTION,
+		estimated_minutes=12,
+	)
+	without_media = ModuleContent(module_public_id=module.public_id, title='No media', order=3)
+	for content, (created, updated) in zip(
+		(unpublished, published, without_media),
+		((WHOLE_SECOND, FRACTION), (FRACTION, WHOLE_SECOND), (FRACTION, FRACTION)),
+		strict=True,
+	):
+		content.created, content.updated = created, updated
+		db.add(content)
+	db.flush()
+
+	metas = (
+		{'ext': 'mp4', 'size': 1048576, 'dimensions': {'width': 1920, 'height': 1080}},
+		{'ext': 'pdf', 'size': 2.5, 'pages': [1, 2, 3], 'author': None, 'title': 'ünï "quoted"'},
+		None,
+	)
+	for position, meta in enumerate(metas):
+		media = ContentMedia(
+			module_content_public_id=unpublished.public_id if position < 2 else published.public_id,
+			caption=f'media {position}',
+			position=position,
+			url=f'https://cdn.example.com/{position}',
+			meta=meta,
+		)
+		media.created = media.updated = FRACTION if position % 2 else WHOLE_SECOND
+		db.add(media)
+	db.flush()
+	return module.public_id
+
+
+def _pydantic_bytes(db, public_id: UUID) -> bytes:
+	composite = get_module_composite(db, public_id)
+	return composite.__pydantic_serializer__.to_json(composite)
+
+
+def test_sql_document_is_byte_identical_to_pydantic(db):
+	public_id = _seed_module(db)
+	db.commit()
+
+	rendered = render_module_composite_json(db, public_id)
+
+	assert rendered == _pydantic_bytes(db, public_id)
+	assert check_composite_json_parity(db, public_id)
+
+
+def test_module_without_contents(db):
+	module = Module(name='Empty', order=1)
+	db.add(module)
+	db.commit()
+
+	assert render_module_composite_json(db, module.public_id) == _pydantic_bytes(db, module.public_id)
+
+
+def test_missing_module_renders_nothing(db):
+	assert render_module_composite_json(db, UUID(int=0)) is None
+	assert check_composite_json_parity(db, UUID(int=0))
+
+
+def test_endpoint_bodies_match_across_renderers(client, db, monkeypatch):
+	public_id = _seed_module(db)
+	db.commit()
+
+	bodies = {}
+	for in_db in (False, True):
+		monkeypatch.setattr(settings, 'composite_json_in_db', in_db)
+		response = client.get(f'/modules/{public_id}/', headers={'accept-encoding': 'identity'})
+		assert response.status_code == 200
+		bodies[in_db] = response.content
+
+	assert bodies[True] == bodies[False]
+
+
+@pytest.mark.parametrize(
+	'meta', [{'b': 1, 'a': {'d': [1.0, None], 'c': True}}, {'nested': {'deep': {'x': 'y'}}}]
+)
+def test_json_column_key_order_is_kept(db, meta):
+	module = Module(name='Order', order=1)
+	db.add(module)
+	db.flush()
+	content = ModuleContent(module_public_id=module.public_id, title='t', order=1, tags=['z', 'a'])
+	db.add(content)
+	db.flush()
+	db.add(
+		ContentMedia(module_content_public_id=content.public_id, caption='c', position=0, url='u', meta=meta)
+	)
+	db.commit()
+
+	assert render_module_composite_json(db, module.public_id) == _pydantic_bytes(db, module.public_id)
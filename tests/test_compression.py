@@ -0,0 +1,71 @@
+# tests/test_compression.py
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+import pytest
+
+from core.compression import CompressedBodyCache, CompressionMiddleware, compressed_cache
+
+BODY = b'{"items": [' + b','.join(b'{"id": %d, "title": "lesson"}' % i for i in range(200)) + b']}'
+
+
+@pytest.fixture
+def client() -> TestClient:
+	app = FastAPI()
+
+	@app.get('/plain')
+	def plain():
+		return Response(BODY, media_type='application/json')
+
+	@app.get('/etag')
+	def etag():
+		return Response(BODY, media_type='application/json', headers={'ETag': '"v1"'})
+
+	@app.get('/last-modified')
+	def last_modified():
+		return Response(
+			BODY, media_type='application/json', headers={'Last-Modified': 'Wed, 01 Jan 2025 00:00:00 GMT'}
+		)
+
+	@app.get('/immutable')
+	def immutable():
+		return Response(BODY, media_type='application/json', headers={'Cache-Control': 'public, immutable'})
+
+	app.add_middleware(CompressionMiddleware, minimum_size=64)
+	compressed_cache.reset_stats()
+	return TestClient(app)
+
+
+@pytest.mark.parametrize('encoding', ['br', 'gzip'])
+def test_negotiated_encoding(client, encoding):
+	response = client.get('/plain', headers={'accept-encoding': encoding})
+
+	assert response.headers['content-encoding'] == encoding
+	assert response.content == BODY  # httpx decodes both
+
+
+def test_only_versioned_bodies_are_cached(client):
+	for _ in range(2):
+		client.get('/plain', headers={'accept-encoding': 'br'})
+	assert compressed_cache.stats()['entries'] == 0
+
+	for url in ('/etag', '/last-modified', '/immutable'):
+		for _ in range(2):
+			assert client.get(url, headers={'accept-encoding': 'br'}).status_code == 200
+	stats = compressed_cache.stats()
+	assert stats['entries'] == 1  # one body, one encoding
+	assert (stats['misses'], stats['hits']) == (1, 5)
+
+
+def test_cache_is_bounded_by_bytes():
+	cache = CompressedBodyCache(max_bytes=1000)
+	for i in range(10):
+		cache.set(('br', bytes([i])), b'x' * 200)
+		assert cache.stats()['bytes'] <= 1000
+
+	stats = cache.stats()
+	assert (stats['entries'], stats['bytes'], stats['evictions']) == (5, 1000, 5)
+	assert cache.get(('br', bytes([0]))) is None
+	assert cache.get(('br', bytes([9]))) == b'x' * 200
+
+	cache.set(('br', b'big'), b'x' * 251)  # over a quarter of the budget: never stored
+	assert cache.get(('br', b'big')) is None
@@ -0,0 +1,133 @@
+# tests/test_conditional_get.py
+from datetime import UTC, datetime
+from email.utils import format_datetime
+
+import pytest
+from sqlalchemy import text
+
+from db.conf import engine
+from models import Module, Track
+
+
+def _track(db, name: str = 'Backend') -> Track:
+	track = Track(name=name)
+	db.add(track)
+	db.commit()
+	return track
+
+
+def _etag(client, url: str = '/tracks/') -> str:
+	response = client.get(url)
+	assert response.status_code == 200
+	return response.headers['etag']
+
+
+def test_matching_etag_is_a_304(client, db):
+	_track(db)
+	response = client.get('/tracks/')
+	etag, last_modified = response.headers['etag'], response.headers['last-modified']
+	assert etag.startswith('W/"')
+
+	not_modified = client.get('/tracks/', headers={'if-none-match': etag})
+
+	assert not_modified.status_code == 304
+	assert not_modified.content == b''
+	assert not_modified.headers['etag'] == etag
+	assert not_modified.headers['last-modified'] == last_modified
+
+
+@pytest.mark.parametrize(
+	'header',
+	[
+		'{strong}',  # weak comparison: W/ is ignored on either side
+		'"other", {weak}',
+		'"other",{strong}',
+		'*',
+	],
+)
+def test_if_none_match_uses_weak_comparison(client, db, header):
+	_track(db)
+	weak = _etag(client)
+	strong = weak.removeprefix('W/')
+
+	response = client.get('/tracks/', headers={'if-none-match': header.format(weak=weak, strong=strong)})
+
+	assert response.status_code == 304
+
+
+def test_etag_depends_on_the_query(client, db):
+	_track(db)
+	etag = _etag(client, '/tracks/?limit=5')
+
+	assert client.get('/tracks/?limit=6', headers={'if-none-match': etag}).status_code == 200
+
+
+def test_if_modified_since(client, db):
+	_track(db)
+	last_modified = client.get('/tracks/').headers['last-modified']
+	earlier = format_datetime(datetime(2000, 1, 1, tzinfo=UTC), usegmt=True)
+
+	assert client.get('/tracks/', headers={'if-modified-since': last_modified}).status_code == 304
+	assert client.get('/tracks/', headers={'if-modified-since': earlier}).status_code == 200
+	assert client.get('/tracks/', headers={'if-modified-since': 'not a date'}).status_code == 200
+	# If-None-Match wins over If-Modified-Since
+	headers = {'if-none-match': '"stale"', 'if-modified-since': last_modified}
+	assert client.get('/tracks/', headers=headers).status_code == 200
+
+
+@pytest.mark.parametrize(
+	'change',
+	[
+		"INSERT INTO tracks (public_id, name, created, updated, is_deleted) VALUES (gen_random_uuid(), 'Data', now(), now(), false)",
+		"UPDATE tracks SET name = 'Frontend'",
+		'UPDATE tracks SET is_deleted = true',
+		'DELETE FROM tracks',
+		# a rewrite that leaves every column as it was still changes the version
+		'UPDATE tracks SET name = name, updated = updated',
+	],
+)
+def test_etag_changes_after_every_write(client, db, change):
+	_track(db)
+	etag = _etag(client)
+	with engine.begin() as conn:
+		conn.execute(text(change))
+
+	response = client.get('/tracks/', headers={'if-none-match': etag})
+
+	assert response.status_code == 200
+	assert response.headers['etag'] != etag
+
+
+def test_etag_changes_when_an_older_transaction_commits(client, db):
+	first, second = _track(db, 'First'), _track(db, 'Second')
+	with engine.connect() as older, engine.connect() as newer:
+		older.execute(text('SELECT now()'))  # the older transaction's now() is fixed here
+		newer.execute(
+			text("UPDATE tracks SET name = 'Second v2', updated = now() WHERE id = :id"), {'id': second.id}
+		)
+		newer.commit()
+		etag = _etag(client)
+
+		# its `updated` is older than the committed one, and the row count does not move
+		older.execute(
+			text("UPDATE tracks SET name = 'First v2', updated = now() WHERE id = :id"), {'id': first.id}
+		)
+		older.commit()
+
+	response = client.get('/tracks/', headers={'if-none-match': etag})
+
+	assert response.status_code == 200
+	assert [item['name'] for item in response.json()['items']] == ['first v2', 'second v2']
+
+
+def test_soft_deleted_module_is_a_404_even_with_its_etag(client, db):
+	module = Module(name='Gone', order=1)
+	db.add(module)
+	db.commit()
+	url = f'/modules/{module.public_id}/'
+	etag = _etag(client, url)
+	with engine.begin() as conn:
+		conn.execute(text('UPDATE modules SET is_deleted = true WHERE id = :id'), {'id': module.id})
+
+	assert client.get(url).status_code == 404
+	assert client.get(url, headers={'if-none-match': etag}).status_code == 404
@@ -0,0 +1,38 @@
+# tests/test_course_routes.py
+from models import Course, Track
+
+
+def _course(db) -> Course:
+	track = Track(name='Backend', description='Backend track')
+	db.add(track)
+	db.flush()
+	course = Course(track_public_id=track.public_id, title='Databases', order=1)
+	db.add(course)
+	db.commit()
+	return course
+
+
+def test_patch_and_delete_take_the_integer_id(client, db):
+	course = _course(db)
+
+	response = client.patch(f'/courses/{course.id}/', json={'title': 'Indexes'})
+	assert response.status_code == 200
+	assert response.json()['data']['title'] == 'Indexes'
+
+	assert client.delete(f'/courses/{course.id}/').status_code == 200
+	assert client.delete(f'/courses/{course.id}/').status_code == 404
+
+
+def test_delete_rejects_public_id(client, db):
+	course = _course(db)
+
+	assert client.delete(f'/courses/{course.public_id}/').status_code == 422
+
+
+def test_patch_after_delete_is_a_404(client, db):
+	course = _course(db)
+	assert client.delete(f'/courses/{course.id}/').status_code == 200
+
+	response = client.patch(f'/courses/{course.id}/', json={'title': 'Indexes'})
+
+	assert response.status_code == 404
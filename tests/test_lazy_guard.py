@@ -0,0 +1,74 @@
+# tests/test_lazy_guard.py
+import re
+
+import pytest
+
+from config.settings import settings
+from db.lazy_guard import LazyLoadError, forbid_lazy_loads
+from models import ContentMedia, Course, Module, ModuleContent, Track
+from models.news import NewsletterSubscriber
+
+ROWS = 12
+SERVER_TIMING = re.compile(r'db;dur=[\d.]+;desc="(\d+) statements"')
+
+
+@pytest.fixture
+def catalog(db) -> dict:
+	"""ROWS of everything; the first track and module carry ROWS children, the others one."""
+	tracks = [Track(name=f'track {t:02d}') for t in range(ROWS)]
+	modules = [Module(name=f'module {m:02d}', order=m + 1) for m in range(ROWS)]
+	db.add_all([*tracks, *modules])
+	db.add_all(NewsletterSubscriber(email=f'reader{i}@example.com') for i in range(ROWS))
+	db.flush()
+	for t, track in enumerate(tracks):
+		for c in range(ROWS if t == 0 else 1):
+			db.add(Course(track_public_id=track.public_id, title=f'course {c:02d}', order=c + 1))
+	contents = [
+		ModuleContent(module_public_id=module.public_id, title=f'part {c}', order=c + 1, tags=['t'])
+		for m, module in enumerate(modules)
+		for c in range(ROWS if m == 0 else 1)
+	]
+	db.add_all(contents)
+	db.flush()
+	for content in contents:
+		db.add_all(
+			ContentMedia(module_content_public_id=content.public_id, caption=f'm{p}', position=p, url='u')
+			for p in range(2)
+		)
+	db.commit()
+	return {'track': tracks[0].public_id, 'big': modules[0].public_id, 'small': modules[1].public_id}
+
+
+def _statements(client, url: str, **params) -> int:
+	response = client.get(url, params=params, headers={'accept-encoding': 'identity'})
+	assert response.status_code == 200, response.text
+	return int(SERVER_TIMING.fullmatch(response.headers['server-timing']).group(1))
+
+
+@pytest.mark.parametrize(
+	'url', ['/tracks/', '/courses/', '/tracks/{track}/courses', '/modules/', '/newsletter/subscribers']
+)
+def test_lists_eager_load_at_any_page_size(client, catalog, monkeypatch, url):
+	monkeypatch.setattr(settings, 'raise_on_lazy_load', True)
+	url = url.format(**catalog)
+	_statements(client, url)  # warm the lookup cache (the track by public id)
+
+	small, large = (_statements(client, url, limit=limit) for limit in (2, ROWS))
+
+	assert small == large
+
+
+@pytest.mark.parametrize('in_db', [False, True])
+def test_composite_eager_loads_at_any_size(client, catalog, monkeypatch, in_db):
+	monkeypatch.setattr(settings, 'raise_on_lazy_load', True)
+	monkeypatch.setattr(settings, 'composite_json_in_db', in_db)
+
+	small, large = (_statements(client, f'/modules/{catalog[size]}/') for size in ('small', 'big'))
+
+	assert small == large
+
+
+def test_guard_raises_on_lazy_load(db, catalog):
+	course = db.get(Course, 1)
+	with forbid_lazy_loads(db), pytest.raises(LazyLoadError, match='Lazy load of Track from a Course'):
+		_ = course.track
@@ -0,0 +1,57 @@
+# tests/test_lookup_cache.py
+import asyncio
+import time
+
+import pytest
+
+from db.conf import engine
+from db.lookup_cache import lookup_cache
+from db.routing import PIN_COOKIE, ReplicaSet, RoutingSession
+from models import Track
+from repositories import get_public_id
+
+
+def _cached(table: str = Track.__tablename__) -> int:
+	return lookup_cache.stats()['tables'].get(table, {}).get('size', 0)
+
+
+@pytest.fixture
+def track(db) -> Track:
+	track = Track(name='Backend')
+	db.add(track)
+	db.commit()
+	return track
+
+
+@pytest.fixture
+def replicas():
+	"""The test database again, standing in as a replica."""
+	replica_set = ReplicaSet(
+		[engine.url.render_as_string(hide_password=False)], retry_after=30, health_interval=30
+	)
+	yield replica_set
+	asyncio.run(replica_set.stop())
+
+
+def test_primary_reads_are_cached(track):
+	with RoutingSession(bind=engine) as session:
+		assert get_public_id(session, Track, track.public_id).name == 'Backend'
+	assert _cached() == 1
+
+
+def test_replica_reads_are_not_cached(track, replicas):
+	with RoutingSession(bind=engine, replicas=replicas, replica_reads=True) as session:
+		assert get_public_id(session, Track, track.public_id).name == 'Backend'
+		assert replicas.stats()['replicas'][0]['sessions'] == 1
+	assert _cached() == 0
+
+
+def test_pinned_requests_bypass_the_cache(client, track):
+	url = f'/tracks/{track.public_id}/courses'
+	client.cookies.set(PIN_COOKIE, f'{time.time() + 60:.3f}')
+	assert client.get(url).status_code == 200
+	assert _cached() == 0
+
+	client.cookies.clear()
+	assert client.get(url).status_code == 200
+	assert _cached() == 1
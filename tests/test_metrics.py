@@ -0,0 +1,144 @@
+# tests/test_metrics.py
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+
+from prometheus_client.multiprocess import mark_process_dead
+from prometheus_client.parser import text_string_to_metric_families
+import pytest
+
+from monitoring.metrics import CONTENT_TYPE
+
+END = '# end of scrape'
+
+# a gunicorn worker stand-in: `record N` serves N requests, `scrape` prints /metrics as this worker would
+WORKER = textwrap.dedent(
+	f"""
+	import sys
+	from types import SimpleNamespace
+
+	from db.query_stats import QueryStats
+	from monitoring.metrics import metrics
+
+	scope = {{'method': 'GET', 'route': SimpleNamespace(path_format='/tracks/')}}
+	metrics.in_progress.labels('GET').inc()
+	for line in sys.stdin:
+		command, *args = line.split()
+		if command == 'record':
+			for _ in range(int(args[0])):
+				metrics.record_request(scope, 200, 0.02, QueryStats(statements=2, seconds=0.001))
+		elif command == 'scrape':
+			sys.stdout.write(metrics.render().decode())
+		print({END!r}, flush=True)
+	"""
+)
+
+
+def _parse(text: str) -> dict:
+	return {
+		(sample.name, tuple(sorted(sample.labels.items()))): sample.value
+		for family in text_string_to_metric_families(text)
+		for sample in family.samples
+	}
+
+
+def _scrape(client) -> dict:
+	response = client.get('/metrics')
+	assert response.status_code == 200
+	assert response.headers['content-type'] == CONTENT_TYPE
+	return _parse(response.text)
+
+
+def _tracks(name: str, **labels: str) -> tuple:
+	return name, tuple(sorted({'method': 'GET', 'route': '/tracks/', **labels}.items()))
+
+
+def test_exposition_parses(client):
+	before = _scrape(client)
+	for _ in range(2):
+		assert client.get('/tracks/').status_code == 200
+	assert client.get('/no/such/path').status_code == 404
+
+	samples = _scrape(client)
+
+	def delta(key):
+		return samples[key] - before.get(key, 0)
+
+	unmatched = 'http_requests_total', (('method', 'GET'), ('route', 'unmatched'), ('status', '404'))
+	assert delta(_tracks('http_requests_total', status='200')) == 2
+	assert delta(_tracks('http_request_duration_seconds_count')) == 2
+	assert delta(_tracks('http_request_duration_seconds_bucket', le='+Inf')) == 2
+	assert delta(_tracks('db_queries_total')) >= 2
+	assert delta(unmatched) == 1
+	# the scrape itself is the only request in flight
+	assert samples['http_requests_in_progress', (('method', 'GET'),)] == 1
+
+
+class Worker:
+	def __init__(self, multiproc_dir):
+		env = {
+			**os.environ,
+			'PYTHONPATH': os.pathsep.join(sys.path),
+			'PROMETHEUS_MULTIPROC_DIR': str(multiproc_dir),
+		}
+		self.process = subprocess.Popen(
+			[sys.executable, '-c', WORKER], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, env=env
+		)
+
+	def send(self, command: str) -> str:
+		self.process.stdin.write(command + '\n')
+		self.process.stdin.flush()
+		lines = []
+		while (line := self.process.stdout.readline()) != END + '\n':
+			assert line, 'worker exited'
+			lines.append(line)
+		return ''.join(lines)
+
+	def scrape(self) -> dict:
+		return _parse(self.send('scrape'))
+
+	def kill(self) -> None:
+		self.process.send_signal(signal.SIGKILL)
+		self.process.wait(timeout=10)
+
+
+@pytest.fixture
+def workers(tmp_path):
+	assert not any(tmp_path.iterdir())
+	started = [Worker(tmp_path), Worker(tmp_path)]
+	yield started
+	for worker in started:
+		if worker.process.poll() is None:
+			worker.process.stdin.close()
+			worker.process.wait(timeout=10)
+
+
+def test_totals_never_go_backwards_across_workers(workers, tmp_path):
+	served = 0
+	previous = 0
+	key = _tracks('http_requests_total', status='200')
+	for round_ in range(6):
+		for worker, count in zip(workers, (3, 5), strict=True):
+			worker.send(f'record {count}')
+			served += count
+			# whichever worker serves the scrape, it reports every worker's exact total
+			for scraper in (workers[round_ % 2], workers[1 - round_ % 2]):
+				total = scraper.scrape()[key]
+				assert total == served
+				assert total >= previous
+				previous = total
+
+	samples = workers[1].scrape()
+	assert samples[_tracks('http_request_duration_seconds_count')] == served
+	assert samples[_tracks('db_queries_total')] == 2 * served
+	assert samples['http_requests_in_progress', (('method', 'GET'),)] == 2
+
+	# a worker killed outright keeps its counts; once reaped, its live gauges go
+	first = workers[0]
+	first.kill()
+	mark_process_dead(first.process.pid, path=str(tmp_path))
+	samples = workers[1].scrape()
+	assert samples[key] == served
+	assert samples['http_requests_in_progress', (('method', 'GET'),)] == 1
@@ -0,0 +1,79 @@
+# tests/test_query_stats.py
+import logging
+import re
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+from sqlalchemy import text
+
+from db.query_stats import QueryBudgetExceeded, query_budget
+from dependencies import async_unit_of_work
+from monitoring.query_stats import QueryStatsMiddleware
+
+THRESHOLD = 4
+SERVER_TIMING = re.compile(r'db;dur=[\d.]+;desc="(\d+) statements"')
+
+
+def _client(*, budget: int | None = None, raise_server_exceptions: bool = True) -> TestClient:
+	"""An app with one route running `n` statements: one shape repeated, or `n` distinct shapes."""
+	app = FastAPI()
+
+	@app.get('/run/{n}')
+	async def run(n: int, distinct: bool = False):
+		async with async_unit_of_work() as db:
+			for i in range(n):
+				await db.exec(text(f'SELECT {i}') if distinct else text('SELECT 1'))
+		return {'ran': n}
+
+	app.add_middleware(QueryStatsMiddleware, repeat_threshold=THRESHOLD, budget=budget)
+	return TestClient(app, raise_server_exceptions=raise_server_exceptions)
+
+
+def _statements(response) -> int:
+	return int(SERVER_TIMING.fullmatch(response.headers['server-timing']).group(1))
+
+
+@pytest.mark.parametrize('n', [0, 1, 7])
+def test_server_timing_counts_statements(n):
+	response = _client().get(f'/run/{n}', params={'distinct': True})
+
+	assert response.status_code == 200
+	assert _statements(response) == n
+
+
+def test_server_timing_matches_app_statements(client):
+	with query_budget(100) as seen:
+		response = client.get('/tracks/')
+
+	assert response.status_code == 200
+	assert _statements(response) == seen.statements > 0
+
+
+def test_request_over_budget_fails():
+	client = _client(budget=3)
+
+	assert client.get('/run/3').status_code == 200
+	with pytest.raises(QueryBudgetExceeded, match='Query budget of 3 exceeded') as exc_info:
+		client.get('/run/4')
+	assert exc_info.value.stats.statements == 3  # stopped before the fourth ran
+
+
+def test_request_over_budget_is_a_500():
+	response = _client(budget=3, raise_server_exceptions=False).get('/run/5')
+
+	assert response.status_code == 500
+
+
+def test_repeated_shape_warns(caplog):
+	client = _client()
+
+	with caplog.at_level(logging.WARNING, logger='cerebro.sql'):
+		client.get('/run/3')
+		client.get(f'/run/{THRESHOLD}', params={'distinct': True})
+		assert not caplog.records
+
+		client.get(f'/run/{THRESHOLD}')
+
+	[record] = caplog.records
+	assert record.getMessage() == f'Possible N+1 in GET /run/{{n}}: {THRESHOLD} runs of SELECT 1'
@@ -0,0 +1,52 @@
+# tests/test_subscriber_export.py
+import asyncio
+import csv
+import io
+import json
+
+import pytest
+
+from dependencies import async_unit_of_work
+from models.news import NewsletterSubscriber
+from repositories.news.subscriber_export import HEADER, stream_subscribers
+from schemas.news import SubscriberExportParams, SubscriberFileFormat
+
+
+@pytest.fixture
+def subscribers(db) -> None:
+	db.add_all(
+		[
+			NewsletterSubscriber(email='a@example.com'),
+			NewsletterSubscriber(email='b@example.com'),
+			NewsletterSubscriber(email='gone@example.com', is_active=False, is_deleted=True),
+		]
+	)
+	db.commit()
+
+
+def test_csv_export(client, subscribers):
+	response = client.get('/newsletter/subscribers/export')
+
+	assert response.status_code == 200
+	assert response.headers['content-disposition'] == 'attachment; filename="subscribers.csv"'
+	rows = list(csv.reader(io.StringIO(response.text)))
+	assert tuple(rows[0]) == HEADER
+	assert [row[1] for row in rows[1:]] == ['a@example.com', 'b@example.com', 'gone@example.com']
+
+
+def test_ndjson_export_filters(client, subscribers):
+	response = client.get('/newsletter/subscribers/export', params={'format': 'ndjson', 'deleted': False})
+
+	assert response.status_code == 200
+	lines = [json.loads(line) for line in response.text.splitlines()]
+	assert [line['email'] for line in lines] == ['a@example.com', 'b@example.com']
+
+
+def test_stream_uses_the_callers_session(subscribers):
+	async def export() -> bytes:
+		params = SubscriberExportParams(format=SubscriberFileFormat.NDJSON, active=False)
+		async with async_unit_of_work() as db:
+			return b''.join([chunk async for chunk in stream_subscribers(db, params)])
+
+	[line] = asyncio.run(export()).splitlines()
+	assert json.loads(line)['email'] == 'gone@example.com'
@@ -0,0 +1,48 @@
+# tests/test_subscriber_import.py
+from db.lookup_cache import lookup_cache
+from dependencies import unit_of_work
+from models.news import NewsletterSubscriber
+from repositories.news.newsletter_repo import NewsletterRepository
+from repositories.news.subscriber_import import import_subscribers
+from schemas.news import SubscriberFileFormat
+
+
+def _cached_total(client) -> int:
+	response = client.get('/newsletter/subscribers', params={'count': 'cached'})
+	assert response.status_code == 200
+	return response.json()['meta']['total']
+
+
+def _import(client, *emails: str) -> dict:
+	body = 'email\n' + ''.join(f'{email}\n' for email in emails)
+	response = client.post('/newsletter/subscribers/import', content=body, headers={'content-type': 'text/csv'})
+	assert response.status_code == 200
+	return response.json()['data']
+
+
+def test_import_drops_cached_totals(client):
+	_import(client, 'a@example.com')
+	assert _cached_total(client) == 1
+
+	assert _import(client, 'b@example.com', 'c@example.com')['inserted'] == 2
+	assert _cached_total(client) == 3
+
+
+def test_import_drops_cached_lookups(db):
+	subscriber = NewsletterSubscriber(email='back@example.com', is_deleted=True, is_active=False)
+	db.add(subscriber)
+	db.commit()
+	public_id = subscriber.public_id
+
+	with unit_of_work() as session:
+		assert NewsletterRepository(session).get_by_public_id(public_id) is None  # cached as a miss
+	assert lookup_cache.stats()['tables'][NewsletterSubscriber.__tablename__]['size'] == 1
+
+	with unit_of_work() as session:
+		summary = import_subscribers(session, [b'back@example.com\n'], SubscriberFileFormat.CSV)
+	assert summary.restored == 1
+
+	with unit_of_work() as session:
+		restored = NewsletterRepository(session).get_by_public_id(public_id)
+		assert restored is not None
+		assert not restored.is_deleted